@@ -0,0 +1,154 @@
+"""
+Micro-benchmark of the JSON codec policies in FileClassCompressed.
+
+Run from the repository root:
+
+    python API/Benchmark/CodecBenchmark.py --preset medium --repeat 20 --output codec.json
+    python API/Benchmark/CodecBenchmark.py --case WebAPP/DataStorage/<case>
+
+Representative files are taken from a synthetic case (or an existing case folder): small files
+rewritten constantly (view/resData.json, genData.json) and large model group files (R*.json).
+Each policy writes and reads every file --repeat times in its own temporary folder, median
+latencies and the size on disk are reported per file kind.
+"""
+import os, sys, json, time, shutil, argparse, platform, tempfile, statistics
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+ROOT_DIR = API_DIR.parent
+sys.path.insert(0, str(API_DIR))
+os.chdir(ROOT_DIR)
+
+from Classes.Base import Config
+from Classes.Base import FileClass
+from Classes.Base import FileClassCompressed
+from Benchmark.SyntheticModel import SyntheticModel, PRESETS
+from Benchmark.PipelineBenchmark import gitCommit
+
+Compressed = FileClassCompressed.File
+
+def policies(dictFolder):
+    #naziv -> (File klasa, configure, configure_policy)
+    always = {k: 'always' for k in Compressed._FSYNC}
+    never = {k: 'never' for k in Compressed._FSYNC}
+    return {
+        "legacy":      (FileClass.File, None, None),
+        "plain":       (Compressed, {"default_compression": None}, {"plain_below": 0, "group_dict": False, "fsync": always}),
+        "zst":         (Compressed, {"default_compression": 'zst'}, {"plain_below": 0, "group_dict": False, "fsync": always}),
+        "zst-dict":    (Compressed, {"default_compression": 'zst'}, {"plain_below": 0, "group_dict": True, "dict_folder": dictFolder, "fsync": always}),
+        "policy":      (Compressed, {"default_compression": 'zst'}, {"plain_below": dict(Compressed._PLAIN_BELOW), "group_dict": True, "dict_folder": dictFolder, "fsync": dict(Compressed._FSYNC)}),
+        "policy-nosync": (Compressed, {"default_compression": 'zst'}, {"plain_below": dict(Compressed._PLAIN_BELOW), "group_dict": True, "dict_folder": dictFolder, "fsync": never}),
+    }
+
+def kind(path):
+    return 'group' if Compressed._path_class(path) == 'group' else 'small'
+
+def sampleFiles(caseDir):
+    caseDir = Path(caseDir)
+    files = [p for p in caseDir.glob('*.json')]
+    files += [p for p in Path(caseDir, 'view').glob('*.json')]
+    return [p for p in files if p.is_file()]
+
+def median(values):
+    return statistics.median(values) if values else None
+
+def benchPolicy(name, policy, files, work, repeat):
+    cls, config, policyConfig = policy
+    if config is not None:
+        cls.configure(**config)
+    if policyConfig is not None:
+        cls.configure_policy(**policyConfig)
+    folder = Path(work, name)
+    stats = {}
+    for src in files:
+        data = FileClass.File.readFile(src)
+        #relativna putanja zadrzava klasu (view/...), da fsync politika bude ista kao u aplikaciji
+        rel = src.relative_to(src.parent.parent) if src.parent.name == 'view' else Path(src.name)
+        dest = Path(folder, rel)
+        os.makedirs(dest.parent, exist_ok=True)
+        writes, reads = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cls.writeFile(data, dest)
+            writes.append(time.perf_counter() - start)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cls.readFile(dest)
+            reads.append(time.perf_counter() - start)
+        size = sum(p.stat().st_size for p in dest.parent.glob(dest.name + '*'))
+        entry = stats.setdefault(kind(src), {"files": 0, "write": [], "read": [], "bytes": 0})
+        entry["files"] += 1
+        entry["write"].append(median(writes))
+        entry["read"].append(median(reads))
+        entry["bytes"] += size
+    if cls is Compressed:
+        cls.sync()
+    return {
+        k: {
+            "files": v["files"],
+            "writeMs": round(sum(v["write"]) * 1000, 3),
+            "readMs": round(sum(v["read"]) * 1000, 3),
+            "bytes": v["bytes"],
+        } for k, v in stats.items()
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='FileClassCompressed codec policy benchmark')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='medium')
+    parser.add_argument('--case', help='existing case folder to use instead of a synthetic model')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--density', type=float, default=0.3, help='share of SC_0 values replaced with non default data')
+    parser.add_argument('--output', help='write JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    work = Path(tempfile.mkdtemp(prefix='osy-codec-'))
+    source = Config.DATA_STORAGE
+    saved = (dict(Compressed._FSYNC), dict(Compressed._PLAIN_BELOW), Compressed._GROUP_DICT, Compressed._DICT_FOLDER, Compressed._DEFAULT_COMPRESSION)
+    try:
+        if args.case:
+            caseDir = Path(args.case)
+        else:
+            storage = Path(work, 'storage')
+            SyntheticModel.prepareStorage(storage, source)
+            Config.DATA_STORAGE = storage
+            model = SyntheticModel('CODEC_{}'.format(args.preset.upper()), **PRESETS[args.preset])
+            model.create(args.density)
+            caseDir = Path(storage, model.casename)
+        files = sampleFiles(caseDir)
+        groups = [p for p in files if kind(p) == 'group']
+        dictId = Compressed.trainGroupDictionary(groups, Path(work, 'dict')) if groups else None
+
+        results = {}
+        for name, policy in policies(str(Path(work, 'dict'))).items():
+            results[name] = benchPolicy(name, policy, files, Path(work, 'runs'), max(1, args.repeat))
+    finally:
+        Config.DATA_STORAGE = source
+        fsync, plainBelow, groupDict, dictFolder, compression = saved
+        Compressed.configure(default_compression=compression)
+        Compressed.configure_policy(plain_below=plainBelow, group_dict=groupDict, fsync=fsync)
+        Compressed._DICT_FOLDER = dictFolder
+        Compressed._DICTS_LOADED = False
+        shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "benchmark": "codec",
+        "commit": gitCommit(),
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": str(args.case) if args.case else args.preset,
+        "repeat": max(1, args.repeat),
+        "dictId": dictId,
+        "plainBelow": Compressed._PLAIN_BELOW,
+        "policies": results
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+if __name__ == '__main__':
+    main()
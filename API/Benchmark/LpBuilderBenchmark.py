@@ -0,0 +1,196 @@
+"""
+Native LP builder (LpBuilder) against glpsol --check --wlp.
+
+Run from the repository root:
+
+    python API/Benchmark/LpBuilderBenchmark.py --preset medium --density 0.3 --solve
+    python API/Benchmark/LpBuilderBenchmark.py --data WebAPP/DataStorage/<case>/res/<caserun>/data_processed.txt
+
+Both LP files are written from the same data_processed.txt (a synthetic case unless --data is
+given), read back and compared: rows by name (sense, right hand side, coefficients by column
+name), objective coefficients and constant, free and integer columns. With --solve both files are
+solved with CBC and the objective values compared. The report has the timings of both builders.
+"""
+import os, re, sys, json, time, shutil, argparse, platform, subprocess, tempfile
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+ROOT_DIR = API_DIR.parent
+sys.path.insert(0, str(API_DIR))
+os.chdir(ROOT_DIR)
+
+from Classes.Base import Config
+from Benchmark.SyntheticModel import SyntheticModel, PRESETS
+from Benchmark.PipelineBenchmark import gitCommit
+
+SENSES = ('=', '<=', '>=')
+
+def readLp(path):
+    """{"objective": {col: coef}, "constant": c, "rows": {name: (sense, rhs, {col: coef})}, "free": set, "integer": set}"""
+    with open(path) as f:
+        text = f.read()
+    constant = re.search(r'\\\* constant term = (\S+) \*\\', text)
+    text = re.sub(r'\\\*.*?\*\\', '', text, flags=re.S)
+    sections = re.split(r'^(Minimize|Maximize|Subject To|Bounds|Generals|End)\s*$', text, flags=re.M)
+    parts = dict(zip(sections[1::2], sections[2::2]))
+
+    def linear(tokens):
+        terms, sign, coef = {}, 1.0, None
+        for token in tokens:
+            if token in ('+', '-'):
+                sign = 1.0 if token == '+' else -1.0
+            elif coef is None and re.match(r'^[-+]?[\d.]+(e[-+]?\d+)?$', token, re.I):
+                coef = float(token)
+            else:
+                value = sign * (1.0 if coef is None else coef)
+                if value != 0:
+                    terms[token] = terms.get(token, 0.0) + value
+                sign, coef = 1.0, None
+        return terms
+
+    objective = parts.get('Minimize', '').split()
+    rows = {}
+    tokens = parts.get('Subject To', '').split()
+    i = 0
+    while i < len(tokens):
+        name = tokens[i][:-1]
+        j = i + 1
+        while tokens[j] not in SENSES:
+            j += 1
+        rows[name] = (tokens[j], float(tokens[j + 1]), linear(tokens[i + 1:j]))
+        i = j + 2
+    free = {line.split()[0] for line in parts.get('Bounds', '').splitlines() if line.strip().endswith(' free')}
+    return {
+        "objective": linear(objective[1:]),
+        "constant": float(constant.group(1)) if constant else 0.0,
+        "rows": rows,
+        "free": free,
+        "integer": set(parts.get('Generals', '').split())
+    }
+
+def close(a, b, tol):
+    return abs(a - b) <= tol * max(1.0, abs(a), abs(b))
+
+def compare(reference, native, tol=1e-9, examples=10):
+    diff = {"rows": len(reference["rows"]), "nonzeros": sum(len(r[2]) for r in reference["rows"].values())}
+    missing = sorted(set(reference["rows"]) - set(native["rows"]))
+    extra = sorted(set(native["rows"]) - set(reference["rows"]))
+    mismatched = []
+    for name, (sense, rhs, terms) in reference["rows"].items():
+        if name not in native["rows"]:
+            continue
+        nSense, nRhs, nTerms = native["rows"][name]
+        if sense != nSense or not close(rhs, nRhs, tol) or set(terms) != set(nTerms) \
+                or any(not close(v, nTerms[c], tol) for c, v in terms.items()):
+            mismatched.append(name)
+    objective = [c for c in set(reference["objective"]) | set(native["objective"])
+                 if not close(reference["objective"].get(c, 0.0), native["objective"].get(c, 0.0), tol)]
+    diff.update({
+        "missingRows": len(missing), "extraRows": len(extra), "mismatchedRows": len(mismatched),
+        "objectiveMismatches": len(objective),
+        "constantMatches": close(reference["constant"], native["constant"], tol),
+        "freeMatches": reference["free"] == native["free"],
+        "integerMatches": reference["integer"] == native["integer"],
+        "examples": (missing + extra + mismatched + objective)[:examples]
+    })
+    diff["identical"] = not (missing or extra or mismatched or objective) and diff["constantMatches"] \
+        and diff["freeMatches"] and diff["integerMatches"]
+    return diff
+
+def solve(cbc, lpFile, resFile):
+    start = time.perf_counter()
+    subprocess.run([cbc, str(lpFile), 'solve', '-printing', 'all', '-solu', str(resFile)], capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    with open(resFile) as f:
+        status = f.readline().strip()
+    value = re.search(r'objective value\s+(\S+)', status)
+    return {"status": status.split(' - ')[0], "objective": float(value.group(1)) if value else None, "seconds": round(seconds, 4)}
+
+def run(processedFile, work, solveLp):
+    from Classes.Case.OsemosysClass import Osemosys
+    from Classes.Case.LpBuilderClass import LpBuilder
+
+    exe = '.exe' if platform.system() == 'Windows' else ''
+    glpsol = Osemosys._resolve_solver_executable(Path(Config.SOLVERs_FOLDER, 'GLPK'), 'glpsol' + exe, platform.system())[0]
+    modelFile = Path(Config.SOLVERs_FOLDER, LpBuilder.MODEL).resolve()
+    glpkLp, nativeLp = Path(work, 'glpsol.lp'), Path(work, 'native.lp')
+
+    start = time.perf_counter()
+    out = subprocess.run([glpsol, '--check', '-m', str(modelFile), '-d', str(processedFile), '--wlp', str(glpkLp)],
+                         capture_output=True, text=True)
+    glpsolSeconds = time.perf_counter() - start
+    if out.returncode != 0:
+        raise RuntimeError(out.stdout + out.stderr)
+
+    start = time.perf_counter()
+    size = LpBuilder(processedFile).build().write(nativeLp)
+    nativeSeconds = time.perf_counter() - start
+
+    report = {
+        "supportedModel": LpBuilder.supports(modelFile),
+        "size": size,
+        "glpsolSeconds": round(glpsolSeconds, 4),
+        "nativeSeconds": round(nativeSeconds, 4),
+        "glpsolBytes": glpkLp.stat().st_size,
+        "nativeBytes": nativeLp.stat().st_size,
+        "comparison": compare(readLp(glpkLp), readLp(nativeLp))
+    }
+    if solveLp:
+        cbc = Osemosys._resolve_solver_executable(Path(Config.SOLVERs_FOLDER, 'COIN-OR'), 'cbc' + exe, platform.system())[0]
+        report["cbc"] = {
+            "glpsol": solve(cbc, glpkLp, Path(work, 'glpsol.txt')),
+            "native": solve(cbc, nativeLp, Path(work, 'native.txt'))
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Native LP builder against glpsol --wlp')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    parser.add_argument('--data', help='existing data_processed.txt instead of a synthetic case')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--density', type=float, default=0.3, help='share of SC_0 values replaced with non default data')
+    parser.add_argument('--solve', action='store_true', help='solve both LP files with CBC and compare the objective')
+    parser.add_argument('--output', help='write JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    source = Config.DATA_STORAGE
+    work = Path(tempfile.mkdtemp(prefix='osy-lp-'))
+    try:
+        if args.data:
+            processedFile = Path(args.data).resolve()
+        else:
+            from Classes.Case.DataFileClass import DataFile
+            storage = Path(work, 'storage')
+            SyntheticModel.prepareStorage(storage, source)
+            Config.DATA_STORAGE = storage
+            model = SyntheticModel('BENCH_{}'.format(args.preset.upper()), seed=args.seed, **PRESETS[args.preset])
+            model.create(args.density)
+            DataFile(model.casename).generateDatafile(model.caserun)
+            runPath = Path(storage, model.casename, 'res', model.caserun)
+            processedFile = Path(runPath, 'data_processed.txt')
+            DataFile(model.casename).preprocessData(Path(runPath, 'data.txt'), processedFile)
+        result = run(processedFile, work, args.solve)
+    finally:
+        Config.DATA_STORAGE = source
+        shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "benchmark": "lpBuilder",
+        "commit": gitCommit(),
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": str(args.data) if args.data else args.preset,
+        "density": None if args.data else args.density,
+        **result
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+End-to-end benchmark of the model pipeline on a synthetic case.
+
+Run from the repository root (Config resolves WebAPP/... relative paths):
+
+    python API/Benchmark/PipelineBenchmark.py --preset medium --repeat 3 --output bench.json
+
+Every stage is timed on its own, against a temporary DataStorage, and the report is written
+as JSON so results can be compared across commits.
+"""
+import os, sys, json, time, shutil, argparse, platform, subprocess, tempfile, statistics
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+ROOT_DIR = API_DIR.parent
+sys.path.insert(0, str(API_DIR))
+os.chdir(ROOT_DIR)
+
+from Classes.Base import Config
+from Benchmark.SyntheticModel import SyntheticModel, PRESETS
+
+def gitCommit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def timeStage(fn, repeat):
+    runs = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(runs), "min": min(runs), "runs": runs}, result
+
+def folderSize(path):
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+def runBenchmark(model, repeat=1, density=0.3):
+    #klase se importuju tek nakon sto je Config.DATA_STORAGE postavljen
+    from Classes.Case.UpdateCaseClass import UpdateCase
+    from Classes.Case.DataFileClass import DataFile
+    from Classes.Case.OsemosysClass import Osemosys
+
+    casePath = Path(Config.DATA_STORAGE, model.casename)
+    runPath = Path(casePath, 'res', model.caserun)
+    dataFile = Path(runPath, 'data.txt')
+    processedFile = Path(runPath, 'data_processed.txt')
+    resultsFile = Path(runPath, 'results.txt')
+
+    genData = model.genData()
+    model.writeGenData(genData)
+
+    stages = {}
+    stages['createCase'], _ = timeStage(lambda: model.createCase(genData), repeat)
+    model.fill(density)
+    model.writeViews(genData)
+    stages['updateCase'], _ = timeStage(lambda: UpdateCase(model.casename, genData).updateCase(), repeat)
+    stages['generateDatafile'], _ = timeStage(lambda: DataFile(model.casename).generateDatafile(model.caserun), repeat)
+    stages['preprocessData'], _ = timeStage(lambda: DataFile(model.casename).preprocessData(dataFile, processedFile), repeat)
+    stages['parseDataFile'], _ = timeStage(lambda: DataFile(model.casename).parseDataFile(dataFile), repeat)
+
+    resultRows = model.writeResults(genData, resultsFile)
+    stages['generateCSVfromCBC'], _ = timeStage(lambda: DataFile(model.casename).generateCSVfromCBC(dataFile, resultsFile, runPath), repeat)
+    stages['generateResultsViewer'], _ = timeStage(lambda: DataFile(model.casename).generateResultsViewer(model.caserun), repeat)
+    stages['viewDataByTech'], _ = timeStage(lambda: Osemosys(model.casename).viewDataByTech(), repeat)
+
+    return {
+        "stages": stages,
+        "files": {
+            "groupJsonBytes": sum(f.stat().st_size for f in casePath.glob('*.json')),
+            "dataFileBytes": dataFile.stat().st_size,
+            "dataProcessedBytes": processedFile.stat().st_size,
+            "resultsBytes": resultsFile.stat().st_size,
+            "resultRows": resultRows,
+            "csvBytes": folderSize(Path(runPath, 'csv')),
+            "viewBytes": folderSize(Path(casePath, 'view')),
+        }
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Synthetic OSeMOSYS pipeline benchmark')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    for key in PRESETS['small']:
+        parser.add_argument('--' + key, type=int, default=None, help='override preset ' + key)
+    parser.add_argument('--repeat', type=int, default=1, help='runs per stage, median is reported')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--density', type=float, default=0.3, help='share of SC_0 values replaced with non default data')
+    parser.add_argument('--output', help='write JSON report to this file instead of stdout')
+    parser.add_argument('--keep', action='store_true', help='keep the temporary DataStorage')
+    args = parser.parse_args(argv)
+
+    size = dict(PRESETS[args.preset])
+    size.update({k: getattr(args, k) for k in PRESETS['small'] if getattr(args, k) is not None})
+
+    source = Config.DATA_STORAGE
+    storage = Path(tempfile.mkdtemp(prefix='osy-bench-'))
+    try:
+        SyntheticModel.prepareStorage(storage, source)
+        Config.DATA_STORAGE = storage
+        model = SyntheticModel('BENCH_{}'.format(args.preset.upper()), seed=args.seed, **size)
+        result = runBenchmark(model, max(1, args.repeat), args.density)
+    finally:
+        Config.DATA_STORAGE = source
+        if not args.keep:
+            shutil.rmtree(storage, ignore_errors=True)
+
+    report = {
+        "benchmark": "pipeline",
+        "commit": gitCommit(),
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "preset": args.preset,
+        "size": size,
+        "repeat": max(1, args.repeat),
+        "density": args.density,
+        **result
+    }
+    if args.keep:
+        report["storage"] = str(storage)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+if __name__ == '__main__':
+    main()
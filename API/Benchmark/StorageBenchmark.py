@@ -0,0 +1,135 @@
+"""
+Storage backend benchmark, legacy vs compact vs compressed vs columnar.
+
+Run from the repository root:
+
+    python API/Benchmark/StorageBenchmark.py --preset medium --repeat 5
+    python API/Benchmark/StorageBenchmark.py --case WebAPP/DataStorage/<case> --output storage.json
+
+For every backend a copy of the case is converted by the first access migration (timed),
+then all JSON files of the case are read and written --repeat times through Storage and the
+size on disk is reported. Without --case a synthetic model is used and the pipeline stages of
+PipelineBenchmark are timed for each backend as well.
+"""
+import os, sys, json, time, shutil, argparse, platform, tempfile, statistics
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+ROOT_DIR = API_DIR.parent
+sys.path.insert(0, str(API_DIR))
+os.chdir(ROOT_DIR)
+
+from Classes.Base import Config
+from Classes.Base.StorageClass import Storage, BACKENDS
+from Benchmark.SyntheticModel import SyntheticModel, PRESETS
+from Benchmark.PipelineBenchmark import gitCommit, folderSize, runBenchmark
+
+def caseFiles(casePath):
+    files = set()
+    for folder, _, names in os.walk(casePath):
+        for name in names:
+            base = name[:-4] if name.endswith('.zst') else name[:-3] if name.endswith('.gz') else name
+            if base.endswith('.json'):
+                files.add(Path(folder, base))
+    return sorted(files)
+
+def timeAll(fn, files, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in files:
+            fn(path)
+        runs.append(time.perf_counter() - start)
+    return round(statistics.median(runs), 4)
+
+def benchFiles(backend, source, work, repeat):
+    Config.STORAGE_BACKEND = backend
+    storage = Path(work, backend, 'files')
+    SyntheticModel.prepareStorage(storage, Config.DATA_STORAGE)
+    casePath = Path(storage, Path(source).name)
+    shutil.copytree(source, casePath)
+    Config.DATA_STORAGE = storage
+
+    start = time.perf_counter()
+    migrated = Storage.migrateCase(casePath.name)
+    migration = round(time.perf_counter() - start, 4)
+
+    files = caseFiles(casePath)
+    data = {path: Storage.readFile(path) for path in files}
+    return {
+        "migrationSeconds": migration,
+        "migratedFiles": migrated,
+        "readSeconds": timeAll(Storage.readFile, files, repeat),
+        "writeSeconds": timeAll(lambda path: Storage.writeFile(data[path], path), files, repeat),
+        "bytes": folderSize(casePath),
+    }
+
+def benchPipeline(backend, preset, work, repeat, density):
+    Config.STORAGE_BACKEND = backend
+    storage = Path(work, backend, 'pipeline')
+    SyntheticModel.prepareStorage(storage, Config.DATA_STORAGE)
+    Config.DATA_STORAGE = storage
+    model = SyntheticModel('BENCH_{}'.format(preset.upper()), **PRESETS[preset])
+    result = runBenchmark(model, repeat, density)
+    return {name: round(stage["seconds"], 4) for name, stage in result["stages"].items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Storage backend benchmark')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='medium')
+    parser.add_argument('--case', help='existing case folder (legacy files are never modified, a copy is used)')
+    parser.add_argument('--backends', default=','.join(BACKENDS), help='comma separated backends')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--density', type=float, default=0.3, help='share of SC_0 values replaced with non default data')
+    parser.add_argument('--output', help='write JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    repeat = max(1, args.repeat)
+    backends = [b for b in args.backends.split(',') if b]
+    dataStorage = Config.DATA_STORAGE
+    storageBackend = Config.STORAGE_BACKEND
+    work = Path(tempfile.mkdtemp(prefix='osy-storage-'))
+    results = {}
+    try:
+        if args.case:
+            source = Path(args.case)
+        else:
+            #izvorni case u legacy formatu, svaki backend dobija svoju kopiju
+            Config.STORAGE_BACKEND = 'legacy'
+            storage = Path(work, 'source')
+            SyntheticModel.prepareStorage(storage, dataStorage)
+            Config.DATA_STORAGE = storage
+            model = SyntheticModel('BENCH_{}'.format(args.preset.upper()), **PRESETS[args.preset])
+            model.create(args.density)
+            source = Path(storage, model.casename)
+
+        for backend in backends:
+            Config.DATA_STORAGE = dataStorage
+            results[backend] = {"files": benchFiles(backend, source, work, repeat)}
+            if not args.case:
+                Config.DATA_STORAGE = dataStorage
+                results[backend]["pipeline"] = benchPipeline(backend, args.preset, work, repeat, args.density)
+    finally:
+        Config.DATA_STORAGE = dataStorage
+        Config.STORAGE_BACKEND = storageBackend
+        shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "benchmark": "storage",
+        "commit": gitCommit(),
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": str(args.case) if args.case else args.preset,
+        "repeat": repeat,
+        "backends": results
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+if __name__ == '__main__':
+    main()
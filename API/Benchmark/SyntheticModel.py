@@ -0,0 +1,203 @@
+import os, re, random, shutil
+from pathlib import Path
+
+from Classes.Base import Config
+from Classes.Base.StorageClass import Storage
+from Classes.Case.CaseClass import Case
+
+PRESETS = {
+    "small":  {"techs": 10,  "comms": 5,  "emis": 2,  "stgs": 1, "ts": 4,  "seasons": 2, "daytypes": 1, "brackets": 2, "years": 10, "modes": 2, "scenarios": 1},
+    "medium": {"techs": 50,  "comms": 20, "emis": 5,  "stgs": 3, "ts": 12, "seasons": 4, "daytypes": 1, "brackets": 3, "years": 30, "modes": 2, "scenarios": 2},
+    "large":  {"techs": 200, "comms": 60, "emis": 10, "stgs": 5, "ts": 24, "seasons": 4, "daytypes": 2, "brackets": 3, "years": 40, "modes": 3, "scenarios": 3},
+}
+
+class SyntheticModel():
+    """
+    Deterministic synthetic OSeMOSYS case in the DataStorage layout.
+
+    genData.json has the requested number of technologies, commodities, emissions, storages,
+    timeslices, years, modes and scenarios; group JSONs are created with Case.createCase,
+    view/resData.json gets one case run using all scenarios. writeResults produces a CBC style
+    results.txt for every model variable the results viewer knows about.
+    """
+    def __init__(self, casename, caserun='BENCH', startYear=2020, seed=1, **size):
+        self.casename = casename
+        self.caserun = caserun
+        self.startYear = startYear
+        self.size = dict(PRESETS['small'])
+        self.size.update({k: int(v) for k, v in size.items() if v is not None})
+        self.random = random.Random(seed)
+
+    def genData(self):
+        n = self.size
+        years = [str(self.startYear + i) for i in range(n['years'])]
+        comms = [{"CommId": "COM_{}".format(i), "Comm": "C{}".format(i), "Desc": "Synthetic commodity", "UnitId": "PJ"} for i in range(n['comms'])]
+        emis = [{"EmisId": "EMI_{}".format(i), "Emis": "E{}".format(i), "Desc": "Synthetic emission", "UnitId": "Ton"} for i in range(n['emis'])]
+        techs = []
+        for i in range(n['techs']):
+            #lanac: tech i trosi C(i) i proizvodi C(i+1), svaka treca ima emisiju
+            techs.append({
+                "TechId": "TEC_{}".format(i),
+                "Tech": "T{}".format(i),
+                "Desc": "Synthetic technology",
+                "CapUnitId": "GW",
+                "ActUnitId": "PJ",
+                "TG": [],
+                "IAR": [comms[i % n['comms']]['CommId']] if i % 4 else [],
+                "OAR": [comms[(i + 1) % n['comms']]['CommId']],
+                "EAR": [emis[i % n['emis']]['EmisId']] if n['emis'] and i % 3 == 0 else [],
+                "INCR": [],
+                "ITCR": []
+            })
+        seasons = [{"SeId": "SE_{}".format(i), "Se": str(i + 1), "Desc": "Synthetic season"} for i in range(n['seasons'])]
+        daytypes = [{"DtId": "DT_{}".format(i), "Dt": str(i + 1), "Desc": "Synthetic day type"} for i in range(n['daytypes'])]
+        brackets = [{"DtbId": "DTB_{}".format(i), "Dtb": str(i + 1), "Desc": "Synthetic daily time bracket"} for i in range(n['brackets'])]
+        timeslices = []
+        for i in range(n['ts']):
+            timeslices.append({
+                "TsId": "TS_{}".format(i),
+                "Ts": "S{}".format(i),
+                "Desc": "Synthetic timeslice",
+                "SE": seasons[i % n['seasons']]['SeId'],
+                "DT": daytypes[i % n['daytypes']]['DtId'],
+                "DTB": brackets[i % n['brackets']]['DtbId']
+            })
+        stgs = []
+        for i in range(n['stgs']):
+            stgs.append({
+                "StgId": "STG_{}".format(i),
+                "Stg": "ST{}".format(i),
+                "Desc": "Synthetic storage",
+                "UnitId": "PJ",
+                "TTS": techs[i % n['techs']]['TechId'],
+                "TFS": techs[(i + 1) % n['techs']]['TechId'],
+                "Operation": "Yearly"
+            })
+        scenarios = [{"ScenarioId": "SC_{}".format(i), "Scenario": "SC_{}".format(i), "Desc": "Synthetic scenario", "Active": True} for i in range(n['scenarios'])]
+        constraints = [{"ConId": "CO_0", "Con": "CO0", "Desc": "Synthetic constraint", "Tag": 1, "CM": [t['TechId'] for t in techs[:3]]}]
+
+        return {
+            "osy-version": "5.6",
+            "osy-casename": self.casename,
+            "osy-desc": "Synthetic benchmark model",
+            "osy-date": "",
+            "osy-currency": "USD",
+            "osy-mo": str(n['modes']),
+            "osy-tech": techs,
+            "osy-stg": stgs,
+            "osy-techGroups": [],
+            "osy-comm": comms,
+            "osy-ts": timeslices,
+            "osy-se": seasons,
+            "osy-dt": daytypes,
+            "osy-dtb": brackets,
+            "osy-emis": emis,
+            "osy-scenarios": scenarios,
+            "osy-constraints": constraints,
+            "osy-indicators": [],
+            "osy-years": years
+        }
+
+    @staticmethod
+    def prepareStorage(storage, source=None):
+        #parametri i varijable iz DataStorage, Duals/Indicators prazni ako ne postoje
+        source = Path(source or Config.DATA_STORAGE)
+        os.makedirs(storage, exist_ok=True)
+        for name in ('Parameters.json', 'Variables.json', 'Duals.json', 'Indicators.json'):
+            if Path(source, name).is_file():
+                shutil.copyfile(Path(source, name), Path(storage, name))
+            elif not Path(storage, name).is_file():
+                Storage.writeFile({}, Path(storage, name))
+
+    def caseRun(self, genData):
+        return {
+            "Case": self.caserun,
+            "CaseId": "CS_0",
+            "Desc": "Synthetic case run",
+            "Runtime": "",
+            "Scenarios": genData['osy-scenarios']
+        }
+
+    def writeGenData(self, genData):
+        casePath = Path(Config.DATA_STORAGE, self.casename)
+        os.makedirs(casePath, exist_ok=True)
+        Storage.writeFile(genData, Path(casePath, 'genData.json'))
+
+    def createCase(self, genData):
+        Case(self.casename, genData).createCase()
+
+    def writeViews(self, genData):
+        casePath = Path(Config.DATA_STORAGE, self.casename)
+        os.makedirs(Path(casePath, 'res', self.caserun, 'csv'), exist_ok=True)
+        os.makedirs(Path(casePath, 'view'), exist_ok=True)
+        variables = Storage.readParamFile(Path(Config.DATA_STORAGE, 'Variables.json'))
+        viewDef = {obj['id']: [] for group, lists in variables.items() for obj in lists}
+        Storage.writeFile({"osy-cases": [self.caseRun(genData)]}, Path(casePath, 'view', 'resData.json'))
+        Storage.writeFile({"osy-views": viewDef}, Path(casePath, 'view', 'viewDefinitions.json'))
+
+    def fill(self, density=0.3):
+        #dio default vrijednosti u SC_0 zamijeni sa slucajnim, da data.txt ne bude prazan
+        casePath = Path(Config.DATA_STORAGE, self.casename)
+        for name in sorted({Storage.baseName(p.name) for p in casePath.glob('*.json*')}):
+            if name == 'genData.json':
+                continue
+            path = Path(casePath, name)
+            data = Storage.readFile(path)
+            for param, scenarios in data.items():
+                for chunk in scenarios.get('SC_0', []):
+                    for key, value in chunk.items():
+                        if key.endswith('Id') or isinstance(value, bool) or not isinstance(value, (int, float)):
+                            continue
+                        if self.random.random() < density:
+                            chunk[key] = self.random.randint(1, 100)
+            Storage.writeFile(data, path)
+
+    def create(self, density=0.3):
+        genData = self.genData()
+        self.writeGenData(genData)
+        self.createCase(genData)
+        self.fill(density)
+        self.writeViews(genData)
+        return genData
+
+    def setMembers(self, genData):
+        n = self.size
+        return {
+            "r": ['RE1'],
+            "t": [t['Tech'] for t in genData['osy-tech']],
+            "f": [c['Comm'] for c in genData['osy-comm']],
+            "e": [e['Emis'] for e in genData['osy-emis']],
+            "s": [s['Stg'] for s in genData['osy-stg']],
+            "l": [ts['Ts'] for ts in genData['osy-ts']],
+            "y": genData['osy-years'],
+            "m": [str(m) for m in range(1, n['modes'] + 1)],
+        }
+
+    @staticmethod
+    def modelVariables(modelFile=None):
+        modelFile = modelFile or Path(Config.SOLVERs_FOLDER, 'model.v.5.4.txt')
+        with open(modelFile, 'r') as f:
+            return set(re.findall(r'^\s*var\s+(\w+)', f.read(), re.MULTILINE))
+
+    def writeResults(self, genData, resultsPath, modelFile=None):
+        """CBC 'solve -solu' style output for every solver variable that is also in Variables.json."""
+        members = self.setMembers(genData)
+        solved = self.modelVariables(modelFile)
+        variables = Storage.readParamFile(Path(Config.DATA_STORAGE, 'Variables.json'))
+        rows = 0
+        with open(resultsPath, 'w') as f:
+            f.write('Optimal - objective value {:.8f}\n'.format(self.random.uniform(1e4, 1e6)))
+            for group, lists in variables.items():
+                for var in lists:
+                    if var['name'] not in solved:
+                        continue
+                    combos = [[]]
+                    for rel in var['setrelation']:
+                        combos = [c + [m] for c in combos for m in members[rel]]
+                    for combo in combos:
+                        if not combo:
+                            continue
+                        f.write('{:>7} {}({}) {:>23.12g} {:>23.12g}\n'.format(
+                            rows, var['name'], ','.join(combo), round(self.random.uniform(0, 100), 4), 0))
+                        rows += 1
+        return rows
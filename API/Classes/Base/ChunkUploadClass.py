@@ -0,0 +1,128 @@
+import os, json, shutil, threading
+from pathlib import Path
+from werkzeug.utils import secure_filename
+
+from Classes.Base import Config
+
+class ChunkUpload():
+    """
+    Assembly of a chunked (Dropzone) upload in constant memory.
+
+    Received chunk indexes are tracked in a small manifest.json inside the chunk folder.
+    When the client sends dztotalfilesize and dzchunkbyteoffset each chunk is streamed
+    directly at its offset into a preallocated <uuid>.part file, otherwise chunks are
+    stored separately and concatenated with os.sendfile (or shutil.copyfileobj) at the end.
+    """
+    #fiksan broj lockova po hashu uuid-a, napusteni upload ne ostavlja lock u memoriji
+    _locks = [threading.Lock() for _ in range(64)]
+
+    def __init__(self, uuid, totalChunks, totalSize=None):
+        self.uuid = secure_filename(str(uuid))
+        if not self.uuid:
+            raise ValueError('Invalid upload id!')
+        self.totalChunks = int(totalChunks)
+        self.totalSize = int(totalSize) if totalSize not in (None, '') else None
+        self.chunkDir = Path(Config.DATA_STORAGE, '_chunks', self.uuid)
+        self.manifestPath = Path(self.chunkDir, 'manifest.json')
+        self.partPath = Path(self.chunkDir, self.uuid + '.part')
+        self.lock = self._getLock(self.uuid)
+
+    @classmethod
+    def _getLock(cls, uuid):
+        return cls._locks[hash(uuid) % len(cls._locks)]
+
+    def _readManifest(self):
+        if os.path.exists(self.manifestPath):
+            with open(self.manifestPath, 'r') as f:
+                return json.load(f)
+        return {
+            "total": self.totalChunks,
+            "size": self.totalSize,
+            "offset": self.totalSize is not None,
+            "received": []
+        }
+
+    def _writeManifest(self, manifest):
+        tmpPath = Path(self.chunkDir, 'manifest.json.tmp')
+        with open(tmpPath, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmpPath, self.manifestPath)
+
+    def chunkPath(self, index):
+        return Path(self.chunkDir, 'chunk_' + str(index))
+
+    def saveChunk(self, index, stream, offset=None):
+        index = int(index)
+        if index < 0 or index >= self.totalChunks:
+            raise ValueError('Chunk index {} out of range!'.format(index))
+
+        with self.lock:
+            os.makedirs(self.chunkDir, exist_ok=True)
+            manifest = self._readManifest()
+            if not os.path.exists(self.manifestPath):
+                self._writeManifest(manifest)
+            if manifest['offset'] and not os.path.exists(self.partPath):
+                #preallocate, chunkovi se upisuju direktno na svoj offset
+                with open(self.partPath, 'wb') as f:
+                    f.truncate(manifest['size'])
+
+        if manifest['offset']:
+            if offset in (None, ''):
+                raise ValueError('Chunk {} has no byte offset!'.format(index))
+            with open(self.partPath, 'r+b') as f:
+                f.seek(int(offset))
+                shutil.copyfileobj(stream, f, Config.UPLOAD_BUFFER_SIZE)
+                if f.tell() > manifest['size']:
+                    raise ValueError('Chunk {} exceeds declared file size!'.format(index))
+        else:
+            with open(self.chunkPath(index), 'wb') as f:
+                shutil.copyfileobj(stream, f, Config.UPLOAD_BUFFER_SIZE)
+
+        with self.lock:
+            current = self._readManifest()
+            if index not in current['received']:
+                current['received'].append(index)
+            self._writeManifest(current)
+            return len(current['received'])
+
+    @staticmethod
+    def _copy(src, dst):
+        sent = 0
+        if hasattr(os, 'sendfile'):
+            dst.flush()
+            size = os.fstat(src.fileno()).st_size
+            try:
+                while sent < size:
+                    count = os.sendfile(dst.fileno(), src.fileno(), sent, size - sent)
+                    if count == 0:
+                        break
+                    sent += count
+            except OSError:
+                #sendfile nije podrzan za ovaj fs, nastavi sa copyfileobj
+                if sent:
+                    raise
+            if sent == size:
+                return
+        src.seek(sent)
+        shutil.copyfileobj(src, dst, Config.UPLOAD_BUFFER_SIZE)
+
+    def assemble(self, finalPath):
+        manifest = self._readManifest()
+        if len(manifest['received']) < self.totalChunks:
+            raise ValueError('Upload {} is not complete!'.format(self.uuid))
+
+        if manifest['offset']:
+            os.replace(self.partPath, finalPath)
+        else:
+            with open(finalPath, 'wb') as merged:
+                for i in range(self.totalChunks):
+                    with open(self.chunkPath(i), 'rb') as part:
+                        self._copy(part, merged)
+        self.cleanup()
+        return finalPath
+
+    def cleanup(self):
+        shutil.rmtree(self.chunkDir, ignore_errors=True)
+        parent = os.path.dirname(self.chunkDir)
+        if os.path.exists(parent) and not os.listdir(parent):
+            os.rmdir(parent)
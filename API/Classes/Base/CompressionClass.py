@@ -0,0 +1,81 @@
+import gzip, logging
+from flask import request
+
+from Classes.Base import Config
+from Classes.Base.MetricsClass import Metrics
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard as zstd
+    _HAS_ZSTD = True
+except Exception:
+    _HAS_ZSTD = False
+
+try:
+    import brotli
+    _HAS_BROTLI = True
+except Exception:
+    _HAS_BROTLI = False
+
+class Compression():
+    """
+    Response compression negotiated with Accept-Encoding.
+
+    The encoding is the one with the highest client quality among Config.HTTP_COMPRESSION_ENCODINGS
+    that are installed (zstd and br are optional), ties go to the order in Config. Bodies smaller than
+    Config.HTTP_COMPRESSION_MIN_SIZE, streamed and file responses are left as they are. A compressed
+    representation gets its own strong ETag (<etag>-<encoding>).
+    """
+    MIMETYPES = ('application/json', 'text/plain', 'text/csv', 'text/html')
+
+    @staticmethod
+    def available():
+        installed = {'gzip': True, 'zstd': _HAS_ZSTD, 'br': _HAS_BROTLI}
+        return [e for e in Config.HTTP_COMPRESSION_ENCODINGS if installed.get(e)]
+
+    @staticmethod
+    def negotiate(size):
+        if not Config.HTTP_COMPRESSION or size < Config.HTTP_COMPRESSION_MIN_SIZE:
+            return None
+        encodings = Compression.available()
+        accept = request.accept_encodings
+        best = accept.best_match(encodings)
+        #identity ili nepoznat header, best_match vraca prvi koji klijent prihvata
+        if best is None or accept[best] <= 0:
+            return None
+        return best
+
+    @staticmethod
+    def compress(payload, encoding):
+        level = Config.HTTP_COMPRESSION_LEVEL.get(encoding)
+        if encoding == 'zstd':
+            return zstd.ZstdCompressor(level=level).compress(payload)
+        if encoding == 'br':
+            return brotli.compress(payload, quality=level)
+        return gzip.compress(payload, compresslevel=level, mtime=0)
+
+    @staticmethod
+    def etag(etag, encoding):
+        return '{}-{}'.format(etag, encoding) if encoding else etag
+
+    @staticmethod
+    def response(response):
+        """after_request hook for responses built in memory (jsonify...)."""
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in Compression.MIMETYPES
+                or request.method == 'HEAD'):
+            return response
+        payload = response.get_data()
+        encoding = Compression.negotiate(len(payload))
+        if encoding is None:
+            return response
+        body = Compression.compress(payload, encoding)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(Compression.etag(etag, encoding), weak)
+        Metrics.compressed(encoding, len(payload), len(body))
+        return response
@@ -44,6 +44,117 @@ os.chmod(DATA_STORAGE, 0o777)
 HEROKU_DEPLOY = 0
 AWS_SYNC = 0
 
+#sync engine, 's3' or 'local' (directory standing in for the bucket, offline sync)
+SYNC_BACKEND = 's3'
+SYNC_LOCAL_ROOT = Path("WebAPP", 'SyncStorage')
+SYNC_MAX_WORKERS = 8
+SYNC_PART_CONCURRENCY = 4
+SYNC_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+SYNC_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+#import xls template, parameter groups are processed in parallel by a pool of workers
+IMPORT_PARALLEL = 1
+IMPORT_WORKERS = min(8, os.cpu_count() or 1)
+
+#chunked upload, buffer used to stream chunks to disk
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+#restore of backup, result artifacts (res/<caserun>/*) are extracted 'background' | 'sync' | 'skip'
+RESTORE_RESULTS = 'background'
+RESTORE_WORKERS = min(4, os.cpu_count() or 1)
+
+#backup, zip is streamed to the client, heavy solver artifacts are excluded by default
+BACKUP_COMPRESSION_LEVEL = 6
+BACKUP_INCLUDE_RESULTS = 1
+BACKUP_EXCLUDE = ('lp.lp', 'results.txt', 'data_processed.txt', 'lp.lp.gz', 'results.txt.gz', 'data_processed.txt.gz', 'mipstart.txt')
+BACKUP_BUFFER_SIZE = 1024 * 1024
+
+#metrics, /metrics in prometheus text format
+METRICS_ENABLED = 1
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+#profiler, request is sampled when it has X-Osy-Profile header or ?osyProfile=1 (PROFILE_ALL samples every request)
+PROFILE_ENABLED = 1
+PROFILE_ALL = 0
+PROFILE_INTERVAL = 0.005
+PROFILE_KEEP = 200
+PROFILE_FOLDER = Path("WebAPP", 'Profiles')
+
+#storage of model JSON files 'legacy' | 'compact' | 'compressed' | 'columnar', cases are converted on first access
+STORAGE_BACKEND = 'compact'
+STORAGE_MIGRATE = 1
+#zstd dictionary for group files, dictionary is local to this installation (backups from other installs need it too)
+STORAGE_ZSTD_DICT = 0
+STORAGE_DICT_FOLDER = Path("WebAPP", 'StorageDict')
+
+#http cache za JSON odgovore, ETag 'mtime' (mtime i velicina fajla) | 'digest' (blake2b sadrzaja)
+HTTP_CACHE_VALIDATOR = 'mtime'
+HTTP_CACHE_BYTES = 64 * 1024 * 1024
+HTTP_CACHE_MAX_ENTRY = 8 * 1024 * 1024
+#Parameters.json, Variables.json... mijenjaju se samo sa novom verzijom aplikacije
+HTTP_CACHE_CONFIG_MAX_AGE = 600
+
+#kompresija odgovora po Accept-Encoding, redoslijed je prioritet servera (br samo ako je brotli instaliran)
+HTTP_COMPRESSION = 1
+HTTP_COMPRESSION_MIN_SIZE = 4096
+HTTP_COMPRESSION_ENCODINGS = ('zstd', 'br', 'gzip')
+HTTP_COMPRESSION_LEVEL = {'zstd': 3, 'br': 5, 'gzip': 6}
+
+#/queryResultData, broj redova po strani
+RESULT_QUERY_LIMIT = 1000
+RESULT_QUERY_MAX_LIMIT = 10000
+
+#LP fajl za CBC, 'native' (LpBuilder, samo za model.v.5.4.txt) | 'glpsol' (glpsol --check --wlp)
+LP_BUILDER = 'native'
+#CBC opcije, podrazumijevane za caserun bez SolverOptions u resData (None = CBC default)
+CBC_OPTIONS = {'threads': 1, 'seconds': None, 'ratioGap': None, 'presolve': 'on', 'method': 'auto', 'warmStart': None}
+#CBC pise bazu LP rjesenja (res/<caserun>/basis.bas) za warm start drugih caseruna
+CBC_SAVE_BASIS = 1
+#jezgra za CBC procese koji rade istovremeno, batch run pokrece do BATCH_WORKERS caseruna paralelno
+SOLVER_CORES = os.cpu_count() or 1
+BATCH_WORKERS = min(4, SOLVER_CORES)
+
+#runovi koji se izvrsavaju istovremeno, po sesiji i po case-u (0 bez ogranicenja), ostali cekaju u redu
+RUN_SLOTS = BATCH_WORKERS
+#waitress threadovi, /runProgress (SSE) drzi najvise RUN_PROGRESS_STREAMS, /run i /batchRun najvise RUN_REQUEST_THREADS
+#(preko toga 503, Retry-After RUN_BUSY_RETRY s), 2 ostaju za interaktivne rute
+HTTP_THREADS = 12
+RUN_PROGRESS_STREAMS = RUN_SLOTS
+RUN_REQUEST_THREADS = HTTP_THREADS - RUN_PROGRESS_STREAMS - 2
+RUN_BUSY_RETRY = 30
+RUN_SESSION_SLOTS = max(1, RUN_SLOTS - 1)
+RUN_CASE_SLOTS = 0
+#memorija za runove u bajtima, None = pola fizicke memorije, 0 bez ogranicenja; procjena iz velicine LP fajla
+RUN_MEMORY = None
+RUN_MEMORY_MIN = 256 * 1024 * 1024
+RUN_MEMORY_PER_LP_BYTE = 6
+#gruba procjena LP fajla iz data.txt kad caserun jos nema LP fajl
+RUN_LP_PER_DATA_BYTE = 100
+
+#napredak runa preko /runProgress (SSE), izlaz solvera kroz pseudo terminal da stize liniju po liniju
+SOLVER_OUTPUT_PTY = 1
+RUN_PROGRESS_EVENTS = 2000
+RUN_PROGRESS_KEEP = 600
+RUN_PROGRESS_HEARTBEAT = 15
+RUN_PROGRESS_RETRY = 3000
+
+#solveri: timeout u sekundama (0 bez ogranicenja), pokrenuti procesi se pamte da se nakon pada servera mogu ugasiti
+SOLVER_TIMEOUT = 0
+SOLVER_KILL_GRACE = 5
+SOLVER_TABLE = Path("WebAPP", 'SolverProcesses.json')
+
+#cache LP fajlova po sadrzaju (model, data.txt, LP_BUILDER), isti caserun ide direktno na CBC
+LP_CACHE = 1
+LP_CACHE_FOLDER = Path("WebAPP", 'LpCache')
+LP_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+LP_CACHE_MAX_AGE = 7 * 24 * 3600
+
+#artefakti solvera: lp.lp.gz za CBC preveden sa zlib, 0 | 1 | 'auto' (CBC se provjeri jednom)
+SOLVER_GZIP_LP = 'auto'
+#poslije CSV i view uspjesnog runa 'keep' | 'compress' (gzip lp.lp, results.txt, data.txt) | 'delete' (lp.lp, results.txt)
+ARTIFACT_RETENTION = 'keep'
+ARTIFACT_GZIP_LEVEL = 6
+
 PINNED_COLUMNS = ('Sc', 'Tech', 'Comm', 'Emis','Stg', 'Ts', 'MoO', 'UnitId', 'Se','Dt', 'Dtb', 'paramName','TechName', 'CommName', 'EmisName', 'ConName', 'MoId')
 
 TECH_GROUPS = ('RYT', 'RYTM', 'RYTC', 'RYTCn', 'RYTCM', 'RYTE', 'RYTEM', 'RYTTs')
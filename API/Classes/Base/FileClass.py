@@ -1,12 +1,16 @@
 #import ujson as json
 import json
 
+from Classes.Base.MetricsClass import Metrics
+
 class File:
     @staticmethod
     def readFile(path):
         try:   
             f = open(path, mode="r")
-            data = json.loads(f.read())
+            text = f.read()
+            Metrics.fileBytes('read', len(text))
+            data = json.loads(text)
             #cirilica u json file
             #data = json.load(open(path, encoding='utf-8-sig'))
             f.close()
@@ -26,7 +30,9 @@ class File:
             #f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
             #f.write(json.dumps(data, ensure_ascii=True,  indent=4, sort_keys=False))
             #ascii false da zapisemo cirilicu u file
-            f.write(json.dumps(data, ensure_ascii=True,  indent=4, sort_keys=False))
+            text = json.dumps(data, ensure_ascii=True,  indent=4, sort_keys=False)
+            f.write(text)
+            Metrics.fileBytes('write', len(text))
             #f.write(json.dumps(data))
             f.close()
         # except(IOError, IndexError):
@@ -46,7 +52,9 @@ class File:
         try:
             f = open(path, mode="w")
             #usjon
-            f.write(json.dumps(data))
+            text = json.dumps(data)
+            f.write(text)
+            Metrics.fileBytes('write', len(text))
             f.close()
         except(IOError, IndexError):
             raise IndexError
@@ -57,7 +65,9 @@ class File:
     def readParamFile(path):
         try:
             f = open(path, mode="r")
-            data = json.loads(f.read())
+            text = f.read()
+            Metrics.fileBytes('read', len(text))
+            data = json.loads(text)
             f.close()
             return data
         except( IndexError):
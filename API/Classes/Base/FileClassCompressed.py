@@ -1,14 +1,19 @@
 import os
 import io
+import re
 import json
 import gzip
 import time
+import atexit
 import tempfile
+import threading
 import warnings
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from contextlib import contextmanager
 
+from Classes.Base import Config
+
 # Optional fast JSON libs
 try:
     import orjson  # type: ignore
@@ -44,6 +49,17 @@ class File:
     Backward compatibility helpers:
       * readFile("file.json") will also try "file.json.zst" then "file.json.gz" if "file.json" does not exist.
       * You can opt-in to default compression for writes without changing call sites.
+
+    Codec policy (writeFile / writeFileUJson):
+      * Payloads smaller than _PLAIN_BELOW[path class] bytes are written as plain JSON, compression does not
+        pay off for small files that are rewritten constantly (resData.json, viewDefinitions.json).
+      * Model group files (R*.json in the case folder) are compressed with a trained zstd dictionary when
+        one is available (see trainGroupDictionary), other large files use the default compression.
+      * Durability is chosen per path class in _FSYNC: 'always' fsyncs before the rename, 'batched'
+        fsyncs renamed files from a background flusher every _FSYNC_INTERVAL seconds, 'never' leaves it
+        to the OS. The rename is atomic in every mode.
+      * Stale variants of the same file (.json / .json.zst / .json.gz) are removed after a write, so a
+        reader never picks up an older representation.
     """
 
     # ---------------------------
@@ -55,6 +71,33 @@ class File:
     _ZSTD_LEVEL: int = 3                          # Good balance for APIs
     _GZIP_LEVEL: int = 6                          # Default gzip level
 
+    # Codec policy, defaults picked with API/Benchmark/CodecBenchmark.py
+    _PLAIN_BELOW: Dict[str, int] = {              # Path class -> payloads smaller than this stay plain JSON
+        "group": 1024,                            # group files compress ~10x, the dictionary helps most on small ones
+        "case": 16 * 1024,
+        "view": 16 * 1024,
+        "result": 16 * 1024,
+        "other": 16 * 1024,
+    }
+    _GROUP_DICT: bool = True                      # Use the trained zstd dictionary for model group files
+    _DICT_FOLDER: Optional[str] = None            # Folder with <dict_id>.zdict files and group.current
+    _FSYNC: Dict[str, str] = {                    # Path class -> 'always' | 'batched' | 'never'
+        "group": "always",
+        "case": "always",
+        "view": "batched",
+        "result": "batched",
+        "other": "always",
+    }
+    _FSYNC_INTERVAL: float = 1.0                  # Seconds between batched fsyncs
+
+    _GROUP_FILE = re.compile(r"^R([A-Z][A-Za-z]*)?\.json$")
+    _DICTS: Dict[int, Any] = {}
+    _ACTIVE_DICT: Optional[int] = None
+    _DICTS_LOADED: bool = False
+    _PENDING: set = set()
+    _PENDING_LOCK = threading.Lock()
+    _FLUSHER: Optional[threading.Thread] = None
+
     # ---------------------------
     # Internal path normalizer
     # ---------------------------
@@ -96,6 +139,172 @@ class File:
     def set_mirror_legacy_json(mirror: bool) -> None:
         File._MIRROR_LEGACY_JSON = bool(mirror)
 
+    @staticmethod
+    def configure_policy(
+        plain_below: Optional[Any] = None,
+        group_dict: Optional[bool] = None,
+        dict_folder: Optional[str] = None,
+        fsync: Optional[Dict[str, str]] = None,
+        fsync_interval: Optional[float] = None,
+    ) -> None:
+        """
+        Configure the codec policy, arguments left as None keep their current value.
+        plain_below is one threshold for every path class or a {class: bytes} mapping.
+        Example:
+            File.configure_policy(plain_below={'view': 32 * 1024}, fsync={'view': 'never'})
+        """
+        if fsync:
+            for klass, mode in fsync.items():
+                if mode not in ("always", "batched", "never"):
+                    raise ValueError("fsync mode must be 'always', 'batched' or 'never'")
+            File._FSYNC = {**File._FSYNC, **fsync}
+        if isinstance(plain_below, dict):
+            File._PLAIN_BELOW = {**File._PLAIN_BELOW, **{k: int(v) for k, v in plain_below.items()}}
+        elif plain_below is not None:
+            File._PLAIN_BELOW = {k: int(plain_below) for k in File._PLAIN_BELOW}
+        if group_dict is not None:
+            File._GROUP_DICT = bool(group_dict)
+        if dict_folder is not None:
+            File._DICT_FOLDER = str(dict_folder)
+            File._DICTS_LOADED = False
+        if fsync_interval is not None:
+            File._FSYNC_INTERVAL = float(fsync_interval)
+
+    # ---------------------------
+    # Path classes and durability
+    # ---------------------------
+    @staticmethod
+    def _path_class(path: str) -> str:
+        """'group' | 'case' | 'view' | 'result' | 'other' for a (possibly compressed) JSON path."""
+        p = Path(str(path))
+        name = p.name
+        for ext in (".zst", ".gz"):
+            if name.endswith(ext):
+                name = name[:-len(ext)]
+        # res/ and view/ only directly in the case folder, a case may itself be named res or view
+        storage = Path(os.path.abspath(str(Config.DATA_STORAGE))).parts
+        parts = Path(os.path.abspath(str(p))).parts[:-1]
+        folder = parts[len(storage) + 1] if parts[:len(storage)] == storage and len(parts) > len(storage) + 1 else None
+        if folder == "res":
+            return "result"
+        if folder == "view":
+            return "view"
+        if File._GROUP_FILE.match(name):
+            return "group"
+        if name == "genData.json":
+            return "case"
+        return "other"
+
+    @staticmethod
+    def _fsync_mode(path: str) -> str:
+        return File._FSYNC.get(File._path_class(path), "always")
+
+    @staticmethod
+    def _fsync(fd: int, path: str) -> None:
+        """fsync of the temp file before the rename, only for 'always' paths."""
+        if File._fsync_mode(path) == "always":
+            os.fsync(fd)
+
+    @staticmethod
+    def _committed(path: str) -> None:
+        """Called after the rename, 'batched' paths are queued for the background flusher."""
+        if File._fsync_mode(path) != "batched":
+            return
+        with File._PENDING_LOCK:
+            File._PENDING.add(str(path))
+            if File._FLUSHER is None or not File._FLUSHER.is_alive():
+                File._FLUSHER = threading.Thread(target=File._flush_loop, daemon=True)
+                File._FLUSHER.start()
+
+    @staticmethod
+    def _flush_loop() -> None:
+        while True:
+            time.sleep(File._FSYNC_INTERVAL)
+            File.sync()
+            with File._PENDING_LOCK:
+                if not File._PENDING:
+                    File._FLUSHER = None
+                    return
+
+    @staticmethod
+    def sync() -> int:
+        """fsync every file written in 'batched' mode and not synced yet. Returns the number of files."""
+        with File._PENDING_LOCK:
+            pending = list(File._PENDING)
+            File._PENDING.clear()
+        for path in pending:
+            try:
+                # rb+ so that fsync also works on Windows (_commit needs a writable handle)
+                with open(path, "rb+") as f:
+                    os.fsync(f.fileno())
+            except FileNotFoundError:
+                pass
+        return len(pending)
+
+    # ---------------------------
+    # Zstd dictionaries
+    # ---------------------------
+    @staticmethod
+    def _load_dicts() -> None:
+        if File._DICTS_LOADED:
+            return
+        File._DICTS_LOADED = True
+        File._DICTS = {}
+        File._ACTIVE_DICT = None
+        if not (_HAS_ZSTD and File._DICT_FOLDER and os.path.isdir(File._DICT_FOLDER)):
+            return
+        for entry in os.scandir(File._DICT_FOLDER):
+            if entry.name.endswith(".zdict"):
+                with open(entry.path, "rb") as f:
+                    zdict = zstd.ZstdCompressionDict(f.read())
+                # Precomputed once, otherwise every compressor rebuilds the dictionary tables
+                zdict.precompute_compress(level=File._ZSTD_LEVEL)
+                File._DICTS[zdict.dict_id()] = zdict
+        current = Path(File._DICT_FOLDER, "group.current")
+        if current.is_file():
+            dict_id = int(current.read_text().strip() or 0)
+            File._ACTIVE_DICT = dict_id if dict_id in File._DICTS else None
+
+    @staticmethod
+    def _group_dict(path: str):
+        """Active dictionary for a group file write, None when not applicable."""
+        if not (File._GROUP_DICT and _HAS_ZSTD) or File._path_class(path) != "group":
+            return None
+        File._load_dicts()
+        return File._DICTS.get(File._ACTIVE_DICT)
+
+    @staticmethod
+    def _dict_by_id(dict_id: int):
+        File._load_dicts()
+        zdict = File._DICTS.get(dict_id)
+        if zdict is None:
+            raise RuntimeError(f"zstd dictionary {dict_id} not found in {File._DICT_FOLDER}")
+        return zdict
+
+    @staticmethod
+    def trainGroupDictionary(paths: List[str], dict_folder: Optional[str] = None, size: int = 112 * 1024) -> int:
+        """
+        Train a zstd dictionary on model group files and make it the active one.
+        Dictionaries are kept by id, files written with an older dictionary stay readable.
+        Returns the dictionary id.
+        """
+        if not _HAS_ZSTD:
+            raise RuntimeError("zstandard is not installed; run `pip install zstandard`.")
+        folder = str(dict_folder or File._DICT_FOLDER)
+        if not folder or folder == "None":
+            raise ValueError("dict_folder is not configured")
+        samples = []
+        for path in paths:
+            samples.append(File.dumps(File.readFile(path)))
+        zdict = zstd.train_dictionary(int(size), samples)
+        dict_id = zdict.dict_id()
+        os.makedirs(folder, exist_ok=True)
+        File._atomic_write_bytes(str(Path(folder, f"{dict_id}.zdict")), lambda f: f.write(zdict.as_bytes()))
+        File._atomic_write_bytes(str(Path(folder, "group.current")), lambda f: f.write(str(dict_id).encode()))
+        File._DICT_FOLDER = folder
+        File._DICTS_LOADED = False
+        return dict_id
+
     # ---------------------------
     # Path helpers
     # ---------------------------
@@ -243,8 +452,9 @@ class File:
             with open(tmp_path, mode="w", encoding="utf-8", newline="") as tmp:
                 write_fn(tmp)
                 tmp.flush()
-                os.fsync(tmp.fileno())
+                File._fsync(tmp.fileno(), path)
             os.replace(tmp_path, path)
+            File._committed(path)
         except Exception:
             try:
                 File._safe_remove(tmp_path)
@@ -266,8 +476,9 @@ class File:
             with open(tmp_path, mode="wb") as tmp:
                 write_bytes_fn(tmp)
                 tmp.flush()
-                os.fsync(tmp.fileno())
+                File._fsync(tmp.fileno(), path)
             os.replace(tmp_path, path)
+            File._committed(path)
         except Exception:
             try:
                 File._safe_remove(tmp_path)
@@ -345,8 +556,9 @@ class File:
                         zf_txt.flush()
                 # 'raw' is still open here
                 raw.flush()
-                os.fsync(raw.fileno())
+                File._fsync(raw.fileno(), path)
             os.replace(tmp_path, path)
+            File._committed(path)
         except Exception:
             try:
                 File._safe_remove(tmp_path)
@@ -354,10 +566,11 @@ class File:
                 raise
 
     @staticmethod
-    def _atomic_write_zstd_bytes(path: str, write_bytes_fn, level: int = None) -> None:
+    def _atomic_write_zstd_bytes(path: str, write_bytes_fn, level: int = None, zdict=None) -> None:
         """
         Atomic write for Zstandard BYTES content (requires zstandard).
         write_bytes_fn(bin_file) must write BYTES to the provided stream.
+        zdict: optional ZstdCompressionDict, its id is stored in the frame header.
         """
         path = str(path)
         if not _HAS_ZSTD:
@@ -371,7 +584,7 @@ class File:
 
         tmp_path = File._mkstemp_in_dir(str(target.parent), suffix=".zst")
         try:
-            cctx = zstd.ZstdCompressor(level=int(level))
+            cctx = zstd.ZstdCompressor(level=int(level), dict_data=zdict) if zdict is not None else zstd.ZstdCompressor(level=int(level))
             with open(tmp_path, "wb") as raw:
                 # Keep underlying 'raw' open until we fsync it
                 with cctx.stream_writer(raw, closefd=False) as zf_bin:
@@ -379,8 +592,9 @@ class File:
                     zf_bin.flush()
                 # 'raw' is still open here
                 raw.flush()
-                os.fsync(raw.fileno())
+                File._fsync(raw.fileno(), path)
             os.replace(tmp_path, path)
+            File._committed(path)
         except Exception:
             try:
                 File._safe_remove(tmp_path)
@@ -402,7 +616,10 @@ class File:
             raise RuntimeError("zstandard is not installed; run `pip install zstandard`.")
 
         raw = open(path, "rb")
-        dctx = zstd.ZstdDecompressor()
+        # Frames written with a dictionary carry its id in the header
+        dict_id = zstd.get_frame_parameters(raw.read(18)).dict_id
+        raw.seek(0)
+        dctx = zstd.ZstdDecompressor(dict_data=File._dict_by_id(dict_id)) if dict_id else zstd.ZstdDecompressor()
         zstream = dctx.stream_reader(raw)
         txt = io.TextIOWrapper(zstream, encoding="utf-8", newline="")
         try:
@@ -478,6 +695,82 @@ class File:
             raise last_error
         raise FileNotFoundError(f"File not found: {path}")
 
+    @staticmethod
+    def readBytes(path) -> bytes:
+        """
+        Decompressed JSON bytes, with the same candidate lookup as readFile().
+        Used where the document is passed on as is (HTTP responses) or parsed by the caller.
+        """
+        path = File._to_str(path)
+        last_error = None
+        for candidate in File._candidate_read_paths(path):
+            try:
+                if File._is_zstd_path(candidate):
+                    if not _HAS_ZSTD:
+                        raise RuntimeError("zstandard is not installed; run `pip install zstandard`.")
+                    with open(candidate, "rb") as raw:
+                        dict_id = zstd.get_frame_parameters(raw.read(18)).dict_id
+                        raw.seek(0)
+                        dctx = zstd.ZstdDecompressor(dict_data=File._dict_by_id(dict_id)) if dict_id else zstd.ZstdDecompressor()
+                        with dctx.stream_reader(raw, closefd=False) as reader:
+                            return reader.readall()
+                if File._is_gzip_path(candidate):
+                    with gzip.open(candidate, mode="rb") as f:
+                        return f.read()
+                with open(candidate, mode="rb") as f:
+                    return f.read()
+            except FileNotFoundError as e:
+                last_error = e
+        if last_error:
+            raise last_error
+        raise FileNotFoundError(f"File not found: {path}")
+
+    # zstd Content-Encoding in browsers accepts windows up to 8 MB (RFC 8878)
+    _HTTP_ZSTD_WINDOW = 8 * 1024 * 1024
+
+    @staticmethod
+    def contentEncoding(path) -> Optional[str]:
+        """
+        HTTP Content-Encoding ('zstd' or 'gzip') under which the stored bytes of 'path' can be sent
+        as they are, None for plain files and for zstd frames a client cannot decode (dictionary, large window).
+        """
+        path = File._to_str(path)
+        if File._is_gzip_path(path):
+            return "gzip"
+        if not File._is_zstd_path(path) or not _HAS_ZSTD:
+            return None
+        with open(path, "rb") as f:
+            params = zstd.get_frame_parameters(f.read(18))
+        if params.dict_id or params.window_size > File._HTTP_ZSTD_WINDOW:
+            return None
+        return "zstd"
+
+    @staticmethod
+    def readHead(path, size: int) -> bytes:
+        """First 'size' decompressed bytes of an existing file, without decoding the rest."""
+        path = File._to_str(path)
+        if File._is_zstd_path(path):
+            with open(path, "rb") as raw:
+                dict_id = zstd.get_frame_parameters(raw.read(18)).dict_id
+                raw.seek(0)
+                dctx = zstd.ZstdDecompressor(dict_data=File._dict_by_id(dict_id)) if dict_id else zstd.ZstdDecompressor()
+                with dctx.stream_reader(raw, closefd=False) as reader:
+                    return reader.read(size)
+        if File._is_gzip_path(path):
+            with gzip.open(path, mode="rb") as f:
+                return f.read(size)
+        with open(path, mode="rb") as f:
+            return f.read(size)
+
+    @staticmethod
+    def loads(payload: bytes) -> Any:
+        """Parse JSON bytes with the fastest available library."""
+        if _HAS_ORJSON:
+            return orjson.loads(payload)
+        if _HAS_UJSON:
+            return ujson.loads(payload)
+        return json.loads(payload)
+
     @staticmethod
     def readParamFile(path) -> Any:
         """Backward-compatible alias for readFile()."""
@@ -487,12 +780,82 @@ class File:
     # ---------------------------
     # Writers
     # ---------------------------
+    @staticmethod
+    def dumps(data) -> bytes:
+        """Compact UTF-8 JSON bytes with the fastest available library."""
+        if _HAS_ORJSON:
+            try:
+                # int keys and numpy scalars are accepted by json.dumps too
+                return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+            except TypeError:
+                pass
+        elif _HAS_UJSON:
+            return ujson.dumps(data, ensure_ascii=False).encode("utf-8")
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=False).encode("utf-8")
+
+    @staticmethod
+    def _base_json_path(path: str) -> str:
+        for ext in (".zst", ".gz"):
+            if path.endswith(ext):
+                return path[:-len(ext)]
+        return path
+
+    @staticmethod
+    def _policy_write_path(path: str, size: int):
+        """
+        Effective path and zstd dictionary for a payload of 'size' bytes.
+        Explicit .zst/.gz paths are honored, small payloads stay plain JSON.
+        """
+        if File._is_zstd_path(path) or File._is_gzip_path(path):
+            return path, File._group_dict(path) if File._is_zstd_path(path) else None
+        if size < File._PLAIN_BELOW.get(File._path_class(path), 0):
+            return path, None
+        effective_path = File._effective_write_path(path)
+        zdict = File._group_dict(effective_path) if File._is_zstd_path(effective_path) else None
+        return effective_path, zdict
+
+    @staticmethod
+    def _remove_stale_variants(effective_path: str, keep: Optional[str] = None) -> None:
+        """Remove other representations of the same JSON so readers do not pick up old data."""
+        base = File._base_json_path(effective_path)
+        for candidate in (base, base + ".zst", base + ".gz"):
+            if candidate in (effective_path, keep):
+                continue
+            try:
+                os.remove(candidate)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def writeBytes(payload: bytes, path: str, compress: bool = True) -> str:
+        """Write serialized JSON, compress=False keeps the given path (plain JSON for '.json')."""
+        effective_path, zdict = File._policy_write_path(path, len(payload)) if compress else (path, None)
+
+        def _write_bytes(fbin):
+            fbin.write(payload)
+
+        if File._is_zstd_path(effective_path):
+            File._atomic_write_zstd_bytes(effective_path, _write_bytes, level=File._ZSTD_LEVEL, zdict=zdict)
+        elif File._is_gzip_path(effective_path):
+            File._atomic_write_gzip_bytes(effective_path, _write_bytes)
+        else:
+            File._atomic_write_bytes(effective_path, _write_bytes)
+
+        # Optional legacy mirror (.json) if we wrote compressed
+        legacy_json_path = File._legacy_json_path_for(effective_path)
+        if legacy_json_path:
+            File._atomic_write_bytes(legacy_json_path, _write_bytes)
+
+        File._remove_stale_variants(effective_path, keep=legacy_json_path)
+        return effective_path
+
     @staticmethod
     def writeFile(data, path) -> None:
         """
         Default JSON writer: compact, UTF-8, atomic.
-        Uses orjson (bytes) if available; else text with ujson/json.
-        Supports .json, .json.gz, .json.zst (zstandard required for .zst).
+        Serializes with orjson if available; else ujson/json. The codec is chosen by the policy
+        (see class docstring): plain JSON for small payloads, zstd (with the group dictionary for
+        model group files) or gzip otherwise. Supports .json, .json.gz, .json.zst.
 
         Backward-compat convenience:
           - If File._DEFAULT_COMPRESSION is set (e.g., 'zst') and the provided 'path'
@@ -501,62 +864,8 @@ class File:
             we also write an uncompressed .json next to it.
         """
         path = File._to_str(path)
-
-        # Decide effective destination path based on config
-        effective_path = File._effective_write_path(path)
-
-        def _write_orjson_bytes(fbin):
-            fbin.write(orjson.dumps(data))
-
-        def _write_ujson_text(ftxt):
-            # UTF-8 output (no ASCII escaping)
-            ujson.dump(data, ftxt, ensure_ascii=False)
-
-        def _write_std_text(ftxt):
-            json.dump(
-                data,
-                ftxt,
-                ensure_ascii=False,          # keep real UTF-8 (Cyrillic etc.)
-                separators=(",", ":"),       # compact form
-                sort_keys=False,
-            )
-
         try:
-            # Primary write (effective path)
-            if _HAS_ORJSON:
-                if File._is_zstd_path(effective_path):
-                    File._atomic_write_zstd_bytes(effective_path, _write_orjson_bytes, level=File._ZSTD_LEVEL)
-                elif File._is_gzip_path(effective_path):
-                    File._atomic_write_gzip_bytes(effective_path, _write_orjson_bytes)
-                else:
-                    File._atomic_write_bytes(effective_path, _write_orjson_bytes)
-
-            elif _HAS_UJSON:
-                if File._is_zstd_path(effective_path):
-                    File._atomic_write_zstd_text(effective_path, _write_ujson_text, level=File._ZSTD_LEVEL)
-                elif File._is_gzip_path(effective_path):
-                    File._atomic_write_gzip_text(effective_path, _write_ujson_text)
-                else:
-                    File._atomic_write_text(effective_path, _write_ujson_text)
-
-            else:
-                if File._is_zstd_path(effective_path):
-                    File._atomic_write_zstd_text(effective_path, _write_std_text, level=File._ZSTD_LEVEL)
-                elif File._is_gzip_path(effective_path):
-                    File._atomic_write_gzip_text(effective_path, _write_std_text)
-                else:
-                    File._atomic_write_text(effective_path, _write_std_text)
-
-            # Optional legacy mirror (.json) if we wrote compressed
-            legacy_json_path = File._legacy_json_path_for(effective_path)
-            if legacy_json_path:
-                if _HAS_ORJSON:
-                    File._atomic_write_bytes(legacy_json_path, _write_orjson_bytes)
-                elif _HAS_UJSON:
-                    File._atomic_write_text(legacy_json_path, _write_ujson_text)
-                else:
-                    File._atomic_write_text(legacy_json_path, _write_std_text)
-
+            File.writeBytes(File.dumps(data), path)
         except (IOError, IndexError):
             # Preserve your previous exception contract if needed
             raise IndexError
@@ -567,34 +876,21 @@ class File:
     def writeFileUJson(data, path) -> None:
         """
         Prefer ujson if present; otherwise delegate to writeFile.
-        Also atomic + gzip/zstd-aware and honors default compression/mirroring config.
+        Also atomic + gzip/zstd-aware and honors the codec policy and default compression/mirroring config.
         """
         path = File._to_str(path)
 
         if _HAS_UJSON:
-            # Respect default compression config
-            effective_path = File._effective_write_path(path)
-
-            def _write_ujson_text(ftxt):
-                ujson.dump(data, ftxt, ensure_ascii=False)
-
             try:
-                if File._is_zstd_path(effective_path):
-                    File._atomic_write_zstd_text(effective_path, _write_ujson_text, level=File._ZSTD_LEVEL)
-                elif File._is_gzip_path(effective_path):
-                    File._atomic_write_gzip_text(effective_path, _write_ujson_text)
-                else:
-                    File._atomic_write_text(effective_path, _write_ujson_text)
-
-                # Optional legacy mirror
-                legacy_json_path = File._legacy_json_path_for(effective_path)
-                if legacy_json_path:
-                    File._atomic_write_text(legacy_json_path, _write_ujson_text)
-
+                File.writeBytes(ujson.dumps(data, ensure_ascii=False).encode("utf-8"), path)
             except (IOError, IndexError):
                 raise IndexError
             except OSError:
                 raise OSError
         else:
             # Fall back to writeFile (will use orjson or stdlib)
-            File.writeFile(data, path)
\ No newline at end of file
+            File.writeFile(data, path)
+
+
+# Batched fsyncs still pending at interpreter exit are flushed
+atexit.register(File.sync)
@@ -0,0 +1,190 @@
+import sys, hashlib, logging
+from collections import OrderedDict
+from threading import Lock
+from flask import Response, request, send_file
+
+from Classes.Base import Config
+from Classes.Base.StorageClass import Storage
+from Classes.Base.MetricsClass import Metrics
+from Classes.Base.CompressionClass import Compression
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache():
+    """
+    Bounded LRU of response bytes, keyed by the stored file and its version (mtime, size, inode).
+
+    A write replaces the file, so the version changes and the old entry is dropped on the next lookup,
+    no explicit invalidation is needed. The total size is limited by Config.HTTP_CACHE_BYTES, documents
+    larger than Config.HTTP_CACHE_MAX_ENTRY are not held (only their ETag).
+    """
+    _entries = OrderedDict()
+    _bytes = 0
+    _lock = Lock()
+
+    @staticmethod
+    def version(stat):
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    @staticmethod
+    def get(source, version):
+        with ResponseCache._lock:
+            entry = ResponseCache._entries.get(source)
+            if entry is not None and entry[0] != version:
+                ResponseCache._drop(source)
+                entry = None
+            if entry is not None:
+                ResponseCache._entries.move_to_end(source)
+        Metrics.cacheLookup('http', entry is not None)
+        return entry
+
+    @staticmethod
+    def put(source, version, etag, payload):
+        #payload None pamti samo ETag (digest velikog fajla koji ide preko send_file)
+        size = len(payload) if payload is not None else 0
+        if not Config.HTTP_CACHE_BYTES or size > Config.HTTP_CACHE_MAX_ENTRY:
+            return
+        with ResponseCache._lock:
+            ResponseCache._drop(source)
+            ResponseCache._entries[source] = (version, etag, payload)
+            ResponseCache._bytes += size
+            while ResponseCache._bytes > Config.HTTP_CACHE_BYTES and ResponseCache._entries:
+                ResponseCache._drop(next(iter(ResponseCache._entries)))
+
+    @staticmethod
+    def _drop(source):
+        entry = ResponseCache._entries.pop(source, None)
+        if entry is not None and entry[2] is not None:
+            ResponseCache._bytes -= len(entry[2])
+
+    @staticmethod
+    def clear():
+        with ResponseCache._lock:
+            ResponseCache._entries.clear()
+            ResponseCache._bytes = 0
+
+    @staticmethod
+    def stats():
+        with ResponseCache._lock:
+            return {"entries": len(ResponseCache._entries), "bytes": ResponseCache._bytes}
+
+class JsonResponse():
+    """
+    Stored JSON documents returned as they are on disk, without parsing and jsonify.
+
+    Documents are served from ResponseCache or read as bytes (compressed and columnar files decoded),
+    plain files too large for the cache are sent with send_file. Every response carries a strong ETag
+    and Last-Modified, If-None-Match and If-Modified-Since are answered with 304 and no body. Files
+    outside case folders (Parameters.json, Variables.json...) only change with the application and may
+    be cached by the browser for Config.HTTP_CACHE_CONFIG_MAX_AGE seconds, case files are revalidated
+    on every request. With a negotiated Content-Encoding the compressed body is cached as well, files
+    stored as .zst/.gz are sent without recompressing when the client accepts that encoding.
+    """
+    MIMETYPE = 'application/json'
+    CHUNK = 1024 * 1024
+
+    @staticmethod
+    def etag(stat):
+        return '{:x}-{:x}'.format(stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def digest(payload=None, source=None):
+        h = hashlib.blake2b(digest_size=16)
+        if payload is not None:
+            h.update(payload)
+        else:
+            with open(source, 'rb') as f:
+                for chunk in iter(lambda: f.read(JsonResponse.CHUNK), b''):
+                    h.update(chunk)
+        return h.hexdigest()
+
+    @staticmethod
+    def notModified(etag, stat):
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+        since = request.if_modified_since
+        #Last-Modified ima rezoluciju od jedne sekunde
+        return since is not None and int(stat.st_mtime) <= since.timestamp()
+
+    @staticmethod
+    def headers(response, path, etag, stat):
+        response.set_etag(etag)
+        response.last_modified = int(stat.st_mtime)
+        if Storage.caseOf(path) is None and Config.HTTP_CACHE_CONFIG_MAX_AGE:
+            response.cache_control.public = True
+            response.cache_control.max_age = Config.HTTP_CACHE_CONFIG_MAX_AGE
+        else:
+            response.cache_control.no_cache = True
+            response.cache_control.max_age = 0
+        return response
+
+    @staticmethod
+    def read(path, source, stat):
+        """Document bytes, None for a plain file above Config.HTTP_CACHE_MAX_ENTRY (sent with send_file)."""
+        plain = Storage.baseName(source) == source and not Storage.columnarFile(source)
+        if plain and stat.st_size > Config.HTTP_CACHE_MAX_ENTRY:
+            return None
+        if plain:
+            with open(source, 'rb') as f:
+                payload = f.read()
+            Metrics.fileBytes('read', len(payload))
+            return payload
+        return Storage.rawJson(path)
+
+    @staticmethod
+    def encoded(path, source, stat, version, etag, payload, encoding):
+        """Body in 'encoding', a file stored with the same compression is sent as it is on disk."""
+        key = '{}#{}'.format(source, encoding)
+        entry = ResponseCache.get(key, version)
+        if entry is not None:
+            return entry[2]
+        if Storage.contentEncoding(source) == encoding:
+            with open(source, 'rb') as f:
+                body = f.read()
+            Metrics.fileBytes('read', len(body))
+        else:
+            if payload is None:
+                payload = JsonResponse.read(path, source, stat)
+            if payload is None:
+                with open(source, 'rb') as f:
+                    payload = f.read()
+            body = Compression.compress(payload, encoding)
+            Metrics.compressed(encoding, len(payload), len(body))
+        ResponseCache.put(key, version, etag, body)
+        return body
+
+    @staticmethod
+    def file(path):
+        source, stat = Storage.source(path)
+        version = ResponseCache.version(stat)
+        entry = ResponseCache.get(source, version)
+        if entry is not None:
+            _, etag, payload = entry
+        elif Config.HTTP_CACHE_VALIDATOR == 'digest':
+            #digest je isti i kad se fajl prepise istim sadrzajem, npr. save bez izmjena
+            payload = JsonResponse.read(path, source, stat)
+            etag = JsonResponse.digest(payload, source)
+            ResponseCache.put(source, version, etag, payload)
+        else:
+            payload = None
+            etag = JsonResponse.etag(stat)
+
+        #kompresovan fajl je na disku manji od dokumenta, uvijek je iznad praga
+        compressed = Storage.baseName(source) != source
+        encoding = Compression.negotiate(sys.maxsize if compressed else stat.st_size)
+        if JsonResponse.notModified(Compression.etag(etag, encoding), stat):
+            response = Response(status=304)
+        elif encoding is not None:
+            response = Response(JsonResponse.encoded(path, source, stat, version, etag, payload, encoding), mimetype=JsonResponse.MIMETYPE)
+            response.headers['Content-Encoding'] = encoding
+        else:
+            if payload is None and entry is None and Config.HTTP_CACHE_VALIDATOR != 'digest':
+                payload = JsonResponse.read(path, source, stat)
+                if payload is not None:
+                    ResponseCache.put(source, version, etag, payload)
+            if payload is None:
+                response = send_file(source, mimetype=JsonResponse.MIMETYPE, conditional=False, etag=False)
+            else:
+                response = Response(payload, mimetype=JsonResponse.MIMETYPE)
+        response.vary.add('Accept-Encoding')
+        return JsonResponse.headers(response, path, Compression.etag(etag, encoding), stat)
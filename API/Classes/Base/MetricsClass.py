@@ -0,0 +1,153 @@
+from bisect import bisect_left
+from threading import Lock
+
+from Classes.Base import Config
+
+class Counter():
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+        self.lock = Lock()
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+        for labels, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labels, labels)), value
+
+    type = 'counter'
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value=0):
+        with self.lock:
+            self.values[labels] = value
+
+class Histogram():
+    type = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=Config.METRICS_LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = Lock()
+
+    def observe(self, value, *labels):
+        #po bucketu se broji samo jednom, kumulativni zbir se racuna tek u render
+        i = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self.lock:
+            values = {k: ([*v[0]], v[1], v[2]) for k, v in self.values.items()}
+        for labels, (counts, total, count) in sorted(values.items()):
+            base = dict(zip(self.labels, labels))
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                yield self.name + '_bucket', {**base, "le": _formatValue(bound)}, cumulative
+            yield self.name + '_sum', base, total
+            yield self.name + '_count', base, count
+
+def _formatValue(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return str(value)
+
+def _formatLabels(labels):
+    if not labels:
+        return ''
+    pairs = ('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in labels.items())
+    return '{' + ','.join(pairs) + '}'
+
+class Metrics():
+    """
+    In-process metrics registry rendered in the Prometheus text exposition format on /metrics.
+
+    Updates are a dict lookup and an add under a per-metric lock, label values are kept low
+    cardinality (route templates, not URLs). Values are per process and reset on restart.
+    """
+    REQUESTS = Counter('osy_http_requests_total', 'HTTP requests by route, method and status.', ('route', 'method', 'status'))
+    LATENCY = Histogram('osy_http_request_duration_seconds', 'HTTP request latency by route and method.', ('route', 'method'))
+    FILE_BYTES = Counter('osy_file_bytes_total', 'JSON bytes read and written through File.', ('op',))
+    CACHE = Counter('osy_cache_requests_total', 'Cache lookups by cache and result (hit or miss).', ('cache', 'result'))
+    SOLVERS = Gauge('osy_solver_processes_active', 'Solver processes currently running.', ('solver',))
+    SOLVER_EXIT = Counter('osy_solver_exit_total', 'Finished solver processes by exit code.', ('solver', 'code'))
+    RUN_QUEUE = Gauge('osy_run_queue_depth', 'Model runs accepted and not finished yet.')
+    RUN_WAITING = Gauge('osy_run_admission_waiting', 'Model runs waiting in the run scheduler queue.')
+    COMPRESSED = Counter('osy_http_compressed_bytes_total', 'Response bytes before (in) and after (out) compression by encoding.', ('encoding', 'stage'))
+
+    registry = [REQUESTS, LATENCY, FILE_BYTES, CACHE, SOLVERS, SOLVER_EXIT, RUN_QUEUE, RUN_WAITING, COMPRESSED]
+
+    @staticmethod
+    def observeRequest(route, method, status, seconds):
+        if not Config.METRICS_ENABLED:
+            return
+        Metrics.REQUESTS.inc(route, method, str(status))
+        Metrics.LATENCY.observe(seconds, route, method)
+
+    @staticmethod
+    def fileBytes(op, size):
+        if Config.METRICS_ENABLED:
+            Metrics.FILE_BYTES.inc(op, amount=size)
+
+    @staticmethod
+    def cacheLookup(cache, hit):
+        if Config.METRICS_ENABLED:
+            Metrics.CACHE.inc(cache, 'hit' if hit else 'miss')
+
+    @staticmethod
+    def compressed(encoding, size, compressedSize):
+        if Config.METRICS_ENABLED:
+            Metrics.COMPRESSED.inc(encoding, 'in', amount=size)
+            Metrics.COMPRESSED.inc(encoding, 'out', amount=compressedSize)
+
+    @staticmethod
+    def runSolver(solver, run, *args, **kwargs):
+        #subprocess.run (ili drugi poziv) uz brojanje aktivnih procesa i exit koda
+        Metrics.SOLVERS.inc(solver)
+        try:
+            out = run(*args, **kwargs)
+        finally:
+            Metrics.SOLVERS.dec(solver)
+        Metrics.SOLVER_EXIT.inc(solver, str(getattr(out, 'returncode', '')))
+        return out
+
+    @staticmethod
+    def render():
+        lines = []
+        for metric in Metrics.registry:
+            lines.append('# HELP {} {}'.format(metric.name, metric.help))
+            lines.append('# TYPE {} {}'.format(metric.name, metric.type))
+            for name, labels, value in metric.samples():
+                lines.append('{}{} {}'.format(name, _formatLabels(labels), _formatValue(value)))
+        #hit ratio po cache-u, da se ne mora racunati na klijentu
+        lookups = {}
+        for _, labels, value in Metrics.CACHE.samples():
+            hits, total = lookups.get(labels['cache'], (0, 0))
+            lookups[labels['cache']] = (hits + (value if labels['result'] == 'hit' else 0), total + value)
+        lines.append('# HELP osy_cache_hit_ratio Share of cache lookups that were hits.')
+        lines.append('# TYPE osy_cache_hit_ratio gauge')
+        for cache, (hits, total) in sorted(lookups.items()):
+            lines.append('osy_cache_hit_ratio{} {}'.format(_formatLabels({"cache": cache}), _formatValue(round(hits / total, 6) if total else 0)))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,152 @@
+import os, re, sys, json, time, uuid, logging
+from pathlib import Path
+from threading import Thread, Event, get_ident
+from collections import Counter
+
+from Classes.Base import Config
+
+logger = logging.getLogger(__name__)
+
+class Sampler(Thread):
+    """
+    Stack sampler for one request thread.
+
+    Every interval the stack of the target thread is read with sys._current_frames and counted
+    as one collapsed stack (outermost frame first, frames separated by ';'), the format
+    consumed by flamegraph.pl, speedscope and similar tools. Only profiled requests pay for it.
+    """
+    def __init__(self, threadId=None, interval=None):
+        Thread.__init__(self, daemon=True)
+        self.threadId = threadId or get_ident()
+        self.interval = interval or Config.PROFILE_INTERVAL
+        self.stacks = Counter()
+        self.samples = 0
+        self.halt = Event()
+        self.start_time = None
+        self.wall = None
+
+    @staticmethod
+    def frameName(frame):
+        code = frame.f_code
+        filename = code.co_filename
+        #kratke putanje: API/... za nas kod, paket/... za site-packages, inace samo ime filea
+        root = str(Config.ROOT_DIR) + os.sep
+        if filename.startswith(root):
+            filename = filename[len(root):]
+        elif 'site-packages' in filename:
+            filename = filename.split('site-packages', 1)[1].lstrip('/\\')
+        else:
+            filename = os.path.basename(filename)
+        return '{} ({}:{})'.format(code.co_name, filename.replace(';', '_'), code.co_firstlineno)
+
+    def sample(self):
+        frame = sys._current_frames().get(self.threadId)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            stack.append(self.frameName(frame))
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def run(self):
+        while not self.halt.wait(self.interval):
+            self.sample()
+
+    def begin(self):
+        self.start_time = time.perf_counter()
+        self.start()
+        return self
+
+    def stop(self):
+        self.halt.set()
+        self.join()
+        self.wall = time.perf_counter() - self.start_time
+        return self
+
+    def collapsed(self):
+        return ''.join('{} {}\n'.format(stack, count) for stack, count in self.stacks.most_common())
+
+class Profiler():
+    """
+    Opt-in per request profiling.
+
+    A request is profiled when Config.PROFILE_ALL is set, or, with Config.PROFILE_ENABLED,
+    when it carries the X-Osy-Profile header or the osyProfile query flag. Each profile is
+    stored under Config.PROFILE_FOLDER as <id>.folded (collapsed stacks) and <id>.json (metadata),
+    only the newest Config.PROFILE_KEEP profiles are kept.
+    """
+    HEADER = 'X-Osy-Profile'
+    QUERY = 'osyProfile'
+
+    @staticmethod
+    def requested(request):
+        if Config.PROFILE_ALL:
+            return True
+        if not Config.PROFILE_ENABLED:
+            return False
+        flag = request.headers.get(Profiler.HEADER) or request.args.get(Profiler.QUERY)
+        return flag is not None and flag.lower() not in ('0', 'false', 'no', '')
+
+    @staticmethod
+    def start():
+        return Sampler().begin()
+
+    @staticmethod
+    def save(sampler, route, method, path, status):
+        folder = Path(Config.PROFILE_FOLDER)
+        os.makedirs(folder, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+        profileId = '{}_{}_{}'.format(time.strftime('%Y%m%d%H%M%S'), slug[:40], uuid.uuid4().hex[:8])
+        with open(Path(folder, profileId + '.folded'), 'w') as f:
+            f.write(sampler.collapsed())
+        meta = {
+            "id": profileId,
+            "route": route,
+            "method": method,
+            "path": path,
+            "status": status,
+            "wall": round(sampler.wall, 4),
+            "samples": sampler.samples,
+            "interval": sampler.interval,
+            "created": time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        with open(Path(folder, profileId + '.json'), 'w') as f:
+            json.dump(meta, f, indent=4)
+        Profiler.prune()
+        logger.info("Profile %s saved, %s samples in %.3fs", profileId, sampler.samples, sampler.wall)
+        return profileId
+
+    @staticmethod
+    def prune():
+        metas = sorted(Path(Config.PROFILE_FOLDER).glob('*.json'), key=os.path.getmtime, reverse=True)
+        for meta in metas[Config.PROFILE_KEEP:]:
+            for path in (meta, meta.with_suffix('.folded')):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def list(limit=50):
+        folder = Path(Config.PROFILE_FOLDER)
+        if not folder.is_dir():
+            return []
+        metas = sorted(folder.glob('*.json'), key=os.path.getmtime, reverse=True)[:limit]
+        profiles = []
+        for path in metas:
+            try:
+                with open(path) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    @staticmethod
+    def path(profileId):
+        #id dolazi iz URL-a, dozvoljen samo format koji save generise
+        if not re.fullmatch(r'[A-Za-z0-9_]+', profileId or ''):
+            return None
+        path = Path(Config.PROFILE_FOLDER, profileId + '.folded')
+        return path if path.is_file() else None
@@ -0,0 +1,161 @@
+import re, time, logging
+from collections import deque
+from threading import Condition, Lock
+
+from Classes.Base import Config
+
+logger = logging.getLogger(__name__)
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+#solver linija -> polja progresa, prvi pattern koji odgovara
+PATTERNS = (
+    #Clp simplex: "764  Obj 1.4977308 Primal inf 2505329 (4871) Dual inf ..."
+    (re.compile(r'^\s*(\d+)\s+Obj\s+(\S+)(?:\s+Primal inf\s+(\S+))?'),
+        lambda m: {"iterations": int(m.group(1)), "objective": _number(m.group(2)), "primalInf": _number(m.group(3))}),
+    #Clp barrier: "3 Primal 5.0937906 Dual 3.8536713 Complementarity 1.2401193 - 0 fixed, rank 2"
+    (re.compile(r'^\s*(\d+)\s+Primal\s+(\S+)\s+Dual\s+(\S+)\s+Complementarity\s+(\S+)'),
+        lambda m: {"iterations": int(m.group(1)), "objective": _number(m.group(2)), "dual": _number(m.group(3))}),
+    #"Optimal objective 4 - 2 iterations time 0.002"
+    (re.compile(r'^Optimal objective\s+(\S+)\s+-\s+(\d+) iterations'),
+        lambda m: {"objective": _number(m.group(1)), "iterations": int(m.group(2))}),
+    #Cbc0010I After 100 nodes, 5 on tree, 1234.5 best solution, best possible 1200 (3.21 seconds)
+    (re.compile(r'After (\d+) nodes, (\d+) on tree, (\S+) best solution, best possible (\S+)'),
+        lambda m: {"nodes": int(m.group(1)), "objective": _number(m.group(3)) if _number(m.group(3)) != 1e50 else None,
+                   "bound": _number(m.group(4))}),
+    #Cbc0012I Integer solution of 1234.5 found by heuristic after 120 iterations and 3 nodes (1.20 seconds)
+    (re.compile(r'solution of (\S+) found .*?after (\d+) iterations and (\d+) nodes'),
+        lambda m: {"objective": _number(m.group(1)), "iterations": int(m.group(2)), "nodes": int(m.group(3))}),
+    #glpsol simplex: "*   123: obj =   1.234e+03 inf =   0.000e+00 (0)"
+    (re.compile(r'^[* ]\s*(\d+): obj =\s+(\S+)\s+inf =\s+(\S+)'),
+        lambda m: {"iterations": int(m.group(1)), "objective": _number(m.group(2)), "primalInf": _number(m.group(3))}),
+    #glpsol MIP: "+   456: mip =   1.234e+03 >=   1.200e+03   2.8% (12; 0)"
+    (re.compile(r'^\+\s*(\d+): mip =\s+(\S+)\s+[<>]=\s+(\S+)'),
+        lambda m: {"iterations": int(m.group(1)), "objective": _number(m.group(2)), "bound": _number(m.group(3))}),
+    #HiGHS simplex: "      1234     1.2345678900e+03 Pr: 12(3.4); Du: 0(1e-10) 2s"
+    (re.compile(r'^\s*(\d+)\s+(\S+)\s+(?:Pr|Ph[12]):'),
+        lambda m: {"iterations": int(m.group(1)), "objective": _number(m.group(2))}),
+    (re.compile(r'^Model status\s+:\s+(.+?)\s*$'),
+        lambda m: {"result": m.group(1).lower()}),
+    #glpsol generisanje modela: "Generating EBa11_EnergyBalanceEachTS5..."
+    (re.compile(r'^Generating (\S+)\.\.\.'),
+        lambda m: {"generating": m.group(1)}),
+    (re.compile(r'^Optimal - objective value (\S+)'),
+        lambda m: {"objective": _number(m.group(1)), "result": "optimal"}),
+    (re.compile(r'^(?:Problem is|Stopped on) (\w+)'),
+        lambda m: {"result": m.group(1).lower()}),
+)
+
+class RunProgress():
+    """
+    Progress of a running caserun, published to /runProgress subscribers (Server-Sent Events).
+
+    A run opens the channel of its case/caserun, stages and solver output lines are appended as
+    events with an increasing id (queue, stage, log, progress, done). Solver lines are parsed into progress
+    fields (iterations, objective, nodes, bound...) with the elapsed time of the stage. The last
+    Config.RUN_PROGRESS_EVENTS events are kept, so a client that reconnects with Last-Event-ID gets
+    what it missed. Finished channels are dropped after Config.RUN_PROGRESS_KEEP seconds.
+    """
+    _channels = {}
+    _lock = Lock()
+
+    def __init__(self, job):
+        self.job = job
+        self.seq = 0
+        self.events = deque(maxlen=Config.RUN_PROGRESS_EVENTS)
+        self.cond = Condition()
+        self.started = time.time()
+        self.stageStarted = self.started
+        self.finishedAt = None
+        self.state = {"job": job, "status": "running", "stage": None, "solver": None, "queue": None, "progress": {}}
+
+    @staticmethod
+    def jobId(case, caserun):
+        return '{}/{}'.format(case, caserun)
+
+    @staticmethod
+    def open(case, caserun):
+        job = RunProgress.jobId(case, caserun)
+        channel = RunProgress(job)
+        with RunProgress._lock:
+            RunProgress._purge()
+            previous = RunProgress._channels.get(job)
+            RunProgress._channels[job] = channel
+        if previous is not None:
+            #pretplatnici starog runa dobiju done i prelaze na novi kanal
+            previous.finish('replaced')
+        return channel
+
+    @staticmethod
+    def get(case, caserun):
+        with RunProgress._lock:
+            return RunProgress._channels.get(RunProgress.jobId(case, caserun))
+
+    @staticmethod
+    def _purge():
+        oldest = time.time() - Config.RUN_PROGRESS_KEEP
+        for job in [j for j, c in RunProgress._channels.items() if c.finishedAt and c.finishedAt < oldest]:
+            del RunProgress._channels[job]
+
+    @staticmethod
+    def parse(line):
+        for pattern, fields in PATTERNS:
+            m = pattern.search(line)
+            if m:
+                return {k: v for k, v in fields(m).items() if v is not None}
+        return None
+
+    def publish(self, event, data):
+        with self.cond:
+            self.seq += 1
+            self.events.append((self.seq, event, data))
+            self.cond.notify_all()
+
+    def stage(self, name, span=None):
+        #StageTimer listener, span je None na pocetku faze
+        if span is None:
+            self.stageStarted = time.time()
+            self.state["stage"] = name
+            self.publish('stage', {"stage": name, "elapsed": round(self.stageStarted - self.started, 3)})
+        else:
+            self.publish('stage', {"stage": name, "done": True, "wall": span.get("wall")})
+
+    def queued(self, position):
+        #pozicija u redu RunScheduler-a, None kad je run pusten
+        self.state["queue"] = position
+        self.publish('queue', {"position": position})
+
+    def solver(self, name):
+        self.state["solver"] = name
+        self.state["progress"] = {}
+
+    def line(self, solver, stream, text):
+        self.publish('log', {"solver": solver, "stream": stream, "line": text})
+        fields = RunProgress.parse(text)
+        if fields:
+            now = time.time()
+            self.state["progress"].update(fields)
+            progress = dict(self.state["progress"], solver=solver, stage=self.state["stage"],
+                            elapsed=round(now - self.stageStarted, 3), total=round(now - self.started, 3))
+            self.publish('progress', progress)
+
+    def finish(self, status):
+        if self.finishedAt is not None:
+            return
+        self.state["status"] = status
+        self.finishedAt = time.time()
+        self.publish('done', dict(self.state, total=round(self.finishedAt - self.started, 3)))
+
+    def snapshot(self):
+        with self.cond:
+            return dict(self.state, lastEventId=self.seq)
+
+    def since(self, seq, timeout):
+        """Events after seq, waits up to timeout seconds for new ones."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq > seq or self.finishedAt is not None, timeout)
+            return [e for e in self.events if e[0] > seq]
@@ -0,0 +1,203 @@
+import os, time, logging, itertools
+from contextlib import contextmanager
+from threading import Condition
+
+from Classes.Base import Config
+from Classes.Base.MetricsClass import Metrics
+from Classes.Base.SolverProcessClass import SolverProcess, RunCancelled
+
+logger = logging.getLogger(__name__)
+
+class RunRejected(Exception):
+    """The server is busy with runs, the request is not accepted (503 with Retry-After)."""
+
+class RunScheduler():
+    """
+    Admission of model runs, in front of preprocessing, LP build and the solver.
+
+    At most Config.RUN_SLOTS runs execute at the same time, the others wait in a queue. A run is
+    admitted when a slot is free, its owner (browser session, a batch run is one owner) has less
+    than Config.RUN_SESSION_SLOTS runs and its case less than Config.RUN_CASE_SLOTS (0 = no limit),
+    and its memory estimate fits next to the admitted runs (RunScheduler.memoryBudget()). A run
+    bigger than the budget runs alone. Among waiting runs the owner with the fewest admitted runs
+    goes first, then the case with the fewest, then the oldest, so a batch of dozens of caseruns
+    does not hold back the run of another user. A run that does not fit the memory budget is not
+    passed by smaller ones behind it, it would never start otherwise.
+
+    Waiting runs get their queue position through notify(position), a cancelled run leaves the
+    queue with RunCancelled. request() limits the HTTP threads held by /run and /batchRun to
+    Config.RUN_REQUEST_THREADS and openStream() the /runProgress streams to
+    Config.RUN_PROGRESS_STREAMS, the other waitress threads stay free for interactive routes.
+    """
+    _cond = Condition()
+    _queue = []
+    _admitted = []
+    _requests = 0
+    _streams = 0
+    _ids = itertools.count(1)
+
+    ########################################################################## budget
+    @staticmethod
+    def memoryBudget():
+        """Bytes for admitted runs, 0 for no limit (Config.RUN_MEMORY None = half of physical memory)."""
+        if Config.RUN_MEMORY is not None:
+            return Config.RUN_MEMORY
+        try:
+            return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // 2
+        except (AttributeError, ValueError, OSError):
+            #windows nema sysconf, memorija se ne ogranicava
+            return 0
+
+    @staticmethod
+    def memoryEstimate(lpBytes):
+        """Memory of a run (LP build and solver) for an LP file of lpBytes."""
+        return max(Config.RUN_MEMORY_MIN, int(lpBytes * Config.RUN_MEMORY_PER_LP_BYTE))
+
+    ########################################################################## queue
+    @staticmethod
+    def _count(key, value):
+        return sum(1 for t in RunScheduler._admitted if t[key] == value)
+
+    @staticmethod
+    def _allowed(ticket):
+        if Config.RUN_SESSION_SLOTS and RunScheduler._count('owner', ticket['owner']) >= Config.RUN_SESSION_SLOTS:
+            return False
+        if Config.RUN_CASE_SLOTS and RunScheduler._count('case', ticket['case']) >= Config.RUN_CASE_SLOTS:
+            return False
+        return True
+
+    @staticmethod
+    def _order():
+        #redoslijed cekanja: vlasnik sa najmanje aktivnih runova, pa case, pa najstariji
+        return sorted(RunScheduler._queue, key=lambda t: (
+            RunScheduler._count('owner', t['owner']), RunScheduler._count('case', t['case']), t['id']))
+
+    @staticmethod
+    def _next():
+        if len(RunScheduler._admitted) >= max(1, Config.RUN_SLOTS):
+            return None
+        budget = RunScheduler.memoryBudget()
+        used = sum(t['memory'] for t in RunScheduler._admitted)
+        for ticket in RunScheduler._order():
+            if not RunScheduler._allowed(ticket):
+                continue
+            if budget and RunScheduler._admitted and used + ticket['memory'] > budget:
+                return None
+            return ticket
+        return None
+
+    @staticmethod
+    def _notify():
+        #pozicije u redu nakon svake promjene, javljaju se samo promijenjene
+        for position, ticket in enumerate(RunScheduler._order(), 1):
+            if ticket['position'] != position:
+                ticket['position'] = position
+                if ticket['notify'] is not None:
+                    ticket['notify'](position)
+
+    @staticmethod
+    @contextmanager
+    def admit(job, case, owner=None, memory=0, notify=None):
+        """Waits until the run may start, yields the admitted ticket and frees its slot at the end."""
+        ticket = {
+            "id": next(RunScheduler._ids),
+            "job": job,
+            "case": case,
+            "owner": owner or case,
+            "memory": int(memory or 0),
+            "queued": time.time(),
+            "started": None,
+            "position": None,
+            "notify": notify
+        }
+        with RunScheduler._cond:
+            RunScheduler._queue.append(ticket)
+            Metrics.RUN_WAITING.inc()
+            try:
+                while RunScheduler._next() is not ticket:
+                    if SolverProcess.cancelled(job):
+                        raise RunCancelled(job)
+                    RunScheduler._notify()
+                    #cancel ne budi red, provjerava se svake sekunde
+                    RunScheduler._cond.wait(1)
+            except BaseException:
+                RunScheduler._queue.remove(ticket)
+                RunScheduler._cond.notify_all()
+                raise
+            finally:
+                Metrics.RUN_WAITING.dec()
+            RunScheduler._queue.remove(ticket)
+            ticket['started'] = time.time()
+            ticket['position'] = None
+            RunScheduler._admitted.append(ticket)
+            RunScheduler._cond.notify_all()
+        if ticket['started'] - ticket['queued'] > 1:
+            logger.info("Run %s admitted after %.1f seconds in queue", job, ticket['started'] - ticket['queued'])
+        try:
+            yield ticket
+        finally:
+            with RunScheduler._cond:
+                RunScheduler._admitted.remove(ticket)
+                RunScheduler._cond.notify_all()
+
+    @staticmethod
+    @contextmanager
+    def request():
+        """HTTP thread of /run or /batchRun, RunRejected when Config.RUN_REQUEST_THREADS are taken."""
+        with RunScheduler._cond:
+            if Config.RUN_REQUEST_THREADS and RunScheduler._requests >= Config.RUN_REQUEST_THREADS:
+                raise RunRejected('Server is busy with model runs, try again later!')
+            RunScheduler._requests += 1
+        try:
+            yield
+        finally:
+            with RunScheduler._cond:
+                RunScheduler._requests -= 1
+
+    @staticmethod
+    def openStream():
+        """HTTP thread of a /runProgress stream, RunRejected when Config.RUN_PROGRESS_STREAMS are taken.
+
+        The stream outlives the route function, the returned close() is called once the response is closed.
+        """
+        with RunScheduler._cond:
+            if Config.RUN_PROGRESS_STREAMS and RunScheduler._streams >= Config.RUN_PROGRESS_STREAMS:
+                raise RunRejected('Too many run progress streams, try again later!')
+            RunScheduler._streams += 1
+        closed = []
+
+        def close():
+            with RunScheduler._cond:
+                #waitress i werkzeug mogu zatvoriti odgovor vise puta
+                if not closed:
+                    closed.append(True)
+                    RunScheduler._streams -= 1
+        return close
+
+    @staticmethod
+    def position(job):
+        with RunScheduler._cond:
+            return next((t['position'] for t in RunScheduler._queue if t['job'] == job), None)
+
+    @staticmethod
+    def snapshot():
+        now = time.time()
+
+        def public(ticket, waiting):
+            return {
+                "job": ticket['job'],
+                "case": ticket['case'],
+                "memory": ticket['memory'],
+                "position": ticket['position'] if waiting else None,
+                "seconds": round(now - (ticket['queued'] if waiting else ticket['started']), 1)
+            }
+        with RunScheduler._cond:
+            return {
+                "slots": max(1, Config.RUN_SLOTS),
+                "memoryBudget": RunScheduler.memoryBudget(),
+                "memoryUsed": sum(t['memory'] for t in RunScheduler._admitted),
+                "requests": RunScheduler._requests,
+                "streams": RunScheduler._streams,
+                "running": [public(t, False) for t in RunScheduler._admitted],
+                "queued": [public(t, True) for t in RunScheduler._order()]
+            }
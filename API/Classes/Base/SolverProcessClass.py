@@ -0,0 +1,319 @@
+import os, sys, signal, logging, subprocess
+from contextlib import contextmanager
+from threading import Thread, Timer, Lock
+
+from Classes.Base import Config
+from Classes.Base.StorageClass import Storage
+from Classes.Base.StageTimerClass import StageTimer
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pty
+    _HAS_PTY = True
+except ImportError:
+    #windows nema pty, izlaz solvera ide kroz pipe
+    _HAS_PTY = False
+
+_WINDOWS = os.name == 'nt'
+
+class RunCancelled(Exception):
+    """The run was cancelled before the next solver was started."""
+
+class SolverProcess():
+    """
+    Solver process with stdout and stderr read line by line while it runs.
+
+    Every line is appended to the caserun log file (res/<caserun>/logfile.txt) and passed to the
+    RunProgress channel of the run. glpsol and CBC buffer stdout in blocks when it is a pipe, so on
+    POSIX stdout is a pseudo terminal (Config.SOLVER_OUTPUT_PTY) and lines arrive as they are
+    printed. Returns subprocess.CompletedProcess with the whole stdout and stderr, like
+    subprocess.run(..., capture_output=True, text=True), and 'stopped' ('timeout', 'cancelled' or None).
+
+    Running solvers are kept in a process table, in memory and in Config.SOLVER_TABLE with the pid
+    and start time of the process and of the server. A solver runs in its own process group, so
+    stopping it (timeout, cancel) also stops anything it started. A run that is cancelled between
+    solvers gets RunCancelled when the next one would start. sweep() kills solvers left running by
+    a server that is no longer alive. A solver that runs in the server process (HiGHS) is registered
+    with inProcess() and stopped through its own stop function, timeout and cancel work the same way.
+    """
+    _processes = {}
+    _inProcess = []
+    _cancelled = set()
+    _lock = Lock()
+
+    @staticmethod
+    def _pump(stream, name, lines, sink):
+        try:
+            for line in stream:
+                lines.append(line)
+                sink(name, line)
+        except OSError:
+            #pty vraca EIO kad solver zatvori terminal
+            pass
+        finally:
+            stream.close()
+
+    ########################################################################## process table
+    @staticmethod
+    def identity(pid):
+        """Name and start time of a process, None when it does not exist (guards against pid reuse)."""
+        if sys.platform.startswith('linux'):
+            try:
+                with open('/proc/{}/stat'.format(pid)) as f:
+                    stat = f.read()
+            except OSError:
+                return None
+            #polja iza imena, starttime je 22. polje u /proc/<pid>/stat
+            fields = stat[stat.rindex(')') + 2:].split()
+            return '{}:{}'.format(stat[stat.index('(') + 1:stat.rindex(')')], fields[19])
+        try:
+            if _WINDOWS:
+                out = subprocess.run(['tasklist', '/FI', 'PID eq {}'.format(pid), '/FO', 'CSV', '/NH'],
+                                     capture_output=True, text=True).stdout.strip()
+                return out.split(',')[0].strip('"') if out.startswith('"') else None
+            out = subprocess.run(['ps', '-o', 'lstart=,comm=', '-p', str(pid)], capture_output=True, text=True).stdout.strip()
+            return out or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _persist():
+        #tabela u fajlu sadrzi i procese drugih instanci servera, zamjenjuju se samo vlastiti
+        server = os.getpid()
+        try:
+            table = Storage.readFile(Config.SOLVER_TABLE) if Storage.exists(Config.SOLVER_TABLE) else []
+        except (OSError, ValueError):
+            table = []
+        table = [e for e in table if e.get('server') != server]
+        table += [{k: v for k, v in e.items() if k != 'process'} for e in SolverProcess._processes.values()]
+        try:
+            Storage.writeFile(table, Config.SOLVER_TABLE)
+        except OSError as err:
+            logger.warning("Solver process table could not be written: %s", err)
+
+    @staticmethod
+    def _register(process, name, job):
+        entry = {
+            "pid": process.pid,
+            "name": name,
+            "job": job,
+            "identity": SolverProcess.identity(process.pid),
+            "server": os.getpid(),
+            "serverIdentity": SolverProcess.identity(os.getpid()),
+            "stopped": None,
+            "process": process
+        }
+        with SolverProcess._lock:
+            SolverProcess._processes[process.pid] = entry
+            SolverProcess._persist()
+        return entry
+
+    @staticmethod
+    def _unregister(entry):
+        with SolverProcess._lock:
+            SolverProcess._processes.pop(entry["pid"], None)
+            SolverProcess._persist()
+
+    @staticmethod
+    def _kill(pid, force):
+        try:
+            if _WINDOWS:
+                args = ['taskkill', '/PID', str(pid), '/T'] + (['/F'] if force else [])
+                subprocess.run(args, capture_output=True)
+            else:
+                #solver je vodja svoje grupe procesa, pgid == pid
+                os.killpg(pid, signal.SIGKILL if force else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+
+    @staticmethod
+    def stop(entry, reason):
+        """Terminates the process group, kills it after Config.SOLVER_KILL_GRACE seconds."""
+        if entry["stopped"] is not None or entry["process"].poll() is not None:
+            return False
+        entry["stopped"] = reason
+        logger.warning("Stopping %s (pid %s) of %s: %s", entry["name"], entry["pid"], entry["job"], reason)
+        SolverProcess._kill(entry["pid"], False)
+
+        def force():
+            if entry["process"].poll() is None:
+                SolverProcess._kill(entry["pid"], True)
+        timer = Timer(Config.SOLVER_KILL_GRACE, force)
+        timer.daemon = True
+        timer.start()
+        return True
+
+    @staticmethod
+    def begin(job):
+        with SolverProcess._lock:
+            SolverProcess._cancelled.discard(job)
+
+    @staticmethod
+    def cancelled(job):
+        with SolverProcess._lock:
+            return job in SolverProcess._cancelled
+
+    @staticmethod
+    def _stopInProcess(entry, reason):
+        if entry["stopped"] is not None:
+            return False
+        entry["stopped"] = reason
+        logger.warning("Stopping %s of %s: %s", entry["name"], entry["job"], reason)
+        entry["stop"]()
+        return True
+
+    @staticmethod
+    @contextmanager
+    def inProcess(job, name, stop):
+        """Solver running in this process, cancel() and Config.SOLVER_TIMEOUT call stop()."""
+        entry = {"job": job, "name": name, "stop": stop, "stopped": None}
+        with SolverProcess._lock:
+            if job is not None and job in SolverProcess._cancelled:
+                raise RunCancelled(job)
+            SolverProcess._inProcess.append(entry)
+        timeout = None
+        if Config.SOLVER_TIMEOUT:
+            timeout = Timer(Config.SOLVER_TIMEOUT, SolverProcess._stopInProcess, args=(entry, 'timeout'))
+            timeout.daemon = True
+            timeout.start()
+        try:
+            yield entry
+        finally:
+            if timeout is not None:
+                timeout.cancel()
+            with SolverProcess._lock:
+                SolverProcess._inProcess.remove(entry)
+
+    @staticmethod
+    def cancel(job):
+        """Marks the run cancelled and stops its solvers, returns the number of stopped solvers."""
+        with SolverProcess._lock:
+            SolverProcess._cancelled.add(job)
+            entries = [e for e in SolverProcess._processes.values() if e["job"] == job]
+            inProcess = [e for e in SolverProcess._inProcess if e["job"] == job]
+        stopped = sum(1 for e in entries if SolverProcess.stop(e, 'cancelled'))
+        return stopped + sum(1 for e in inProcess if SolverProcess._stopInProcess(e, 'cancelled'))
+
+    @staticmethod
+    def running():
+        with SolverProcess._lock:
+            return [{k: v for k, v in e.items() if k != 'process'} for e in SolverProcess._processes.values()]
+
+    @staticmethod
+    def sweep():
+        """Kills solvers from the process table whose server is gone, run at startup."""
+        if not Storage.exists(Config.SOLVER_TABLE):
+            return 0
+        try:
+            table = Storage.readFile(Config.SOLVER_TABLE)
+        except (OSError, ValueError):
+            table = []
+        killed = 0
+        alive = []
+        for entry in table:
+            server = entry.get('server')
+            if server != os.getpid() and SolverProcess.identity(server) == entry.get('serverIdentity'):
+                #druga instanca servera jos radi, njeni solveri nisu siroce
+                alive.append(entry)
+                continue
+            if entry.get('identity') and SolverProcess.identity(entry['pid']) == entry['identity']:
+                logger.warning("Killing orphaned %s (pid %s) of %s", entry.get('name'), entry['pid'], entry.get('job'))
+                SolverProcess._kill(entry['pid'], True)
+                killed += 1
+        with SolverProcess._lock:
+            try:
+                Storage.writeFile(alive, Config.SOLVER_TABLE)
+            except OSError as err:
+                logger.warning("Solver process table could not be written: %s", err)
+        return killed
+
+    ########################################################################## run
+    @staticmethod
+    def _wait(process):
+        StageTimer.unwatch(process.pid)
+        #bez /proc peak RSS solvera daje wait4, windows nema ni jedno
+        if StageTimer.PROCFS or not hasattr(os, 'wait4'):
+            return process.wait()
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            #proces je vec pokupio poll() iz stop()
+            return process.wait()
+        process.returncode = os.waitstatus_to_exitcode(status)
+        StageTimer.child(usage)
+        return process.returncode
+
+    @staticmethod
+    def run(args, cwd=None, name=None, logFile=None, progress=None, job=None):
+        if job is not None and job in SolverProcess._cancelled:
+            raise RunCancelled(job)
+        usePty = _HAS_PTY and Config.SOLVER_OUTPUT_PTY
+        master = slave = None
+        if usePty:
+            master, slave = pty.openpty()
+        group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if _WINDOWS else {"start_new_session": True}
+        try:
+            process = subprocess.Popen(args, cwd=cwd, stdin=subprocess.DEVNULL,
+                stdout=slave if usePty else subprocess.PIPE, stderr=subprocess.PIPE, **group)
+        except Exception:
+            if usePty:
+                os.close(master)
+                os.close(slave)
+            raise
+        entry = SolverProcess._register(process, name, job)
+        StageTimer.watch(process.pid)
+        timeout = None
+        if Config.SOLVER_TIMEOUT:
+            timeout = Timer(Config.SOLVER_TIMEOUT, SolverProcess.stop, args=(entry, 'timeout'))
+            timeout.daemon = True
+            timeout.start()
+
+        if usePty:
+            os.close(slave)
+            stdout = open(master, 'r', encoding='utf-8', errors='replace')
+        else:
+            stdout = open(process.stdout.fileno(), 'r', encoding='utf-8', errors='replace', closefd=False)
+        stderr = open(process.stderr.fileno(), 'r', encoding='utf-8', errors='replace', closefd=False)
+
+        log = open(logFile, 'a', encoding='utf-8', buffering=1) if logFile else None
+        lock = Lock()
+
+        def sink(stream, line):
+            with lock:
+                if log:
+                    log.write(line)
+                if progress is not None:
+                    progress.line(name, stream, line.rstrip('\r\n'))
+
+        out, err = [], []
+        errThread = Thread(target=SolverProcess._pump, args=(stderr, 'stderr', err, sink), daemon=True)
+        errThread.start()
+        try:
+            SolverProcess._pump(stdout, 'stdout', out, sink)
+            errThread.join()
+            returncode = SolverProcess._wait(process)
+        finally:
+            if timeout is not None:
+                timeout.cancel()
+            if process.poll() is None:
+                #run je prekinut izuzetkom, solver ne smije ostati bez vlasnika
+                SolverProcess._kill(process.pid, True)
+                process.wait()
+            StageTimer.unwatch(process.pid)
+            if not usePty:
+                process.stdout.close()
+            process.stderr.close()
+            SolverProcess._unregister(entry)
+            if log:
+                log.close()
+
+        stopped = entry["stopped"]
+        if stopped:
+            reason = 'Solver stopped: {}{}'.format(stopped, ' after {} seconds'.format(Config.SOLVER_TIMEOUT) if stopped == 'timeout' else '')
+            err.append('\n' + reason + '\n')
+            if progress is not None:
+                progress.line(name, 'stderr', reason)
+        result = subprocess.CompletedProcess(args, returncode, ''.join(out), ''.join(err))
+        result.stopped = stopped
+        return result
@@ -0,0 +1,159 @@
+import os, sys, time, logging
+from contextlib import contextmanager
+from threading import Thread, Lock, local
+
+logger = logging.getLogger(__name__)
+
+def _cpuSeconds():
+    #vlastiti CPU + CPU zavrsenih child procesa (glpsol, cbc)
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+def _rss():
+    #trenutni RSS servera, samo linux (/proc), drugdje None
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def _hwm(pid):
+    #peak RSS solvera iz /proc, rusage djeteta na linuxu nosi i RSS servera iz trenutka fork-a
+    try:
+        with open('/proc/{}/status'.format(pid)) as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _max(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+def _ioBytes():
+    #/proc/self/io ukljucuje i child procese nakon wait()
+    try:
+        with open('/proc/self/io') as f:
+            counters = dict(line.split(': ') for line in f.read().splitlines())
+        return int(counters['rchar']), int(counters['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+class StageTimer():
+    """
+    Per-stage spans for a model run.
+
+    Each stage records wall time, CPU time (own threads plus finished child processes),
+    peak RSS of the server and of the solver processes started in the stage, and bytes read and
+    written. Peaks are sampled every StageTimer.SAMPLE seconds while the stage is open, the server
+    from /proc/self, a solver registered by SolverProcess with watch() from its own /proc/<pid>
+    high-water mark (without /proc from its os.wait4 rusage through child()). Server counters are
+    process wide, so stages of runs executing at the same time overlap. Resource fields are None
+    on platforms that do not expose them and childPeakRss is None for a stage without a solver.
+    """
+    SAMPLE = 0.1
+    PROCFS = os.path.isdir('/proc/self')
+    _open = []
+    _children = {}
+    _sampler = None
+    _lock = Lock()
+    _local = local()
+
+    def __init__(self, listener=None):
+        #listener(name, span) se poziva na pocetku (span None) i na kraju faze, npr. RunProgress.stage
+        self.start = time.perf_counter()
+        self.stages = []
+        self.listener = listener
+
+    @staticmethod
+    def _start():
+        if StageTimer.PROCFS and StageTimer._sampler is None:
+            StageTimer._sampler = Thread(target=StageTimer._sample, daemon=True)
+            StageTimer._sampler.start()
+
+    @staticmethod
+    def _sampleChild(pid, spans):
+        peak = _hwm(pid)
+        for span in spans:
+            span["childPeakRss"] = _max(span["childPeakRss"], peak)
+
+    @staticmethod
+    def _sample():
+        #jedan thread za sve otvorene faze i solvere, zavrsava kad nema nijednog
+        while True:
+            time.sleep(StageTimer.SAMPLE)
+            rss = _rss()
+            with StageTimer._lock:
+                if not StageTimer._open and not StageTimer._children:
+                    StageTimer._sampler = None
+                    return
+                for span in StageTimer._open:
+                    span["peakRss"] = _max(span["peakRss"], rss)
+                for pid, spans in StageTimer._children.items():
+                    StageTimer._sampleChild(pid, spans)
+
+    @staticmethod
+    def watch(pid):
+        """Samples the peak RSS of a solver process for the open stages of this thread."""
+        with StageTimer._lock:
+            StageTimer._children[pid] = list(getattr(StageTimer._local, 'stack', []))
+            StageTimer._start()
+
+    @staticmethod
+    def unwatch(pid):
+        """Last sample of the solver before it is reaped, its /proc entry is gone after wait()."""
+        with StageTimer._lock:
+            spans = StageTimer._children.pop(pid, None)
+            if spans:
+                StageTimer._sampleChild(pid, spans)
+
+    @staticmethod
+    def child(usage):
+        """Peak RSS of a finished solver process from its os.wait4 rusage, for systems without /proc."""
+        #macOS vraca bajte, ostali KB
+        peak = usage.ru_maxrss * 1024 if sys.platform != 'darwin' else usage.ru_maxrss
+        for span in getattr(StageTimer._local, 'stack', []):
+            span["childPeakRss"] = _max(span["childPeakRss"], peak)
+
+    @contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = _cpuSeconds()
+        read, written = _ioBytes()
+        span = {"stage": name, "peakRss": _rss(), "childPeakRss": None}
+        if not hasattr(StageTimer._local, 'stack'):
+            StageTimer._local.stack = []
+        StageTimer._local.stack.append(span)
+        with StageTimer._lock:
+            StageTimer._open.append(span)
+            StageTimer._start()
+        if self.listener:
+            self.listener(name, None)
+        try:
+            yield span
+        finally:
+            StageTimer._local.stack.remove(span)
+            with StageTimer._lock:
+                StageTimer._open.remove(span)
+            readEnd, writtenEnd = _ioBytes()
+            span.update({
+                "wall": round(time.perf_counter() - wall, 4),
+                "cpu": round(_cpuSeconds() - cpu, 4),
+                "peakRss": _max(span["peakRss"], _rss()),
+                "bytesRead": readEnd - read if read is not None else None,
+                "bytesWritten": writtenEnd - written if written is not None else None,
+            })
+            self.stages.append(span)
+            if self.listener:
+                self.listener(name, span)
+            logger.info("%s DONE! --- %s seconds", name, span["wall"])
+
+    def total(self):
+        return round(time.perf_counter() - self.start, 4)
+
+    def toDict(self):
+        return {
+            "total": self.total(),
+            "stages": self.stages
+        }
@@ -0,0 +1,253 @@
+import os, sys, json, time, logging
+from pathlib import Path
+from threading import Lock
+
+from Classes.Base import Config
+from Classes.Base.FileClassCompressed import File as Codec
+from Classes.Base.MetricsClass import Metrics
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_KEY = 'osy-columnar'
+COLS = 'osy-cols'
+VALS = 'osy-vals'
+
+def encodeColumnar(data):
+    #liste zapisa sa istim kljucevima -> kolone, ostalo ostaje kako jeste
+    if isinstance(data, dict):
+        return {k: encodeColumnar(v) for k, v in data.items()}
+    if isinstance(data, list) and data and all(isinstance(r, dict) for r in data):
+        keys = list(data[0])
+        keySet = set(keys)
+        #lista praznih zapisa bez kolona ne bi zadrzala broj redova
+        if keys and all(len(r) == len(keys) and r.keys() == keySet for r in data):
+            return {COLS: keys, VALS: [[r[k] for r in data] for k in keys]}
+    return data
+
+def decodeColumnar(data):
+    if isinstance(data, dict):
+        if COLS in data and VALS in data and len(data) == 2:
+            keys = data[COLS]
+            return [dict(zip(keys, row)) for row in zip(*data[VALS])]
+        return {k: decodeColumnar(v) for k, v in data.items()}
+    return data
+
+class LegacyBackend():
+    """Pretty printed JSON (indent=4) as before, now written atomically."""
+    name = 'legacy'
+
+    def configure(self):
+        Codec.configure(default_compression=None)
+
+    def dumps(self, data, path):
+        return json.dumps(data, ensure_ascii=True, indent=4, sort_keys=False).encode('utf-8')
+
+    def write(self, data, path):
+        payload = self.dumps(data, path)
+        Codec.writeBytes(payload, str(path), compress=False)
+        return len(payload)
+
+class CompactBackend(LegacyBackend):
+    """Compact UTF-8 JSON (orjson when installed), atomic, no compression."""
+    name = 'compact'
+
+    def dumps(self, data, path):
+        return Codec.dumps(data)
+
+class CompressedBackend(CompactBackend):
+    """Compact JSON with the FileClassCompressed codec policy (zstd above the size thresholds)."""
+    name = 'compressed'
+
+    def configure(self):
+        Codec.configure(default_compression='zst')
+        #genData.json ostaje plain JSON, po njemu se prepoznaje case u zip backupu
+        Codec.configure_policy(
+            plain_below={"case": sys.maxsize},
+            group_dict=bool(Config.STORAGE_ZSTD_DICT),
+            dict_folder=str(Config.STORAGE_DICT_FOLDER)
+        )
+
+    def write(self, data, path):
+        payload = self.dumps(data, path)
+        Codec.writeBytes(payload, str(path))
+        return len(payload)
+
+class ColumnarBackend(CompressedBackend):
+    """Lists of records are stored as column arrays (keys once per list), then compressed like 'compressed'."""
+    name = 'columnar'
+
+    def dumps(self, data, path):
+        if Codec._path_class(str(path)) == 'case' or not isinstance(data, dict):
+            return Codec.dumps(data)
+        return Codec.dumps({COLUMNAR_KEY: 1, "data": encodeColumnar(data)})
+
+BACKENDS = {b.name: b for b in (LegacyBackend, CompactBackend, CompressedBackend, ColumnarBackend)}
+
+class Storage():
+    """
+    Single entry point for JSON persistence, backend is selected with Config.STORAGE_BACKEND.
+
+    Reads understand every representation (legacy, compact, .zst/.gz, columnar), so cases
+    written by another backend always load. Files inside a case folder are written with the
+    configured backend; the first access to a case converts all its JSON files to that backend
+    (Config.STORAGE_MIGRATE) and records it in <case>/.storage. Files outside case folders
+    (Parameters.json, Variables.json...) keep the legacy format.
+    """
+    MARKER = '.storage'
+    _backend = None
+    _legacy = LegacyBackend()
+    _checked = {}
+    _locks = {}
+    _lock = Lock()
+
+    @staticmethod
+    def backend():
+        if Storage._backend is None or Storage._backend.name != Config.STORAGE_BACKEND:
+            if Config.STORAGE_BACKEND not in BACKENDS:
+                raise ValueError('Unknown storage backend {}!'.format(Config.STORAGE_BACKEND))
+            backend = BACKENDS[Config.STORAGE_BACKEND]()
+            backend.configure()
+            Storage._backend = backend
+            Storage._checked = {}
+        return Storage._backend
+
+    @staticmethod
+    def caseOf(path):
+        root = str(Config.DATA_STORAGE) + os.sep
+        path = str(path)
+        if not path.startswith(root):
+            return None
+        case, sep, _ = path[len(root):].partition(os.sep)
+        return case if sep else None
+
+    @staticmethod
+    def _caseLock(case):
+        with Storage._lock:
+            return Storage._locks.setdefault(case, Lock())
+
+    @staticmethod
+    def ensureCase(case):
+        backend = Storage.backend()
+        marker = Path(Config.DATA_STORAGE, case, Storage.MARKER)
+        if Storage._checked.get(case) == backend.name and os.path.exists(marker):
+            return
+        if Config.STORAGE_MIGRATE:
+            Storage.migrateCase(case)
+
+    @staticmethod
+    def migrateCase(case):
+        """Convert every JSON file of the case to the configured backend, returns the number of files converted."""
+        backend = Storage.backend()
+        casePath = Path(Config.DATA_STORAGE, case)
+        marker = Path(casePath, Storage.MARKER)
+        with Storage._caseLock(case):
+            try:
+                current = marker.read_text().strip()
+            except (FileNotFoundError, NotADirectoryError):
+                current = None
+            if current == backend.name or not casePath.is_dir():
+                Storage._checked[case] = backend.name
+                return 0
+            start = time.perf_counter()
+            count = 0
+            for folder, _, files in os.walk(casePath):
+                bases = {Codec._base_json_path(name) for name in files}
+                for name in sorted(b for b in bases if b.endswith('.json')):
+                    path = Path(folder, name)
+                    backend.write(Storage._read(path), path)
+                    count += 1
+            marker.write_text(backend.name)
+            Storage._checked[case] = backend.name
+            logger.info("Case %s migrated from %s to %s storage, %s files in %.2fs", case, current or 'legacy', backend.name, count, time.perf_counter() - start)
+            return count
+
+    @staticmethod
+    def _read(path):
+        payload = Codec.readBytes(path)
+        Metrics.fileBytes('read', len(payload))
+        data = Codec.loads(payload)
+        if isinstance(data, dict) and COLUMNAR_KEY in data:
+            return decodeColumnar(data["data"])
+        return data
+
+    @staticmethod
+    def readFile(path):
+        case = Storage.caseOf(path)
+        if case:
+            Storage.ensureCase(case)
+        return Storage._read(path)
+
+    @staticmethod
+    def readParamFile(path):
+        return Storage.readFile(path)
+
+    @staticmethod
+    def writeFile(data, path):
+        case = Storage.caseOf(path)
+        if case:
+            Storage.ensureCase(case)
+            size = Storage.backend().write(data, path)
+        else:
+            size = Storage._legacy.write(data, path)
+        Metrics.fileBytes('write', size)
+
+    @staticmethod
+    def writeFileUJson(data, path):
+        Storage.writeFile(data, path)
+
+    @staticmethod
+    def exists(path):
+        path = str(path)
+        return any(os.path.isfile(p) for p in (path, path + '.zst', path + '.gz'))
+
+    @staticmethod
+    def source(path):
+        """File that holds 'path' (.json, .json.zst or .json.gz) and its os.stat, the case is migrated first."""
+        case = Storage.caseOf(path)
+        if case:
+            Storage.ensureCase(case)
+        for candidate in Codec._candidate_read_paths(str(path)):
+            try:
+                return candidate, os.stat(candidate)
+            except FileNotFoundError:
+                continue
+        raise FileNotFoundError('No such file: {}'.format(path))
+
+    @staticmethod
+    def isColumnar(payload):
+        return payload.startswith(b'{"' + COLUMNAR_KEY.encode())
+
+    @staticmethod
+    def contentEncoding(source):
+        """Content-Encoding under which the stored file can be sent without decoding, None if it has to be decoded."""
+        encoding = Codec.contentEncoding(source)
+        if encoding and Storage.columnarFile(source):
+            return None
+        return encoding
+
+    @staticmethod
+    def columnarFile(source):
+        return Storage.isColumnar(Codec.readHead(source, len(COLUMNAR_KEY) + 2))
+
+    @staticmethod
+    def baseName(name):
+        #resData.json.zst -> resData.json
+        return Codec._base_json_path(str(name))
+
+    @staticmethod
+    def rawJson(path):
+        """JSON document as bytes, decompressed and converted back from columnar when needed."""
+        case = Storage.caseOf(path)
+        if case:
+            Storage.ensureCase(case)
+        payload = Codec.readBytes(path)
+        Metrics.fileBytes('read', len(payload))
+        if Storage.isColumnar(payload):
+            return Codec.dumps(decodeColumnar(Codec.loads(payload)["data"]))
+        return payload
+
+    @staticmethod
+    def replaceText(path, old, new):
+        #rename kljuceva u starim verzijama modela, radi nad JSON tekstom kao ranije
+        text = Storage.rawJson(path).decode('utf-8').replace(old, new)
+        Storage.writeFile(json.loads(text), path)
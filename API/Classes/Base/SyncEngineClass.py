@@ -0,0 +1,258 @@
+import os, shutil, hashlib, fnmatch, logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from Classes.Base import Config
+
+logger = logging.getLogger(__name__)
+
+def fileEtag(path, multipart=False, chunkSize=None):
+    """
+    S3 compatible ETag of a local file, md5 for single part uploads,
+    md5 of concatenated part digests plus '-<parts>' for multipart uploads.
+    """
+    chunkSize = chunkSize or Config.SYNC_MULTIPART_CHUNKSIZE
+    digests = []
+    with open(path, 'rb') as f:
+        if not multipart:
+            md5 = hashlib.md5()
+            for block in iter(lambda: f.read(chunkSize), b''):
+                md5.update(block)
+            return md5.hexdigest()
+        for block in iter(lambda: f.read(chunkSize), b''):
+            digests.append(hashlib.md5(block).digest())
+    return hashlib.md5(b''.join(digests)).hexdigest() + '-' + str(len(digests))
+
+class LocalBackend():
+    """
+    Directory standing in for a bucket, keys are posix paths relative to root.
+    Used for offline sync and for testing the engine without S3.
+    """
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, key):
+        return Path(self.root, *key.split('/'))
+
+    def list(self, prefix):
+        objects = {}
+        head, _, tail = prefix.rpartition('/')
+        base = self._path(head) if head else self.root
+        if not os.path.isdir(base):
+            return objects
+        for entry in os.scandir(base):
+            if not entry.name.startswith(tail):
+                continue
+            if entry.is_file():
+                paths = [entry.path]
+            else:
+                paths = [os.path.join(d, f) for d, _, files in os.walk(entry.path) for f in files]
+            for p in paths:
+                st = os.stat(p)
+                key = Path(p).relative_to(self.root).as_posix()
+                objects[key] = {"size": st.st_size, "mtime": st.st_mtime, "etag": None}
+        return objects
+
+    def listPrefixes(self):
+        if not os.path.isdir(self.root):
+            return []
+        return [f.name for f in os.scandir(self.root) if f.is_dir()]
+
+    def etag(self, key):
+        return fileEtag(self._path(key))
+
+    def upload(self, localPath, key):
+        dest = self._path(key)
+        os.makedirs(dest.parent, exist_ok=True)
+        shutil.copyfile(localPath, dest)
+
+    def download(self, key, localPath):
+        #kopija u tmp pa os.replace, kao download_file iz boto3
+        tmp = '{}.{}.tmp'.format(localPath, os.getpid())
+        try:
+            shutil.copyfile(self._path(key), tmp)
+            os.replace(tmp, localPath)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def delete(self, prefix):
+        for key in self.list(prefix):
+            path = self._path(key)
+            os.remove(path)
+            #ukloni prazne foldere do root-a, kao sto S3 nema prazne prefixe
+            parent = path.parent
+            while parent != self.root and not os.listdir(parent):
+                os.rmdir(parent)
+                parent = parent.parent
+
+class S3Backend():
+    """
+    S3 bucket, boto3 is imported only when this backend is used.
+    Transfers go through TransferConfig so large files are sent in parallel parts.
+    """
+    def __init__(self, bucket, key=None, secret=None):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            's3',
+            aws_access_key_id=key,
+            aws_secret_access_key=secret
+        )
+        self.transfer = TransferConfig(
+            multipart_threshold=Config.SYNC_MULTIPART_THRESHOLD,
+            multipart_chunksize=Config.SYNC_MULTIPART_CHUNKSIZE,
+            max_concurrency=Config.SYNC_PART_CONCURRENCY
+        )
+
+    def list(self, prefix):
+        objects = {}
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                if obj['Key'].endswith('/'):
+                    continue
+                objects[obj['Key']] = {
+                    "size": obj['Size'],
+                    "mtime": obj['LastModified'].timestamp(),
+                    "etag": obj['ETag'].strip('"')
+                }
+        return objects
+
+    def listPrefixes(self):
+        prefixes = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Delimiter='/'):
+            prefixes.extend(p['Prefix'][:-1] for p in page.get('CommonPrefixes', []))
+        return prefixes
+
+    def etag(self, key):
+        return self.client.head_object(Bucket=self.bucket, Key=key)['ETag'].strip('"')
+
+    def upload(self, localPath, key):
+        self.client.upload_file(str(localPath), self.bucket, key, Config=self.transfer)
+
+    def download(self, key, localPath):
+        self.client.download_file(self.bucket, key, str(localPath), Config=self.transfer)
+
+    def delete(self, prefix):
+        keys = [{"Key": key} for key in self.list(prefix)]
+        for i in range(0, len(keys), 1000):
+            self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": keys[i:i+1000]})
+
+class SyncEngine():
+    """
+    Diff based sync between a local directory and a backend.
+
+    A file is transferred only when it is missing on the other side, the size differs,
+    or it is newer than its counterpart and the ETags differ. Transfers run in a bounded pool.
+    """
+    def __init__(self, backend, workers=None):
+        self.backend = backend
+        self.workers = workers or Config.SYNC_MAX_WORKERS
+
+    def _sameContent(self, localPath, key, remote):
+        remoteEtag = remote.get('etag') or self.backend.etag(key)
+        return fileEtag(localPath, multipart='-' in remoteEtag) == remoteEtag
+
+    def changedForPush(self, localPath, key, remote):
+        if remote is None:
+            return True
+        st = os.stat(localPath)
+        if st.st_size != remote['size']:
+            return True
+        if st.st_mtime <= remote['mtime']:
+            return False
+        return not self._sameContent(localPath, key, remote)
+
+    def changedForPull(self, localPath, key, remote):
+        if not os.path.exists(localPath):
+            return True
+        st = os.stat(localPath)
+        if st.st_size != remote['size']:
+            return True
+        if remote['mtime'] <= st.st_mtime:
+            return False
+        return not self._sameContent(localPath, key, remote)
+
+    def _download(self, key, localPath, mtime):
+        os.makedirs(os.path.dirname(localPath), exist_ok=True)
+        self.backend.download(key, localPath)
+        #lokalni mtime = remote mtime, sljedeci push ne salje isti file nazad
+        os.utime(localPath, (mtime, mtime))
+
+    def _run(self, jobs):
+        if not jobs:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+            futures = [executor.submit(fn, *args) for fn, *args in jobs]
+            for future in futures:
+                future.result()
+        return len(jobs)
+
+    def planPush(self, localDir, keyPrefix, pattern='*'):
+        localDir = Path(localDir)
+        remotePrefix = keyPrefix + '/' if keyPrefix else ''
+        remote = self.backend.list(remotePrefix)
+        jobs = []
+        skipped = 0
+        for folder, _, files in os.walk(localDir):
+            for name in fnmatch.filter(files, pattern):
+                localPath = Path(folder, name)
+                key = remotePrefix + localPath.relative_to(localDir).as_posix()
+                if self.changedForPush(localPath, key, remote.get(key)):
+                    jobs.append((self.backend.upload, localPath, key))
+                else:
+                    skipped += 1
+        return jobs, skipped
+
+    def planPull(self, prefix, localRoot):
+        jobs = []
+        skipped = 0
+        for key, remote in self.backend.list(prefix).items():
+            localPath = os.path.join(localRoot, *key.split('/'))
+            if self.changedForPull(localPath, key, remote):
+                jobs.append((self._download, key, localPath, remote['mtime']))
+            else:
+                skipped += 1
+        return jobs, skipped
+
+    def push(self, localDir, keyPrefix, pattern='*'):
+        jobs, skipped = self.planPush(localDir, keyPrefix, pattern)
+        transferred = self._run(jobs)
+        logger.info('Sync push %s: %s transferred, %s unchanged', keyPrefix, transferred, skipped)
+        return {"transferred": transferred, "skipped": skipped}
+
+    def pull(self, prefixes, localRoot, folders=False):
+        """
+        Downloads changed objects under prefixes through one pool. With folders a prefix is a folder
+        (case name), "Demo" lists "Demo/..." and not "Demo_copy/...".
+        """
+        if isinstance(prefixes, str):
+            prefixes = [prefixes]
+        if folders:
+            prefixes = [p.rstrip('/') + '/' for p in prefixes]
+        #isti kljuc iz dva prefixa bi se skidao dvaput u isti lokalni file
+        jobs = {}
+        skipped = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for planned, count in executor.map(lambda p: self.planPull(p, localRoot), prefixes):
+                jobs.update((job[1], job) for job in planned)
+                skipped += count
+        transferred = self._run(list(jobs.values()))
+        logger.info('Sync pull %s: %s transferred, %s unchanged', ', '.join(prefixes), transferred, skipped)
+        return {"transferred": transferred, "skipped": skipped}
+
+    def pushFile(self, localPath, key):
+        remote = self.backend.list(key).get(key)
+        if self.changedForPush(localPath, key, remote):
+            self.backend.upload(localPath, key)
+            return True
+        return False
+
+def getBackend(bucket):
+    if Config.SYNC_BACKEND == 'local':
+        return LocalBackend(Path(Config.SYNC_LOCAL_ROOT, bucket) if bucket else Config.SYNC_LOCAL_ROOT)
+    return S3Backend(bucket, Config.S3_KEY, Config.S3_SECRET)
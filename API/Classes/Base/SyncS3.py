@@ -1,117 +1,59 @@
-import boto3
 import os
-import glob
 from pathlib import Path
-from collections.abc import Iterable 
 
 # from Classes.Base.S3 import S3
 from Classes.Base import Config
+from Classes.Base.SyncEngineClass import SyncEngine, getBackend
 
 class SyncS3():
     def __init__(self):
         #S3.__init__(self)
-        self.resource = boto3.resource(
-        "s3",
-        aws_access_key_id=Config.S3_KEY,
-        aws_secret_access_key=Config.S3_SECRET
-        )
+        #backend (S3 ili lokalni folder) se bira u Config.SYNC_BACKEND, boto3 se importuje tek za S3
+        self.engines = {}
 
-        self.client = boto3.client(
-            's3',
-            aws_access_key_id=Config.S3_KEY,
-            aws_secret_access_key=Config.S3_SECRET
-        )
+    def engine(self, bucket):
+        if bucket not in self.engines:
+            self.engines[bucket] = SyncEngine(getBackend(bucket))
+        return self.engines[bucket]
 
     def getCasesSyncInit(self):
         try:
-            my_bucket = self.resource.Bucket(Config.S3_BUCKET)
-            result = my_bucket.meta.client.list_objects(Bucket=my_bucket.name, Delimiter='/')
-            if isinstance(result.get('CommonPrefixes'), Iterable):
-                cases = [ f.get('Prefix')[:-1] for f in result.get('CommonPrefixes')]
-            else:
-                cases = []
-            return cases
+            return self.engine(Config.S3_BUCKET).backend.listPrefixes()
         except(IOError):
             raise IOError
 
-    def downloadSync(self, prefix, local, bucket):
+    def downloadSync(self, prefix, local, bucket, folders=False):
         """
         params:
-        - prefix: pattern to match in s3; case name
+        - prefix: pattern to match in s3; case name, or list of case names pulled through one pool
         - local: local path to folder in which to place files
         - bucket: s3 bucket with target contents
-        - client: initialized s3 client object
+        - folders: prefixes are folders (case names), only keys under "<case>/" are pulled
         """
-        client=self.client
-        keys = []
-        dirs = []
-        next_token = ''
-        base_kwargs = {
-            'Bucket':bucket,
-            'Prefix':prefix,
-        }
-        while next_token is not None:
-            kwargs = base_kwargs.copy()
-            if next_token != '':
-                kwargs.update({'ContinuationToken': next_token})
-            results = client.list_objects_v2(**kwargs)
-            contents = results.get('Contents')
-            for i in contents:
-                k = i.get('Key')
-                if k[-1] != '/':
-                    keys.append(k)
-                else:
-                    dirs.append(k)
-            next_token = results.get('NextContinuationToken')
-        for d in dirs:
-            dest_pathname = os.path.join(local, d)
-            if not os.path.exists(os.path.dirname(dest_pathname)):
-                os.makedirs(os.path.dirname(dest_pathname))
-        for k in keys:
-            dest_pathname = os.path.join(local, k)
-            if not os.path.exists(os.path.dirname(dest_pathname)):
-                os.makedirs(os.path.dirname(dest_pathname))
-            client.download_file(bucket, k, dest_pathname)
+        return self.engine(bucket).pull(prefix, local, folders)
 
     #s3.uploadSync(localDir, case, Config.S3_BUCKET, '*')
     def uploadSync(self, localDir, awsInitDir, bucketName, tag, prefix='\\'):
         """
         from current working directory, upload a 'localDir' with all its subcontents (files and subdirectories...)
-        to a aws bucket
+        to a aws bucket, only files changed since the last sync are transferred
         Parameters
         ----------
         localDir :   localDirectory to be uploaded
         awsInitDir : prefix 'directory' in aws
         bucketName : bucket in aws
         tag :        tag to select files, like *png
-                    NOTE: if you use tag it must be given like --tag '*txt', in some quotation marks... for argparse
-        prefix :     to remove initial '/' from file names
+        prefix :     kept for backward compatibility, keys are always built as posix paths
 
         Returns
         -------
-        None
+        dict with number of transferred and skipped files
         """
-        resource = self.resource
-        # mydirs daje listu svvih file i folder u localDir npr WebApp/DataStorage/Demo/genData.json
-        mydirs = list(localDir.glob('**'))
-        for mydir in mydirs:
-            dirNames = glob.glob(os.path.join(mydir, tag))
-            fileNames = [f for f in dirNames if not Path(f).is_dir()]
-            #rows = len(fileNames)
-            for i, FullfileName in enumerate(fileNames):
-                #dobijemo ime file npr, genData.json
-                fileName = str(FullfileName).replace(str(localDir), '')
-                if fileName.startswith(prefix):  # only modify the text if it starts with the prefix
-                    fileName = fileName.replace(prefix, "", 1) # remove one instance of prefix
-                    fileName = fileName.replace('\\', '/')
-
-                awsPath = str(awsInitDir) + '/' + str(fileName)
-                resource.meta.client.upload_file(FullfileName, bucketName, awsPath)
+        return self.engine(bucketName).push(Path(localDir), str(awsInitDir), tag)
 
     def deleteSync(self, case):
         try:
-            my_bucket = self.resource.Bucket(Config.S3_BUCKET)
-            my_bucket.objects.filter(Prefix=case+"/").delete()
+            self.engine(Config.S3_BUCKET).backend.delete(case+"/")
         except(IOError):
             raise IOError
 
@@ -126,13 +68,11 @@ class SyncS3():
         bucketName : bucket in aws
         Returns
         -------
-        None
+        True if the file was transferred
         """
-        resource = self.resource
-        fileName = localFile.name
-        localFile = str(localFile).replace('\\', '/')
+        fileName = Path(localFile).name
         if awsInitDir != '':
             awsPath = str(awsInitDir) + '/' + str(fileName)
         else:
             awsPath = str(fileName)
-        resource.meta.client.upload_file(localFile, bucketName, awsPath)
\ No newline at end of file
+        return self.engine(bucketName).pushFile(os.path.join(localFile), awsPath)
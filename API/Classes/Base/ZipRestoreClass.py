@@ -0,0 +1,103 @@
+import os, logging
+from pathlib import PurePosixPath
+from threading import Thread
+from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor
+
+from Classes.Base import Config
+
+logger = logging.getLogger(__name__)
+
+class ZipRestore():
+    """
+    Selective extraction of a model backup archive.
+
+    One pass over the archive index validates every member path, finds genData.json and
+    splits the members into model inputs and result artifacts (files under <case>/res/<caserun>/).
+    Inputs are extracted right away, results can be extracted synchronously, in the background
+    in parallel across files, or skipped entirely. The archive is removed once nothing reads it.
+    """
+    MODES = ('background', 'sync', 'skip')
+
+    def __init__(self, zipPath, dest=Config.EXTRACT_FOLDER):
+        self.zipPath = zipPath
+        self.dest = dest
+        self.genData = None
+        self.inputs = []
+        self.results = []
+
+    @staticmethod
+    def isSafe(name):
+        name = name.replace('\\', '/')
+        parts = PurePosixPath(name).parts
+        if name.startswith('/') or not parts or ':' in parts[0] or '..' in parts:
+            return False
+        return True
+
+    @staticmethod
+    def isResult(zi, root):
+        #<case>/res/<caserun>/<file...>, res samo direktno u folderu case-a (root je folder genData.json)
+        parts = PurePosixPath(zi.filename.replace('\\', '/')).parts
+        depth = len(root)
+        if zi.is_dir() or tuple(parts[:depth]) != root:
+            return False
+        return len(parts) > depth + 2 and parts[depth] == 'res'
+
+    def scan(self, zf):
+        members = zf.infolist()
+        for zi in members:
+            if not self.isSafe(zi.filename):
+                raise ValueError('Unsafe path {} in archive!'.format(zi.filename))
+            if self.genData is None and PurePosixPath(zi.filename).name == 'genData.json':
+                self.genData = zi
+        #folder case-a je folder genData.json, bez njega prvi folder arhive
+        first = self.genData or (members[0] if members else None)
+        root = PurePosixPath(first.filename.replace('\\', '/')).parts[:-1 if self.genData else 1] if first else ()
+        for zi in members:
+            if self.isResult(zi, root):
+                self.results.append(zi)
+            else:
+                self.inputs.append(zi)
+        return self.genData
+
+    def extractInputs(self, zf):
+        for zi in self.inputs:
+            zf.extract(zi, self.dest)
+
+    def _extractBatch(self, batch):
+        #svaki worker ima svoj handle na arhivu
+        with ZipFile(self.zipPath) as zf:
+            for zi in batch:
+                zf.extract(zi, self.dest)
+        return len(batch)
+
+    def extractResults(self):
+        workers = max(1, min(Config.RESTORE_WORKERS, len(self.results)))
+        members = sorted(self.results, key=lambda zi: zi.file_size, reverse=True)
+        batches = [members[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            count = sum(executor.map(self._extractBatch, batches))
+        return count
+
+    def _removeZip(self):
+        if os.path.exists(self.zipPath):
+            os.remove(self.zipPath)
+
+    def _background(self):
+        try:
+            count = self.extractResults()
+            logger.info('Restored %s result files from %s', count, self.zipPath)
+        except Exception:
+            logger.exception('Restore of results from %s failed', self.zipPath)
+        finally:
+            self._removeZip()
+
+    def finish(self, mode):
+        if mode == 'background' and self.results:
+            thread = Thread(target=self._background, daemon=True)
+            thread.start()
+            return thread
+        if mode == 'sync' and self.results:
+            self.extractResults()
+        self._removeZip()
+        return None
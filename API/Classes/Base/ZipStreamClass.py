@@ -0,0 +1,90 @@
+import io, os
+from pathlib import Path
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED, ZIP64_LIMIT
+
+from Classes.Base import Config
+
+class _StreamBuffer(io.RawIOBase):
+    #unseekable sink, ZipFile pise data descriptors a generator prazni buffer nakon svakog bloka
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+class ZipStream():
+    """
+    Generator based zip writer for case backups.
+
+    The archive is produced while it is being sent, nothing is written to DataStorage.
+    Entry names keep the WebAPP/DataStorage/<case>/... layout expected by handle_full_zip.
+    """
+    def __init__(self, case, level=Config.BACKUP_COMPRESSION_LEVEL, results=True, artifacts=False):
+        self.case = case
+        self.casePath = Path(Config.DATA_STORAGE, case)
+        self.level = max(0, min(9, int(level)))
+        self.results = results
+        self.exclude = () if artifacts else Config.BACKUP_EXCLUDE
+
+    def include(self, relPath):
+        if relPath.name in self.exclude:
+            return False
+        #view/index se gradi iz view grupa kad zatreba
+        if relPath.parts[:2] == ('view', 'index'):
+            return False
+        #res/<caserun>/... su rezultati
+        if not self.results and relPath.parts[0] == 'res' and len(relPath.parts) > 2:
+            return False
+        return True
+
+    def entries(self):
+        for folderName, subfolders, filenames in os.walk(str(self.casePath)):
+            folder = Path(folderName)
+            relFolder = folder.relative_to(self.casePath)
+            subfolders[:] = [d for d in sorted(subfolders) if self.include(Path(relFolder, d, '_'))]
+            yield folder, True
+            for filename in sorted(filenames):
+                if self.include(Path(relFolder, filename)):
+                    yield Path(folder, filename), False
+
+    def generate(self):
+        buffer = _StreamBuffer()
+        compression = ZIP_DEFLATED if self.level > 0 else ZIP_STORED
+        with ZipFile(buffer, 'w', compression=compression, compresslevel=self.level or None) as zf:
+            for path, isDir in self.entries():
+                if isDir:
+                    zf.writestr(ZipInfo(path.as_posix() + '/'), b'')
+                else:
+                    size = os.path.getsize(path)
+                    with open(path, 'rb') as src, zf.open(path.as_posix(), 'w', force_zip64=size * 1.05 > ZIP64_LIMIT) as dest:
+                        while True:
+                            block = src.read(Config.BACKUP_BUFFER_SIZE)
+                            if not block:
+                                break
+                            dest.write(block)
+                            data = buffer.drain()
+                            if data:
+                                yield data
+                data = buffer.drain()
+                if data:
+                    yield data
+        data = buffer.drain()
+        if data:
+            yield data
@@ -0,0 +1,235 @@
+import os, gzip, struct, shutil, logging, tempfile, subprocess
+from pathlib import Path
+from threading import Lock
+
+from Classes.Base import Config
+
+logger = logging.getLogger(__name__)
+
+class Artifacts():
+    """
+    Solver artifacts of caseruns (res/<caserun>/...): gzip variants, retention and disk usage.
+
+    An artifact is stored as <name> or <name>.gz, readers go through existing() or restore(), so a
+    caserun whose files were compressed by the retention policy is still downloaded, re-run and
+    used as a warm start reference. CBC reads lp.lp.gz directly when it was built with zlib
+    (Config.SOLVER_GZIP_LP, 'auto' probes the CBC executable once).
+
+    Retention (Config.ARTIFACT_RETENTION) runs after the CSV files and views of a successful run are
+    written, these are what the application reads afterwards:
+        'keep'      nothing is changed
+        'compress'  lp.lp, results.txt, data.txt and basis.bas are gzipped, data_processed.txt is removed
+        'delete'    lp.lp, results.txt and data_processed.txt are removed, data.txt and basis.bas are gzipped
+    data_processed.txt and lp.lp are rebuilt from data.txt by the next run (or taken from the LP
+    cache), data.txt is the input of the caserun and is never removed. CBC does not read gzipped
+    warm start files, a compressed reference is extracted into the folder of the caserun that uses
+    it (warmstart.bas, mipstart.txt), these copies are removed by the next retention.
+    """
+    GZ = '.gz'
+    CHUNK = 1024 * 1024
+    POLICIES = ('keep', 'compress', 'delete')
+    #fajlovi koje retention mijenja, redom kako se obradjuju
+    COMPRESS = {'compress': ('lp.lp', 'results.txt', 'data.txt', 'basis.bas'), 'delete': ('data.txt', 'basis.bas')}
+    REMOVE = {'compress': ('data_processed.txt', 'mipstart.txt', 'warmstart.bas'),
+              'delete': ('lp.lp', 'results.txt', 'data_processed.txt', 'mipstart.txt', 'warmstart.bas')}
+    #artefakti solvera u izvjestaju o zauzecu diska, ostalo u res/<caserun> su rezultati (csv, logovi)
+    SOLVER_FILES = ('data.txt', 'data_processed.txt', 'lp.lp', 'results.txt', 'basis.bas', 'mipstart.txt', 'warmstart.bas')
+    _probes = {}
+    _lock = Lock()
+
+    @staticmethod
+    def gz(path):
+        return Path(str(path) + Artifacts.GZ)
+
+    @staticmethod
+    def existing(path):
+        """path or its gzip variant, whichever exists, None when neither does."""
+        path = Path(path)
+        if path.is_file():
+            return path
+        if Artifacts.gz(path).is_file():
+            return Artifacts.gz(path)
+        return None
+
+    @staticmethod
+    def open(path, mode='r', **kwargs):
+        #tekst ili bajti iz <name> ili <name>.gz
+        source = Artifacts.existing(path)
+        if source is None:
+            raise FileNotFoundError(path)
+        if source.name.endswith(Artifacts.GZ):
+            return gzip.open(source, mode if 'b' in mode else mode + 't', **kwargs)
+        return open(source, mode, **kwargs)
+
+    @staticmethod
+    def _replace(target, write):
+        #atomski upis, tmp fajl u istom folderu pa os.replace
+        fd, tmp = tempfile.mkstemp(prefix='.' + target.name, suffix='.tmp', dir=target.parent)
+        os.close(fd)
+        try:
+            write(tmp)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @staticmethod
+    def compress(path, level=None):
+        """Gzips path into path.gz and removes path, returns path.gz."""
+        path = Path(path)
+        level = Config.ARTIFACT_GZIP_LEVEL if level is None else level
+        target = Artifacts.gz(path)
+
+        def write(tmp):
+            with open(path, 'rb') as src, gzip.open(tmp, 'wb', compresslevel=level) as dest:
+                shutil.copyfileobj(src, dest, Artifacts.CHUNK)
+        Artifacts._replace(target, write)
+        #lp.lp moze biti hard link na LP cache, brise se samo link
+        os.remove(path)
+        return target
+
+    @staticmethod
+    def extract(path, target):
+        """Decompresses path (or path.gz) into target, returns target."""
+        target = Path(target)
+
+        def write(tmp):
+            with Artifacts.open(path, 'rb') as src, open(tmp, 'wb') as dest:
+                shutil.copyfileobj(src, dest, Artifacts.CHUNK)
+        Artifacts._replace(target, write)
+        return target
+
+    @staticmethod
+    def restore(path):
+        """Plain path for a reader that needs it (data.txt for the run), None when there is no variant."""
+        path = Path(path)
+        gz = Artifacts.gz(path)
+        if path.is_file():
+            if gz.is_file():
+                #novi data.txt je generisan poslije kompresije, stari .gz ne vazi
+                os.remove(gz)
+            return path
+        if not gz.is_file():
+            return None
+        Artifacts.extract(gz, path)
+        os.remove(gz)
+        return path
+
+    @staticmethod
+    def rawSize(path):
+        """Uncompressed size of path or path.gz, None when neither exists."""
+        source = Artifacts.existing(path)
+        if source is None:
+            return None
+        if not source.name.endswith(Artifacts.GZ):
+            return os.path.getsize(source)
+        #gzip trailer: ISIZE, velicina modulo 2**32
+        with open(source, 'rb') as f:
+            f.seek(-4, os.SEEK_END)
+            return struct.unpack('<I', f.read(4))[0]
+
+    @staticmethod
+    def drop(path):
+        for variant in (Path(path), Artifacts.gz(path)):
+            if os.path.lexists(variant):
+                os.remove(variant)
+
+    ########################################################################## CBC
+    @staticmethod
+    def cbcReadsGzip(cbcPath):
+        """True when the CBC executable reads gzipped LP files (built with zlib), probed once per path."""
+        with Artifacts._lock:
+            if cbcPath in Artifacts._probes:
+                return Artifacts._probes[cbcPath]
+            readsGzip = False
+            folder = tempfile.mkdtemp(prefix='osy-gz-')
+            try:
+                probe = Path(folder, 'probe.lp.gz')
+                with gzip.open(probe, 'wt') as f:
+                    f.write('Minimize\n cost: x\nSubject To\n c1: x >= 1\nEnd\n')
+                out = subprocess.run([str(cbcPath), str(probe), 'solve'], capture_output=True, text=True, timeout=30)
+                readsGzip = out.returncode == 0 and 'Optimal objective 1' in out.stdout and 'zlib' not in out.stdout
+            except (OSError, subprocess.SubprocessError) as err:
+                logger.warning("CBC gzip probe failed for %s: %s", cbcPath, err)
+            finally:
+                shutil.rmtree(folder, ignore_errors=True)
+            logger.info("CBC %s %s gzipped LP files", cbcPath, 'reads' if readsGzip else 'does not read')
+            Artifacts._probes[cbcPath] = readsGzip
+            return readsGzip
+
+    @staticmethod
+    def gzipLp(cbcPath):
+        if Config.SOLVER_GZIP_LP == 'auto':
+            return Artifacts.cbcReadsGzip(cbcPath)
+        return bool(Config.SOLVER_GZIP_LP)
+
+    ########################################################################## retention
+    @staticmethod
+    def retain(runPath, policy=None):
+        """Applies the retention policy to res/<caserun>, returns {"compressed": [...], "removed": [...], "freed": bytes}."""
+        policy = Config.ARTIFACT_RETENTION if policy is None else policy
+        if policy not in Artifacts.POLICIES:
+            raise ValueError('Artifact retention must be one of {}!'.format(', '.join(Artifacts.POLICIES)))
+        before = Artifacts.size(runPath)
+        done = {"policy": policy, "compressed": [], "removed": [], "freed": 0}
+        if policy == 'keep':
+            return done
+        for name in Artifacts.REMOVE[policy]:
+            path = Path(runPath, name)
+            if Artifacts.existing(path) is not None:
+                Artifacts.drop(path)
+                done["removed"].append(name)
+        for name in Artifacts.COMPRESS[policy]:
+            path = Path(runPath, name)
+            if path.is_file():
+                try:
+                    Artifacts.compress(path)
+                    done["compressed"].append(name)
+                except OSError as err:
+                    logger.warning("%s could not be compressed: %s", path, err)
+        done["freed"] = before - Artifacts.size(runPath)
+        logger.info("Retention %s of %s: %s", policy, runPath, done)
+        return done
+
+    ########################################################################## disk usage
+    @staticmethod
+    def size(folder):
+        total = 0
+        for root, _, files in os.walk(folder):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except FileNotFoundError:
+                    pass
+        return total
+
+    @staticmethod
+    def usage(casePath, caseruns):
+        """Bytes used by a case: caseruns (solver artifacts by file, results), view and the rest."""
+        casePath = Path(casePath)
+        usage = {}
+        for caserun in caseruns:
+            runPath = Path(casePath, 'res', caserun)
+            if runPath.is_dir():
+                artifacts = {}
+                for name in Artifacts.SOLVER_FILES:
+                    source = Artifacts.existing(Path(runPath, name))
+                    if source is not None:
+                        artifacts[source.name] = os.lstat(source).st_size
+                total = Artifacts.size(runPath)
+                usage[caserun] = {
+                    "total": total,
+                    "artifacts": artifacts,
+                    "results": total - sum(artifacts.values())
+                }
+        total = Artifacts.size(casePath)
+        view = Artifacts.size(Path(casePath, 'view'))
+        res = sum(c["total"] for c in usage.values())
+        return {
+            "total": total,
+            "caseruns": usage,
+            "artifacts": sum(sum(c["artifacts"].values()) for c in usage.values()),
+            "view": view,
+            "other": total - res - view
+        }
@@ -1,11 +1,11 @@
 from pathlib import Path
 from Classes.Base import Config
-from Classes.Base.FileClass import File
+from Classes.Base.StorageClass import Storage
 
 class Case:
     def __init__(self, case, genData):
         self.case = case
-        self.PARAMETERS = File.readParamFile(Path(Config.DATA_STORAGE, 'Parameters.json'))
+        self.PARAMETERS = Storage.readParamFile(Path(Config.DATA_STORAGE, 'Parameters.json'))
         self.genData =  genData
 
         #ovdje pravimo automatski path-ove grupama, ako grupa ima parametre onda se pravi path, ako nema onda se ne pravi path i ne pravi se ni json file
@@ -29,8 +29,8 @@ class Case:
                         chunk['value'] = None
                     Rdata[rt['id']][sc['ScenarioId']].append(chunk)
 
-            # File.writeFile( Rdata, self.Rpath)
-            File.writeFile( Rdata, self.jsonPath['R'])
+            # Storage.writeFile( Rdata, self.Rpath)
+            Storage.writeFile( Rdata, self.jsonPath['R'])
         except(IOError):
             raise IOError
 
@@ -50,7 +50,7 @@ class Case:
                         else:
                             chunk[year] = None
                     RYdata[ry['id']][sc['ScenarioId']].append(chunk)
-            File.writeFile( RYdata, self.jsonPath['RY'])
+            Storage.writeFile( RYdata, self.jsonPath['RY'])
         except(IOError):
             raise IOError
 
@@ -71,7 +71,7 @@ class Case:
                             chunk[tech['TechId']] = None
                     RTdata[rt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RTdata, self.jsonPath['RT'])
+            Storage.writeFile( RTdata, self.jsonPath['RT'])
         except(IOError):
             raise IOError
 
@@ -92,7 +92,7 @@ class Case:
                             chunk[emi['EmisId']] = None
                     REdata[rt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( REdata, self.jsonPath['RE'])
+            Storage.writeFile( REdata, self.jsonPath['RE'])
         except(IOError):
             raise IOError
 
@@ -113,7 +113,7 @@ class Case:
                             chunk[stg['StgId']] = None
                     RSdata[rs['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RSdata, self.jsonPath['RS'])
+            Storage.writeFile( RSdata, self.jsonPath['RS'])
         except(IOError):
             raise IOError
         
@@ -138,7 +138,7 @@ class Case:
                                 chunk[year] = None
                         RYCndata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYCndata, self.jsonPath['RYCn'])
+            Storage.writeFile( RYCndata, self.jsonPath['RYCn'])
         except(IOError):
             raise IOError
 
@@ -162,7 +162,7 @@ class Case:
                                 chunk[year] = None
                         RYTsdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTsdata, self.jsonPath['RYTs'])
+            Storage.writeFile( RYTsdata, self.jsonPath['RYTs'])
         except(IOError):
             raise IOError
 
@@ -186,7 +186,7 @@ class Case:
                                 chunk[year] = None
                         RYDtbdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYDtbdata, self.jsonPath['RYDtb'])
+            Storage.writeFile( RYDtbdata, self.jsonPath['RYDtb'])
         except(IOError):
             raise IOError
 
@@ -214,7 +214,7 @@ class Case:
                                     chunk[year] = None
                             RYSeDtsdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYSeDtsdata, self.jsonPath['RYSeDt'])
+            Storage.writeFile( RYSeDtsdata, self.jsonPath['RYSeDt'])
         except(IOError):
             raise IOError
            
@@ -239,7 +239,7 @@ class Case:
                                 chunk[year] = None
                         RYTdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTdata, self.jsonPath['RYT'])
+            Storage.writeFile( RYTdata, self.jsonPath['RYT'])
         except(IOError):
             raise IOError
 
@@ -264,7 +264,7 @@ class Case:
                                 chunk[year] = None
                         RYSdata[rys['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYSdata, self.jsonPath['RYS'])
+            Storage.writeFile( RYSdata, self.jsonPath['RYS'])
         except(IOError):
             raise IOError
         
@@ -292,7 +292,7 @@ class Case:
                                         chunk[year] = None
                                 RYTCndata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTCndata, self.jsonPath['RYTCn'])
+            Storage.writeFile( RYTCndata, self.jsonPath['RYTCn'])
         except(IOError):
             raise IOError
 
@@ -320,7 +320,7 @@ class Case:
                                     chunk[year] = None
                             RYTMdata[rytm['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTMdata, self.jsonPath['RYTM'])
+            Storage.writeFile( RYTMdata, self.jsonPath['RYTM'])
         except(IOError):
             raise IOError
 
@@ -345,7 +345,7 @@ class Case:
                                 chunk[year] = None
                         RYCdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYCdata, self.jsonPath['RYC'])
+            Storage.writeFile( RYCdata, self.jsonPath['RYC'])
         except(IOError):
             raise IOError
 
@@ -370,7 +370,7 @@ class Case:
                                 chunk[year] = None
                         RYEdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYEdata, self.jsonPath['RYE'])
+            Storage.writeFile( RYEdata, self.jsonPath['RYE'])
         except(IOError):
             raise IOError
 
@@ -398,7 +398,7 @@ class Case:
                                         chunk[year] = None 
                                 RYTCdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTCdata, self.jsonPath['RYTC'])
+            Storage.writeFile( RYTCdata, self.jsonPath['RYTC'])
         except(IOError):
             raise IOError
 
@@ -429,7 +429,7 @@ class Case:
                                             chunk[year] = None
                                     RYTCMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTCMdata, self.jsonPath['RYTCM'])
+            Storage.writeFile( RYTCMdata, self.jsonPath['RYTCM'])
         except(IOError):
             raise IOError
 
@@ -460,7 +460,7 @@ class Case:
                                         chunk[year] = None
                                 RYTSMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTSMdata, self.jsonPath['RYTSM'])
+            Storage.writeFile( RYTSMdata, self.jsonPath['RYTSM'])
         except(IOError):
             raise IOError
 
@@ -489,7 +489,7 @@ class Case:
                                     chunk['Value'] = None
                                 RTSMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RTSMdata, self.jsonPath['RTSM'])
+            Storage.writeFile( RTSMdata, self.jsonPath['RTSM'])
         except(IOError):
             raise IOError
            
@@ -517,7 +517,7 @@ class Case:
                                         chunk[year] = None
                                 RYTEdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTEdata, self.jsonPath['RYTE'])
+            Storage.writeFile( RYTEdata, self.jsonPath['RYTE'])
         except(IOError):
             raise IOError
 
@@ -551,7 +551,7 @@ class Case:
                                             chunk[year] = None
                                     RYTEMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTEMdata, self.jsonPath['RYTEM'])
+            Storage.writeFile( RYTEMdata, self.jsonPath['RYTEM'])
         except(IOError):
             raise IOError
 
@@ -579,7 +579,7 @@ class Case:
                                     chunk[year] = None
                             RYTTsdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTTsdata, self.jsonPath['RYTTs'])
+            Storage.writeFile( RYTTsdata, self.jsonPath['RYTTs'])
         except(IOError):
             raise IOError
 
@@ -607,7 +607,7 @@ class Case:
                                     chunk[year] = None
                             RYCTsdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYCTsdata, self.jsonPath['RYCTs'])
+            Storage.writeFile( RYCTsdata, self.jsonPath['RYCTs'])
         except(IOError):
             raise IOError
 
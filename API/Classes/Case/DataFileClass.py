@@ -5,6 +5,9 @@ import traceback
 import logging
 import json, shutil, os, time, subprocess
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from threading import Lock
 from itertools import product
 
 from werkzeug import Response
@@ -13,14 +16,33 @@ logger = logging.getLogger(__name__)
 
 from Classes.Base import Config
 from Classes.Case.OsemosysClass import Osemosys
-from Classes.Base.FileClass import File
+from Classes.Base.StorageClass import Storage
+from Classes.Base.StageTimerClass import StageTimer
+from Classes.Base.MetricsClass import Metrics
+from Classes.Base.RunProgressClass import RunProgress
+from Classes.Base.SolverProcessClass import SolverProcess, RunCancelled
+from Classes.Base.RunSchedulerClass import RunScheduler
 from Classes.Case.HelpersClass import Helpers
+from Classes.Case.LpBuilderClass import LpBuilder
+from Classes.Case.LpCacheClass import LpCache
+from Classes.Case.ArtifactsClass import Artifacts
+from Classes.Case.SolverBackendClass import SolverBackends
+from Classes.Case.SolverResultClass import SolverResult
+from Classes.Case.SolverOptionsClass import SolverOptions, CoreBudget
 
 from Classes.Base.CustomThreadClass import CustomThread
 class DataFile(Osemosys):
     # def __init__(self, case):
     #     Osemosys.__init__(self, case)
 
+    #view fajlovi grupa sadrze sve caserune, runovi istog case-a ih ne smiju mijenjati istovremeno
+    _viewLocks = {}
+    _lock = Lock()
+
+    def _viewLock(self):
+        with DataFile._lock:
+            return DataFile._viewLocks.setdefault(self.case, Lock())
+
     def gen_Conversions(self):
         self.seasons = ''
         for seId in self.seIDs:
@@ -87,7 +109,7 @@ class DataFile(Osemosys):
         self.f.write('{}{}'.format(dtbString,'\n'))
 
     def gen_R(self):
-        r = self.R(File.readFile(self.rPath))
+        r = self.R(Storage.readFile(self.rPath))
         for id, param in self.PARAM['R'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for sc in self.scOrder:
@@ -109,7 +131,7 @@ class DataFile(Osemosys):
         self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RY(self):
-        ry = self.RY(File.readFile(self.ryPath))
+        ry = self.RY(Storage.readFile(self.ryPath))
         for id, param in self.PARAM['RY'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':','\n'))
             self.f.write('{}{}{}'.format(self.years, ':=', '\n'))
@@ -123,7 +145,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RT(self):
-        rt = self.RT(File.readFile(self.rtPath))
+        rt = self.RT(Storage.readFile(self.rtPath))
         for id, param in self.PARAM['RT'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':','\n'))
             self.f.write('{}{}{}'.format(self.techs, ':=', '\n'))
@@ -137,7 +159,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RE(self):
-        re = self.RE(File.readFile(self.rePath))
+        re = self.RE(Storage.readFile(self.rePath))
         for id, param in self.PARAM['RE'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':','\n'))
             self.f.write('{}{}{}'.format(self.emis, ':=', '\n'))
@@ -151,7 +173,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RS(self):
-        re = self.RS(File.readFile(self.rsPath))
+        re = self.RS(Storage.readFile(self.rsPath))
         for id, param in self.PARAM['RS'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':','\n'))
             self.f.write('{}{}{}'.format(self.stgs, ':=', '\n'))
@@ -165,7 +187,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RTSM(self):
-        rtsm = self.RTSM(File.readFile(self.rtsmPath))
+        rtsm = self.RTSM(Storage.readFile(self.rtsmPath))
         for id, param in self.PARAM['RTSM'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for stgId in self.stgIDs:
@@ -196,7 +218,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYCn(self):
-        rycn = self.RYCn(File.readFile(self.rycnPath))
+        rycn = self.RYCn(Storage.readFile(self.rycnPath))
         for id, param in self.PARAM['RYCn'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             self.f.write('{} {}'.format('[RE1,*,*]:', '\n'))
@@ -212,7 +234,7 @@ class DataFile(Osemosys):
         self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTs(self):
-        ryts = self.RYTs(File.readFile(self.rytsPath))
+        ryts = self.RYTs(Storage.readFile(self.rytsPath))
         for id, param in self.PARAM['RYTs'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':','\n'))
             self.f.write('{}{}{}'.format( self.years, ':=', '\n'))
@@ -232,7 +254,7 @@ class DataFile(Osemosys):
         self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYDtb(self):
-        rydtb = self.RYDtb(File.readFile(self.rydtbPath))
+        rydtb = self.RYDtb(Storage.readFile(self.rydtbPath))
         for id, param in self.PARAM['RYDtb'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':','\n'))
             self.f.write('{}{}{}'.format( self.years, ':=', '\n'))
@@ -252,7 +274,7 @@ class DataFile(Osemosys):
         self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYSeDt(self):
-        rysedt = self.RYSeDt(File.readFile(self.rysedtPath))
+        rysedt = self.RYSeDt(Storage.readFile(self.rysedtPath))
         for id, param in self.PARAM['RYSeDt'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for seId in self.seIDs:
@@ -280,7 +302,7 @@ class DataFile(Osemosys):
         self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYT(self):
-        ryt = self.RYT(File.readFile(self.rytPath))
+        ryt = self.RYT(Storage.readFile(self.rytPath))
 
         for id, param in self.PARAM['RYT'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
@@ -306,7 +328,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYS(self):
-        rys = self.RYS(File.readFile(self.rysPath))
+        rys = self.RYS(Storage.readFile(self.rysPath))
 
         for id, param in self.PARAM['RYS'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
@@ -332,7 +354,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTCn(self):
-        rytcn = self.RYTCn(File.readFile(self.rytcnPath))
+        rytcn = self.RYTCn(Storage.readFile(self.rytcnPath))
         for id, param in self.PARAM['RYTCn'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for conId in self.conIDs:
@@ -361,7 +383,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTM(self):
-        rytm = self.RYTM(File.readFile(self.rytmPath))
+        rytm = self.RYTM(Storage.readFile(self.rytmPath))
         for id, param in self.PARAM['RYTM'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             
@@ -389,7 +411,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYC(self):
-        ryc = self.RYC(File.readFile(self.rycPath))
+        ryc = self.RYC(Storage.readFile(self.rycPath))
         for id, param in self.PARAM['RYC'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             # self.f.write('{} {}'.format('[RE1,*,*]:', '\n'))
@@ -415,7 +437,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYE(self):
-        rye = self.RYE(File.readFile(self.ryePath))
+        rye = self.RYE(Storage.readFile(self.ryePath))
         for id, param in self.PARAM['RYE'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             regionHeader = True
@@ -441,7 +463,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTC(self):
-        rytc = self.RYTC(File.readFile(self.rytcPath))
+        rytc = self.RYTC(Storage.readFile(self.rytcPath))
         for id, param in self.PARAM['RYTC'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for inputCapTechId in self.inputCapTechIds[id]:
@@ -466,7 +488,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTCM(self):
-        rytcm = self.RYTCM(File.readFile(self.rytcmPath))
+        rytcm = self.RYTCM(Storage.readFile(self.rytcmPath))
         for id, param in self.PARAM['RYTCM'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for activityTechId in self.activityTechIDs[id]:
@@ -494,7 +516,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTSM(self):
-        rytsm = self.RYTSM(File.readFile(self.rytsmPath))
+        rytsm = self.RYTSM(Storage.readFile(self.rytsmPath))
         for id, param in self.PARAM['RYTSM'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for stgId in self.stgIDs:
@@ -523,7 +545,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTE(self):
-        ryte = self.RYTE(File.readFile(self.rytePath))
+        ryte = self.RYTE(Storage.readFile(self.rytePath))
         for id, param in self.PARAM['RYTE'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for emissionTechId in self.emissionTechIDs[id]:
@@ -548,7 +570,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTEM(self):
-        rytem = self.RYTEM(File.readFile(self.rytemPath))
+        rytem = self.RYTEM(Storage.readFile(self.rytemPath))
         for id, param in self.PARAM['RYTEM'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for emissionTechId in self.emissionTechIDs[id]:
@@ -576,7 +598,7 @@ class DataFile(Osemosys):
             self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYTTs(self):
-        rytts = self.RYTTs(File.readFile(self.ryttsPath))
+        rytts = self.RYTTs(Storage.readFile(self.ryttsPath))
         for id, param in self.PARAM['RYTTs'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for techId in self.techIDs:
@@ -603,7 +625,7 @@ class DataFile(Osemosys):
         self.f.write('{}{}'.format(';', '\n'))
 
     def gen_RYCTs(self):
-        rycts = self.RYCTs(File.readFile(self.ryctsPath))
+        rycts = self.RYCTs(Storage.readFile(self.ryctsPath))
         for id, param in self.PARAM['RYCTs'].items():
             self.f.write('{} {} {} {} {} {}'.format('param', param,'default', self.defaultValue[id], ':=','\n'))
             for commId in self.commIDs:
@@ -806,12 +828,12 @@ class DataFile(Osemosys):
                 os.makedirs(caseRunPath)
                 os.makedirs(csvPath)
                 if not os.path.exists(self.resDataPath):
-                    File.writeFile( data, self.resDataPath)
+                    Storage.writeFile( data, self.resDataPath)
                 else:
                     # resData smo vec ucitali u data varijablu u CaseControlleru pa nema potrebe ponovo citati iz filea
-                    #resData = File.readFile(self.resData)
+                    #resData = Storage.readFile(self.resData)
                     self.resData['osy-cases'].append(data)
-                    File.writeFile( self.resData, self.resDataPath)
+                    Storage.writeFile( self.resData, self.resDataPath)
                 response = {
                     "message": "You have created a case run!",
                     "status_code": "success"
@@ -831,7 +853,7 @@ class DataFile(Osemosys):
 
     def deleteScenarioCaseRuns(self, scenarioId):
         try:
-            #resData = File.readFile(self.resDataPath)
+            #resData = Storage.readFile(self.resDataPath)
             cases = self.resData['osy-cases']
 
             for cs in cases:
@@ -840,7 +862,7 @@ class DataFile(Osemosys):
                         cs['Scenarios'].remove(sc)
 
 
-            File.writeFile(self.resData, self.resDataPath   )
+            Storage.writeFile(self.resData, self.resDataPath   )
             response = {
                 "message": "You have deleted scenario from caseruns!",
                 "status_code": "success"
@@ -867,14 +889,14 @@ class DataFile(Osemosys):
                 if not os.path.exists(csvPath):
                     os.makedirs(csvPath)
 
-                #resData = File.readFile(self.resData)
+                #resData = Storage.readFile(self.resData)
 
                 resdata = self.resData['osy-cases']
                 for i, case in enumerate(resdata):
                     if case['Case'] == oldcaserunname:
                         self.resData['osy-cases'][i] = data
 
-                File.writeFile( self.resData, self.resDataPath)
+                Storage.writeFile( self.resData, self.resDataPath)
                 response = {
                     "message": "You have updated a case run!",
                     "status_code": "success"
@@ -883,14 +905,14 @@ class DataFile(Osemosys):
                 if not os.path.exists(csvPath):
                     os.makedirs(csvPath)
 
-                #resData = File.readFile(self.resData)
+                #resData = Storage.readFile(self.resData)
 
                 resdata = self.resData['osy-cases']
                 for i, case in enumerate(resdata):
                     if case['Case'] == oldcaserunname:
                         self.resData['osy-cases'][i] = data
 
-                File.writeFile( self.resData, self.resDataPath)
+                Storage.writeFile( self.resData, self.resDataPath)
                 response = {
                     "message": "You have updated a case run!",
                     "status_code": "success"
@@ -921,13 +943,13 @@ class DataFile(Osemosys):
                 #if group != 'RYS':
                 path = Path(self.viewFolderPath, group+'.json')
                 if path.is_file():
-                    jsonFile = File.readFile(path)
+                    jsonFile = Storage.readFile(path)
                     for obj in array:
                         #potrebna provjera jer smo u 4.5 verziji dodali varijablu EBAC i dolazilo je do greske jer nije bilo u reyultataima
                         if obj['id'] in jsonFile:
                             if caserunname in jsonFile[obj['id']]:
                                 del jsonFile[obj['id']][caserunname]
-                    File.writeFile(jsonFile, path)
+                    Storage.writeFile(jsonFile, path)
         except(IOError, IndexError):
             raise IndexError
         except OSError:
@@ -966,11 +988,11 @@ class DataFile(Osemosys):
             ##################VIEW folder
             #  update resData.json folder
             if not resultsOnly:
-                #resData = File.readFile(self.resData)
+                #resData = Storage.readFile(self.resData)
                 for obj in self.resData['osy-cases']:
                     if obj['Case'] == caserunname:
                         self.resData['osy-cases'].remove(obj)
-                File.writeFile( self.resData, self.resDataPath )
+                Storage.writeFile( self.resData, self.resDataPath )
 
             # - update .json files by removing caserun
             merged = Helpers.merge_groups(self.VARIABLES, self.IND_GROUPED)
@@ -978,12 +1000,12 @@ class DataFile(Osemosys):
                 #if group != 'RYS':
                 path = Path(self.viewFolderPath, group+'.json')
                 if path.is_file():
-                    jsonFile = File.readFile(path)
+                    jsonFile = Storage.readFile(path)
                     for obj in array:
                         if obj['id'] in jsonFile:
                             if caserunname in jsonFile[obj['id']]:
                                 del jsonFile[obj['id']][caserunname]
-                    File.writeFile(jsonFile, path)
+                    Storage.writeFile(jsonFile, path)
                     
             response = {
                 "message": "You have deleted a case run!",
@@ -1024,7 +1046,7 @@ class DataFile(Osemosys):
             if os.path.exists(self.viewFolderPath) and os.path.isdir(self.viewFolderPath):
                 if os.listdir(self.viewFolderPath):   # returns list of files/folders
                     for filename in os.listdir( self.viewFolderPath):
-                        if filename !='resData.json' and filename != 'viewDefinitions.json':
+                        if Storage.baseName(filename) not in ('resData.json', 'viewDefinitions.json'):
                             file_path = os.path.join(self.viewFolderPath, filename)
                             try:
                                 if os.path.isfile(file_path) or os.path.islink(file_path):
@@ -1037,7 +1059,7 @@ class DataFile(Osemosys):
             #sad moramo napraviti defualt definitions file - ovo smo napustili 18022026 zelimo da ostanu definicije view-ova
             ##viewDefPath = Path(self.viewFolderPath, 'viewDefinitions.json')
             # configPath = Path(Config.DATA_STORAGE, 'Variables.json')
-            # vars = File.readParamFile(configPath)
+            # vars = Storage.readParamFile(configPath)
             # viewDef = {}
             # for group, lists in vars.items():
             #     for list in lists:
@@ -1046,7 +1068,7 @@ class DataFile(Osemosys):
             # viewData = {
             #         "osy-views": viewDef
             #     }
-            # File.writeFile( viewData, viewDefPath)
+            # Storage.writeFile( viewData, viewDefPath)
 
             ######### treba provjeriti da li res fodler ima subfolde sa imenom case is resData.json
 
@@ -1073,10 +1095,10 @@ class DataFile(Osemosys):
 
             viewDataPath = Path(Config.DATA_STORAGE,self.case,'view', 'viewDefinitions.json')
 
-            viewData = File.readFile(viewDataPath)
+            viewData = Storage.readFile(viewDataPath)
             viewData["osy-views"][param].append(data)
 
-            File.writeFile( viewData, viewDataPath)
+            Storage.writeFile( viewData, viewDataPath)
 
             response = {
                 "message": "You have created view!",
@@ -1095,10 +1117,10 @@ class DataFile(Osemosys):
 
             viewDataPath = Path(Config.DATA_STORAGE,self.case,'view', 'viewDefinitions.json')
 
-            viewData = File.readFile(viewDataPath)
+            viewData = Storage.readFile(viewDataPath)
             viewData["osy-views"][param] = data
 
-            File.writeFile( viewData, viewDataPath)
+            Storage.writeFile( viewData, viewDataPath)
 
             response = {
                 "message": "You have updated views!",
@@ -1114,11 +1136,11 @@ class DataFile(Osemosys):
         
     def readDataFile( self, caserunname ):
         try:
+            #data.txt ili data.txt.gz nakon retention
             dataFilePath = Path(Config.DATA_STORAGE, self.case, 'res',caserunname,'data.txt')
-            if os.path.exists(dataFilePath):
-                f = open(dataFilePath, mode="r", encoding='utf-8-sig')
-                data =  f.read()
-                f.close()
+            if Artifacts.existing(dataFilePath) is not None:
+                with Artifacts.open(dataFilePath, mode="r", encoding='utf-8-sig') as f:
+                    data =  f.read()
             else:
                 data = None
             return data
@@ -1132,7 +1154,7 @@ class DataFile(Osemosys):
             self.defaultValue = self.getParamDefaultValues()
             data = {}
             start_year = self.getYears()[0]
-            with open(dataFilePath, 'r') as f:
+            with Artifacts.open(dataFilePath, 'r') as f:
                 parsing = False
                 for line in f:
                     line = line.rstrip().replace('\t', ' ')
@@ -1230,8 +1252,8 @@ class DataFile(Osemosys):
             start_year = self.getYears()[0]
             msg = ""
 
-            dataFilePath = Path(Config.DATA_STORAGE, self.case, 'res',caserunname,'data.txt')
-            if dataFilePath.is_file():
+            dataFilePath = Artifacts.existing(Path(Config.DATA_STORAGE, self.case, 'res',caserunname,'data.txt'))
+            if dataFilePath is not None:
                 # with open(dataFilePath, 'r') as f:
 
                 #     parsing = False
@@ -2023,21 +2045,29 @@ class DataFile(Osemosys):
             print("An error occurred:")
             traceback.print_exc()  # Prints full traceback
 
-    def batchRun(self, solver, cases):
+    def batchRun(self, solver, cases, options=None, owner=None):
         try:
             batchlog=""
             msg=""
             status = "Success"
             results = []
+            solverResults = {}
 
-            ##################################Sequential code
-            for caserun in cases:
+            ##################################Thread pool, runs are admitted by RunScheduler, CBC threads are limited by CoreBudget
+            def runCase(caserun):
                 logger.info("Starting batch run optimization process for model %s caserun %s!", self.case, caserun)
-                runout =self.run(solver, caserun)
+                #run pamti putanje caseruna na instanci, svaki paralelni run ima svoju
+                return DataFile(self.case).run(solver, caserun, options=options, owner=owner)
+
+            with ThreadPoolExecutor(max_workers=max(1, Config.BATCH_WORKERS)) as executor:
+                results = list(executor.map(runCase, cases))
+
+            for runout in results:
                 logger.info("Batch run optimization process %s  %s !", runout["caserun"], runout["timer"])
                 msg+="Case: {0}{1}{2}".format( runout["caserun"], runout["timer"],  '\n')
                 batchlog+="{0}{1}{2}{3}{4}{5}{6}{7}{8}".format(runout["glpk_message"],'\n',runout["glpk_stdmsg"],'\n',runout["cbc_message"],'\n',runout["cbc_stdmsg"],'\n', '\n')
                 batchlog+="------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------ {0}".format('\n')
+                solverResults[runout["caserun"]] = runout.get("solverResult")
                 if runout["status_code"] != 'success':
                     status = "Error"
 
@@ -2114,7 +2144,8 @@ class DataFile(Osemosys):
             response = {
                 "log": batchlog,
                 "msg": msg,
-                "status": status
+                "status": status,
+                "solverResults": solverResults
             }           
             return response
 
@@ -2123,16 +2154,211 @@ class DataFile(Osemosys):
         except OSError:
             raise OSError
 
-    def run(self, solver, caserun, lock=None):
+    def saveTimings(self, timer, stats=None, result=None):
+        #res/<caserun>/timings.json, vraca se i u odgovoru /run
+        timings = timer.toDict()
+        if stats:
+            timings["solverStats"] = stats
+        if result is not None:
+            #status ostaje i kad retention obrise results.txt (warm start)
+            timings["solverResult"] = result.toDict()
+        try:
+            Storage.writeFile(timings, Path(self.resPath, 'timings.json'))
+        except OSError:
+            logger.warning("Could not write timings for %s", self.resPath)
+        return timings
+
+    def buildLp(self, dataFile, lpFile):
+        #LP fajl bez glpsol, False kad model ili podaci nisu podrzani pa LP pravi glpsol
+        if Config.LP_BUILDER != 'native' or not LpBuilder.supports(self.osemosysFile):
+            return False
+        try:
+            size = LpBuilder(dataFile).build().write(lpFile)
+        except (ValueError, KeyError, IndexError) as err:
+            logger.warning("Native LP build failed for %s, using glpsol: %s", dataFile, err)
+            return False
+        logger.info("Native LP %s: %s", lpFile, size)
+        return True
+
+    def buildModel(self, timer, start_time, caserun):
+        #LpBuilder matrica za solver u procesu (HiGHS), None kad model ide kroz LP fajl
+        if Config.LP_BUILDER != 'native' or not LpBuilder.supports(self.osemosysFile):
+            return None
+        with timer.stage("preprocess"):
+            self.preprocessData(self.dataFile, self.dataFile_processed)
+        logger.info("PREPROCESSING DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
+        try:
+            with timer.stage("lp"):
+                model = LpBuilder(self.dataFile_processed).build()
+        except (ValueError, KeyError, IndexError) as err:
+            logger.warning("Native LP build failed for %s, using LP file: %s", self.dataFile_processed, err)
+            return None
+        logger.info("LP MATRIX DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
+        return model
+
+    def prepareLp(self, backend, task, timer, progress, start_time, caserun):
+        #lp.lp (ili lp.lp.gz) iz LP cache-a, LpBuilder-a ili glpsol --wlp, vraca izlaz glpsol ako je pokrenut
+        glpk_out = None
+        base = self.resPath
+        if backend.readsGzip():
+            self.lpFile = base / "lp.lp.gz"
+        Artifacts.drop(base / "lp.lp")
+        lpKey = LpCache.key(self.osemosysFile, self.dataFile) if LpCache.enabled() else None
+        if lpKey and LpCache.fetch(lpKey, self.lpFile):
+            logger.info("LP FILE FROM CACHE! --- %s seconds --- %s", time.time() - start_time, caserun)
+            return None
+
+        logger.info(f"Preprocessing case {caserun}")
+        with timer.stage("preprocess"):
+            self.preprocessData(self.dataFile, self.dataFile_processed)
+        logger.info("PREPROCESSING DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
+
+        with timer.stage("lp"):
+            LpCache.release(self.lpFile)
+            if not self.buildLp(self.dataFile_processed, self.lpFile):
+                progress.solver("glpsol")
+                glpk_out = SolverBackends.get('glpk').writeLp(task, task["modelFile"],
+                    str(Path(self.dataFile_processed).resolve()), str((base / "lp.lp").resolve()))
+                if glpk_out.returncode == 0 and self.lpFile.name.endswith(Artifacts.GZ):
+                    Artifacts.compress(base / "lp.lp")
+        if lpKey and not (glpk_out and glpk_out.returncode != 0):
+            LpCache.store(lpKey, self.lpFile)
+        logger.info("CREATINON OF LP FILE DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
+        return glpk_out
+
+    def solverOptions(self, caserun, options=None):
+        #opcije iz zahtjeva se pamte uz caserun u resData, bez njih vaze zapamcene
+        if options is None:
+            stored = next((c.get('SolverOptions') for c in self.resData.get('osy-cases', []) if c.get('Case') == caserun), None)
+            return SolverOptions.normalize(stored)
+        profile = SolverOptions.normalize(options)
+        with self._viewLock():
+            if Storage.exists(self.resDataPath):
+                self.resData = Storage.readFile(self.resDataPath)
+            for obj in self.resData.get('osy-cases', []):
+                if obj.get('Case') == caserun and obj.get('SolverOptions') != profile:
+                    obj['SolverOptions'] = profile
+                    Storage.writeFile(self.resData, self.resDataPath)
+        return profile
+
+    @staticmethod
+    def stoppedMessage(stopped):
+        if stopped == 'timeout':
+            return 'Solver timed out after {} seconds.'.format(Config.SOLVER_TIMEOUT)
+        return 'Run cancelled.'
+
+    def diskUsage(self):
+        caseruns = [c['Case'] for c in self.resData.get('osy-cases', [])]
+        return Artifacts.usage(self.casePath, caseruns)
+
+    def applyRetention(self, policy=None):
+        #retention za postojece caserune, caserun koji se upravo rjesava se preskace
+        policy = Config.ARTIFACT_RETENTION if policy is None else policy
+        if policy not in Artifacts.POLICIES:
+            raise ValueError('Artifact retention must be one of {}!'.format(', '.join(Artifacts.POLICIES)))
+        done = {}
+        for obj in self.resData.get('osy-cases', []):
+            caserun = obj['Case']
+            channel = RunProgress.get(self.case, caserun)
+            if channel is not None and channel.finishedAt is None:
+                done[caserun] = {"skipped": 'running'}
+            elif Path(self.resultsPath, caserun).is_dir():
+                done[caserun] = Artifacts.retain(Path(self.resultsPath, caserun), policy)
+        return done
+
+    def warmStart(self, caserun, reference, mip):
+        """
+        Basis (LP) or solution (MIP) of the reference caserun that seeds CBC. The LP files of the
+        caseruns of a case are written with the same row and column names, so the reference files
+        are used as they are, names CBC does not find in the new LP are skipped. 'file' is None
+        when the reference can not be used, 'reason' says why and the run starts cold.
+        """
+        if not reference:
+            return None
+        info = {"reference": reference, "mode": None, "file": None, "reason": None}
+        refPath = Path(Config.DATA_STORAGE, self.case, 'res', reference)
+        results = Artifacts.existing(Path(refPath, 'results.txt'))
+        basis = Artifacts.existing(Path(refPath, 'basis.bas'))
+        if results is not None:
+            status = SolverResult.classify(SolverResult.header(results)[0])
+        else:
+            #retention 'delete' brise results.txt a cuva basis.bas, status je u timings.json
+            try:
+                status = (Storage.readFile(Path(refPath, 'timings.json')).get("solverResult") or {}).get("status")
+            except (OSError, ValueError):
+                status = None
+        if not any(c.get('Case') == reference for c in self.resData.get('osy-cases', [])):
+            info["reason"] = 'reference caserun does not exist'
+        elif status is None:
+            info["reason"] = 'reference caserun has no results'
+        elif status != 'optimal':
+            info["reason"] = 'reference caserun has no optimal solution'
+        elif mip:
+            if results is None:
+                info["reason"] = 'reference caserun has no saved solution'
+            else:
+                #CBC ne cita komprimovan results.txt, raspakuje se u folder ovog caseruna
+                if results.name.endswith(Artifacts.GZ):
+                    results = Artifacts.extract(results, Path(self.resPath, 'mipstart.txt'))
+                info.update({"mode": 'mipStart', "file": str(results.resolve())})
+        elif basis is not None:
+            if basis.name.endswith(Artifacts.GZ):
+                basis = Artifacts.extract(basis, Path(self.resPath, 'warmstart.bas'))
+            info.update({"mode": 'basis', "file": str(basis.resolve())})
+        else:
+            info["reason"] = 'reference caserun has no saved basis'
+        if info["reason"]:
+            logger.warning("Warm start of %s from %s skipped: %s", caserun, reference, info["reason"])
+        return info
+
+    def solverStats(self, result, timer, warm):
+        #iteracije i vrijeme solve faze, uz warm start i vrijednosti referentnog caseruna za poredjenje
+        stats = {
+            "iterations": result.iterations,
+            "solveSeconds": next((s["wall"] for s in reversed(timer.stages) if s["stage"] == "solve"), None),
+            "warmStart": {k: v for k, v in warm.items() if k != 'file'} if warm else None
+        }
+        if warm and warm["mode"]:
+            refTimings = Path(Config.DATA_STORAGE, self.case, 'res', warm["reference"], 'timings.json')
+            try:
+                reference = Storage.readFile(refTimings).get("solverStats") or {}
+            except (OSError, ValueError):
+                reference = {}
+            stats["referenceIterations"] = reference.get("iterations")
+            stats["referenceSolveSeconds"] = reference.get("solveSeconds")
+        return stats
+
+    def runMemory(self):
+        #procjena memorije runa iz LP fajla prethodnog runa, bez njega iz data.txt
+        lpBytes = Artifacts.rawSize(self.resPath / "lp.lp")
+        if lpBytes is None:
+            lpBytes = (Artifacts.rawSize(self.dataFile) or 0) * Config.RUN_LP_PER_DATA_BYTE
+        return RunScheduler.memoryEstimate(lpBytes)
+
+    def run(self, solver, caserun, lock=None, options=None, owner=None):
         cbc_out = None
         glpk_out = None
-
+        warm = None
+        stats = None
+        retention = None
+        runStatus = "error"
+        admission = ExitStack()
+
+        #solver po imenu, glpk | cbc | highs (SolverBackends), i opcije se provjeravaju prije runa,
+        #ValueError je greska zahtjeva (400) a ne pad runa
+        backend = SolverBackends.get(solver)
+        caps = backend.capabilities
+        profile = self.solverOptions(caserun, options)
+
+        Metrics.RUN_QUEUE.inc()
+        progress = RunProgress.open(self.case, caserun)
+        SolverProcess.begin(progress.job)
         try:
             if lock:
                 lock.acquire(timeout=5)
 
             start_time = time.time()
-            txtOut = ""
+            timer = StageTimer(progress.stage)
 
             # ---- PRECOMPUTE PATHS ----
             base = Path(Config.DATA_STORAGE, self.case, "res", caserun)
@@ -2145,8 +2371,6 @@ class DataFile(Osemosys):
             self.resPath = base
 
             modelfile = str(self.osemosysFile.resolve())
-            dataFile_processed = str(Path(self.dataFile_processed).resolve())
-            lpFile = str(Path(self.lpFile).resolve())
             resFile = str(Path(self.resFile).resolve())
 
 
@@ -2154,72 +2378,98 @@ class DataFile(Osemosys):
             # cbc_path = str(Path(self.cbcFolder, "cbc.exe"))
 
             
-            glpk_cwd = self.glpkFolder if self.glpsol_is_bundled else None
-            cbc_cwd  = self.cbcFolder  if self.cbc_is_bundled  else None
-
-
-            if not Path(self.glpsol_path).exists():
-                raise FileNotFoundError(f"glpsol.exe not found in: {self.glpsol_path}")
-
-            if not Path(self.cbc_path).exists():
-                raise FileNotFoundError(f"cbc.exe not found in: {self.cbc_path}")
-
-            self.deleteCaseResultsJSON(caserun)
+            #run ceka u redu RunScheduler-a dok nema slobodan slot i memoriju
+            with timer.stage("queue"):
+                admission.enter_context(RunScheduler.admit(progress.job, self.case, owner, self.runMemory(), progress.queued))
+            if progress.state["queue"] is not None:
+                progress.queued(None)
+
+            #retention prethodnog runa je mogla komprimovati data.txt
+            Artifacts.restore(self.dataFile)
+
+            #izlaz solvera se upisuje u logfile.txt dok run traje
+            open(self.logFileTxt, 'w').close()
+
+            with self._viewLock():
+                self.deleteCaseResultsJSON(caserun)
+
+            task = {
+                "modelFile": modelfile,
+                "dataFile": str(self.dataFile),
+                "resFile": resFile,
+                "profile": profile,
+                "logFile": self.logFileTxt,
+                "progress": progress,
+                "job": progress.job,
+                "started": time.time()
+            }
 
             # =======================================================
-            # ---------------------- GLPK ----------------------------
+            # ------------- GMPL model (glpsol) ---------------------
             # =======================================================
-            if solver == "glpk":
-                glpk_out = subprocess.run(
-                    ["glpsol", "-m", modelfile, "-d", str(self.dataFile), "-o", str(self.resFile)],
-                    cwd=glpk_cwd,
-                    text=True,
-                    capture_output=True
-                )
+            if caps["input"] == 'model':
+                progress.solver(backend.name)
+                with timer.stage("solve"):
+                    glpk_out = backend.solve(task)
 
             # =======================================================
-            # ---------------------- CBC -----------------------------
+            # ------------- LP problem (CBC, HiGHS) -----------------
             # =======================================================
             else:
-                logger.info(f"Preprocessing case {caserun}")
-                self.preprocessData(self.dataFile, self.dataFile_processed)
-                logger.info("PREPROCESSING DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
-                txtOut += f"Preprocessing time {time.time() - start_time:0.2f}s\n"
-
-                glpk_out = subprocess.run(
-                    [self.glpsol_path, "--check", "-m", modelfile, "-d", dataFile_processed, "--wlp", lpFile],
-                    cwd=cbc_cwd,
-                    text=True,
-                    capture_output=True
-                )
-
-                logger.info("CREATINON OF LP FILE DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
-                txtOut += f"Creation of LP file {time.time() - start_time:0.2f}s\n"
-
-                cbc_out = subprocess.run(
-                    [self.cbc_path, lpFile, "solve", "-printing", "all", "-solu", resFile],
-                    cwd=self.cbcFolder,
-                    text=True,
-                    capture_output=True
-                )
+                model = self.buildModel(timer, start_time, caserun) if caps["input"] == 'arrays' else None
+                if model is None:
+                    glpk_out = self.prepareLp(backend, task, timer, progress, start_time, caserun)
+                    task["lpFile"] = str(Path(self.lpFile).resolve())
+                task["model"] = model
+
+                if not (glpk_out and glpk_out.returncode != 0):
+                    mip = SolverOptions.isMip(task["lpFile"]) if model is None else bool((model.columnKinds() == 'integer').any())
+                    if caps["warmStart"]:
+                        warm = self.warmStart(caserun, profile["warmStart"], mip)
+                    elif profile["warmStart"]:
+                        warm = {"reference": profile["warmStart"], "mode": None, "file": None,
+                                "reason": 'solver {} does not warm start'.format(backend.name)}
+                    else:
+                        warm = None
+                    task.update({
+                        "mip": mip,
+                        "warm": warm,
+                        "basisOut": str(Path(base, 'basis.bas').resolve()) if Config.CBC_SAVE_BASIS else None
+                    })
+                    progress.solver(backend.name)
+                    with CoreBudget.reserve(profile["threads"] if caps["threads"] else 1), timer.stage("solve"):
+                        cbc_out = backend.solve(task)
                 logger.info("SOLUTION DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
-                txtOut += f"Solve time {time.time() - start_time:0.2f}s\n"
+
+            for artifact in (self.resFile, base / "basis.bas"):
+                if Path(artifact).is_file():
+                    #results.txt.gz i basis.bas.gz prethodnog runa vise ne vaze
+                    Artifacts.restore(artifact)
 
             # =======================================================
             # ---------------- ERROR HANDLING ------------------------
             # =======================================================
 
-            if (cbc_out and cbc_out.returncode != 0) or (glpk_out and glpk_out.returncode != 0):
-                
+            #glpsol --wlp (LP fajl za CBC) nije uspio, solver nije pokrenut
+            solved = cbc_out or (glpk_out if caps["input"] == 'model' else None)
+            result = backend.result(solved, task) if solved else None
+            if cbc_out:
+                stats = self.solverStats(result, timer, warm)
+            if result is None or result.stopped or result.returncode != 0:
+                stopped = result.stopped if result else None
                 msg = {
                     "cbc_message": cbc_out.stdout if cbc_out else None,
                     "cbc_stdmsg": cbc_out.stderr if cbc_out else None,
                     "glpk_message": glpk_out.stdout if glpk_out else None,
                     "glpk_stdmsg": glpk_out.stderr if glpk_out else None,
-                    "timer": "Solver error — check logs.",
+                    "timer": self.stoppedMessage(stopped) if stopped else "Solver error — check logs.",
                     "status_code": "error",
+                    "stopped": stopped,
                     "caserun": caserun,
+                    "solverResult": result.toDict() if result else None,
+                    "timings": self.saveTimings(timer, stats, result),
                 }
+                runStatus = stopped or "error"
                 logger.info(f"ERROR HANDLING {msg}")
                 return msg
 
@@ -2227,56 +2477,57 @@ class DataFile(Osemosys):
             # --------------------- SUCCESS --------------------------
             # =======================================================
 
-            msg = (cbc_out.stdout if cbc_out else glpk_out.stdout).splitlines()
-
-            statusFlag = "warning"
-            customMsg = ""
-
-            if any("Optimal" in s for s in msg):
-                matching = [s for s in msg if "Optimal" in s]
-                customMsg = customMsg + matching[0] + " - "
-                times = [s for s in msg if "Total time (CPU seconds):" in s]
-                customMsg = customMsg + times[0]
-                statusFlag = "success"
-
-            if any("infeasible" in s for s in msg):
-                matching = [s for s in msg if "infeasible" in s]
-                customMsg = customMsg + matching[0] + " - "
-                times = [s for s in msg if "Total time (CPU seconds):" in s]
-                customMsg = customMsg + times[0]
-                statusFlag = "warning"
-
-            if any("ERROR" in s for s in msg):
-                matching = [s for s in msg if "ERROR" in s]
-                customMsg = customMsg + matching[0] + " - "
-                times = [s for s in msg if "Total time (CPU seconds):" in s]
-                customMsg = customMsg + times[0]
-                statusFlag = "error"
-
-            if statusFlag == "success" and cbc_out:
-                self.generateCSVfromCBC(self.dataFile, self.resFile, self.resPath)
+            statusFlag = result.statusFlag
+            if result.postProcess and caps["solution"] == 'cbc':
+                with timer.stage("csv"):
+                    self.generateCSVfromCBC(self.dataFile, self.resFile, self.resPath)
                 logger.info("CSV DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
-                txtOut = txtOut + ("csv files extraction time {:0.2f} s;{}".format(time.time() - start_time, '\n'))
-                self.generateResultsViewer(caserun)
+                with self._viewLock(), timer.stage("viewer"):
+                    self.generateResultsViewer(caserun)
                 logger.info("PIVOT TABLE DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
-                txtOut = txtOut + ("Pivot data preparation time {:0.2f}s;{}".format(time.time() - start_time, '\n'))
+                if Config.ARTIFACT_RETENTION != 'keep':
+                    with timer.stage("retention"):
+                        retention = Artifacts.retain(self.resPath)
             
             logger.info("MESSAGES DONE! --- %s seconds --- %s", time.time() - start_time, caserun)
-            txtOut = txtOut + ("Message preparation time {:0.2f}s;{}".format(time.time() - start_time, '\n'))
+            runStatus = statusFlag
             return {
                 "cbc_message": cbc_out.stdout if cbc_out else None,
                 "cbc_stdmsg": cbc_out.stderr if cbc_out else None,
                 "glpk_message": glpk_out.stdout if glpk_out else None,
                 "glpk_stdmsg": glpk_out.stderr if glpk_out else None,
-                "timer": customMsg,
+                "timer": result.message,
                 "status_code": statusFlag,
                 "caserun": caserun,
+                "solverResult": result.toDict(),
+                "solverOptions": profile,
+                "solverStats": stats,
+                "retention": retention,
+                "timings": self.saveTimings(timer, stats, result),
+            }
+
+        except RunCancelled:
+            logger.info("Run %s of %s was cancelled", caserun, self.case)
+            runStatus = "cancelled"
+            return {
+                "cbc_message": cbc_out.stdout if cbc_out else None,
+                "cbc_stdmsg": cbc_out.stderr if cbc_out else None,
+                "glpk_message": glpk_out.stdout if glpk_out else None,
+                "glpk_stdmsg": glpk_out.stderr if glpk_out else None,
+                "timer": self.stoppedMessage("cancelled"),
+                "status_code": "error",
+                "stopped": "cancelled",
+                "caserun": caserun,
+                "timings": self.saveTimings(timer),
             }
 
         except Exception as ex:
             logger.exception("Unhandled exception during solver execution")
             raise
         finally:
+            admission.close()
+            progress.finish(runStatus)
+            Metrics.RUN_QUEUE.dec()
             if lock:
                 lock.release()
 
@@ -2869,7 +3120,7 @@ class DataFile(Osemosys):
 
                                 viewGroupPath = Path(Config.DATA_STORAGE,self.case,'view', paramobj['group']+ '.json')
                                 if viewGroupPath.is_file():
-                                    viewData = File.readFile(viewGroupPath)
+                                    viewData = Storage.readFile(viewGroupPath)
                                 else:
                                     viewData = {}
 
@@ -2888,7 +3139,7 @@ class DataFile(Osemosys):
                                         tmp['ObjectiveValue'] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RT':
                                     tmp = {}
@@ -2896,7 +3147,7 @@ class DataFile(Osemosys):
                                         tmp[ obj['t']] =obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RY':
                                     tmp = {}
@@ -2904,7 +3155,7 @@ class DataFile(Osemosys):
                                         tmp[ obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RYT':
                                     tech = jsondata[0]['t']
@@ -2921,7 +3172,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)  
+                                    Storage.writeFile( viewData, path)  
 
                                 if paramobj['group'] == 'RYCn':
                                     con = jsondata[0]['cn']
@@ -2938,7 +3189,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)  
+                                    Storage.writeFile( viewData, path)  
 
                                 if paramobj['group'] == 'RYC':
                                     comm = jsondata[0]['f']
@@ -2955,7 +3206,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path) 
+                                    Storage.writeFile( viewData, path) 
 
                                 if paramobj['group'] == 'RYE':
                                     emi = jsondata[0]['e']
@@ -2972,7 +3223,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)  
+                                    Storage.writeFile( viewData, path)  
 
                                 if paramobj['group'] == 'RYS':
                                     stg = jsondata[0]['s']
@@ -2989,7 +3240,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path) 
+                                    Storage.writeFile( viewData, path) 
 
                                 if paramobj['group'] == 'RYTM':
                                     tech = jsondata[0]['t']
@@ -3010,7 +3261,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RYTC':
                                     tech = jsondata[0]['t']
@@ -3031,7 +3282,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RYTE':
                                     tech = jsondata[0]['t']
@@ -3052,7 +3303,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RYTTs':
                                     tech = jsondata[0]['t']
@@ -3073,7 +3324,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RYCTs':
                                     comm = jsondata[0]['f']
@@ -3094,7 +3345,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RYTEM':
                                     tech = jsondata[0]['t']
@@ -3119,7 +3370,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 if paramobj['group'] == 'RYTCTs':
                                     tech = jsondata[0]['t']
@@ -3144,7 +3395,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
 
                                 # ne postoje vise varijable za ovaj dio Production By tecnology, Use By technology
                                 if paramobj['group'] == 'RYTMTs':
@@ -3170,7 +3421,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
                             
                                 # ne koristi se jer smo izbrisali variajablu ROUBTBM Rate Of Use By Technology By Mode
                                 #ponovo koristimo jer korisitmo Production By Technology by Mode, Use By Technology By Mode (isto i sa Rate of...)
@@ -3201,7 +3452,7 @@ class DataFile(Osemosys):
                                             tmp[obj['y']] = obj[param]
                                     viewData[paramobj['id']][caserunname].append(tmp)
                                     path = Path(self.viewFolderPath, paramobj['group']+'.json')
-                                    File.writeFile( viewData, path)
+                                    Storage.writeFile( viewData, path)
                                 
                                 break
 
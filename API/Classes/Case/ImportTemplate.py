@@ -1,15 +1,16 @@
 from pathlib import Path
 import pandas as pd
 import string, random, json, os.path, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from Classes.Base import Config
 from Classes.Case.CaseClass import Case
-from Classes.Base.FileClass import File
+from Classes.Base.StorageClass import Storage
 
 class ImportTemplate():
     def __init__(self,template):
-        self.PARAMETERS = File.readParamFile(Path(Config.DATA_STORAGE, 'Parameters.json'))
-        self.VARIABLES = File.readParamFile(Path(Config.DATA_STORAGE, 'Variables.json'))
+        self.PARAMETERS = Storage.readParamFile(Path(Config.DATA_STORAGE, 'Parameters.json'))
+        self.VARIABLES = Storage.readParamFile(Path(Config.DATA_STORAGE, 'Variables.json'))
         self.TEMPLATE_PATH = Path(Config.DATA_STORAGE, template)
 
     def getTechById(self, techs):
@@ -454,6 +455,238 @@ class ImportTemplate():
             outObj[tech][stg][mod] = val
         return outObj
     
+    def importGroup(self, key, array, casename, df_sheet_all, names, start_time):
+        #jedna grupa parametara, cita sheets iz xls i upisuje jedan group json file
+        techName, commName, emiName, tsName, stgName = names
+        xlsObject = {}
+        txtOut = ""
+        print(key + ' PARAM')
+        #procitaj json file koji odgovara xls objektu i updatuj podatke
+        path = Path(Config.DATA_STORAGE,casename, key +'.json')
+        jsonData = Storage.readFile(path)                            
+
+        for a in array:
+            txtOut = txtOut + ("Parameter {} done in  --- {} seconds ---{}".format(a['value'], time.time() - start_time, '\n'))
+            #moramo izbaciti spaces iz naziva parama
+            sheet_name = a['value'].replace(" ", "")
+
+            #ovi su problem jer nisu jednoznacni kad se skrate na 31 char, poseban slucaj
+            if sheet_name == 'TotalTechnologyModelPeriodActivityUpperLimit':
+                sheet_name = 'TotalTechnologyPeriodActivityUp'
+            if sheet_name == 'TotalTechnologyModelPeriodActivityLowerLimit':
+                sheet_name = 'TotalTechnologyPeriodActivityLo'
+
+            #max duzina sheet name tako da vse moramo skratit na 31 da bi procitali iz xls sheets
+            if len(sheet_name)>31:
+                sheet_name = sheet_name[0:31]
+
+            #procitaj podatke iz xls
+            if sheet_name in df_sheet_all:
+                print('sheet_name ', sheet_name)
+                #ako ima podataka u xls napravi bjekat od xls podataka
+                xls = df_sheet_all[sheet_name]
+                xlsData = xls.to_json(orient='records', indent=2)
+                xlsArray = json.loads(xlsData)
+
+                if key == 'R':
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refR(xlsArray)
+                    xlsObject[key] = self.refR(xlsArray)
+                    jsonData[a['id']]['SC_0'][0]['value'] = xlsObject[key]['RE1']
+
+                if key == 'RT':
+                    xlsObject[key] = self.refRT(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRT(xlsArray)
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for tech, val in el.items():
+                                t = techName[tech] 
+                                if t in xlsObject[key]:
+                                    el[tech] = xlsObject[key][t]
+
+                if key == 'RE':
+                    xlsObject[key] = self.refRE(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRE(xlsArray)
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for emi, val in el.items():
+                                e = emiName[emi] 
+                                if e in xlsObject[key]:
+                                    el[emi] = xlsObject[key][e]
+
+                if key == 'RS':
+                    xlsObject[key] = self.refRS(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRS(xlsArray)
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for stg, val in el.items():
+                                e = stgName[stg] 
+                                if e in xlsObject[key]:
+                                    el[stg] = xlsObject[key][e]
+
+                if key == 'RY':
+                    xlsObject[key] = self.refRY(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRY(xlsArray)
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for yr, val in el.items():
+                                if int(yr) in xlsObject[key]:
+                                    el[yr] = xlsObject[key][int(yr)]
+
+                if key == 'RYT':
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for arr in xlsArray:
+                                if arr['TECHNOLOGY'] == techName[el['TechId']]:
+                                    for yr, val in el.items():
+                                        if yr != 'TechId':
+                                            el[yr] = arr[yr]
+                                    break
+                    #Storage.writeFile( jsonData, path)
+
+                if key == 'RYC':
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for arr in xlsArray:
+                                if arr['FUEL'] == commName[el['CommId']]:
+                                    for yr, val in el.items():
+                                        if yr != 'CommId':
+                                            el[yr] = arr[yr]
+                                    break
+                    #Storage.writeFile( jsonData, path)
+
+                if key == 'RYE':
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for arr in xlsArray:
+                                if arr['EMISSION'] == emiName[el['EmisId']]:
+                                    for yr, val in el.items():
+                                        if yr != 'EmisId':
+                                            el[yr] = arr[yr]
+                                    break
+                    #Storage.writeFile( jsonData, path)
+
+                if key == 'RYS':
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for arr in xlsArray:
+                                if arr['STORAGE'] == stgName[el['StgId']]:
+                                    for yr, val in el.items():
+                                        if yr != 'StgId':
+                                            el[yr] = arr[yr]
+                                    break
+
+                if key == 'RYTs':
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            for arr in xlsArray:
+                                # if arr['TIMESLICE'] == el['YearSplit']:
+                                if arr['TIMESLICE'] == tsName[el['TsId']]:
+                                    for yr, val in el.items():
+                                        if yr != 'TsId':
+                                            if str(arr['YEAR']) == yr:
+                                                el[yr] = arr['VALUE']
+                                                break
+
+                if key == 'RYTCM':
+                    xlsObject[key] = self.refRYTCM(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRYTCM(xlsArray)
+
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            t = techName[el['TechId']] 
+                            c = commName[el['CommId']]
+                            m = el['MoId']
+                            if t in xlsObject[key]:
+                                if c in xlsObject[key][t]:
+                                    if m in xlsObject[key][t][c]:
+                                        for yr, val in el.items():
+                                            if yr != 'TechId' and yr != 'CommId' and yr != 'MoId':
+                                                el[yr] = xlsObject[key][t][c][m][yr]
+
+                if key == 'RYTEM':
+                    xlsObject[key] = self.refRYTEM(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRYTEM(xlsArray)
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            t = techName[el['TechId']] 
+                            e = emiName[el['EmisId']]
+                            m = el['MoId']
+                            if t in xlsObject[key]:
+                                if e in xlsObject[key][t]:
+                                    if m in xlsObject[key][t][e]:
+                                        for yr, val in el.items():
+                                            if yr != 'TechId' and yr != 'EmisId' and yr != 'MoId':
+                                                el[yr] = xlsObject[key][t][e][m][yr]
+
+                if key == 'RTSM':
+                    xlsObject[key] = self.refRTSM(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRTSM(xlsArray)
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            t = techName[el['TechId']] 
+                            s = stgName[el['StgId']]
+                            m = el['MoId']
+                            if t in xlsObject[key]:
+                                if s in xlsObject[key][t]:
+                                    if m in xlsObject[key][t][s]:
+                                        el['Value'] = xlsObject[key][t][s][m]
+
+                if key == 'RYTM':
+                    xlsObject[key] = self.refRYTM(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRYTM(xlsArray)
+
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            t = techName[el['TechId']] 
+                            m = el['MoId']
+                            if t in xlsObject[key]:
+                                if m in xlsObject[key][t]:
+                                    for yr, val in el.items():
+                                        if yr != 'TechId' and yr != 'MoId':
+                                            el[yr] = xlsObject[key][t][m][yr]
+
+                if key == 'RYTTs':
+                    xlsObject[key] = self.refRYTTs(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRYTTs(xlsArray)
+
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            t = techName[el['TechId']] 
+                            ts = tsName[el['TsId']]
+                            if t in xlsObject[key]:
+                                if ts in xlsObject[key][t]:
+                                    for yr, val in el.items():
+                                        if yr != 'TechId' and yr != 'TsId':
+                                            el[yr] = xlsObject[key][t][ts][yr]
+
+                if key == 'RYCTs':
+                    xlsObject[key] = self.refRYCTs(xlsArray)
+                    # if key not in xlsObject:
+                    #     xlsObject[key] = self.refRYCTs(xlsArray)
+                    for sc, obj in jsonData[a['id']].items():
+                        for el in obj:
+                            c = commName[el['CommId']] 
+                            ts = tsName[el['TsId']]
+                            if c in xlsObject[key]:
+                                if ts in xlsObject[key][c]:
+                                    for yr, val in el.items():
+                                        if yr != 'CommId' and yr != 'TsId':
+                                            el[yr] = xlsObject[key][c][ts][yr]
+
+        Storage.writeFile( jsonData, path)
+        txtOut = txtOut + ("Group {} done in --- {} seconds ---{}".format(key, time.time() - start_time, '\n'))
+        return txtOut
+
     def importProcess(self, data):
         try:
             print('IMPORT STARTED!')
@@ -464,6 +697,8 @@ class ImportTemplate():
             version = data['osy-version']
             description = data['osy-desc']
             date = data['osy-date']
+            parallel = data.get('osy-parallel', Config.IMPORT_PARALLEL)
+            workers = Config.IMPORT_WORKERS
             data = data['osy-data']
             tgArray = []
             txtOut = ""
@@ -827,7 +1062,7 @@ class ImportTemplate():
                 os.makedirs(Path(Config.DATA_STORAGE,casename))
 
             genDataPath = Path( Config.DATA_STORAGE,casename, "genData.json")
-            File.writeFile(genData, genDataPath)
+            Storage.writeFile(genData, genDataPath)
 
             case = Case(casename, genData)
             case.createCase()  
@@ -843,18 +1078,16 @@ class ImportTemplate():
                 resData = {
                     "osy-cases":[]
                 }
-                File.writeFile( resData, resDataPath)
+                Storage.writeFile( resData, resDataPath)
                 viewData = {
                     "osy-views": viewDef
                 }
-                File.writeFile( viewData, viewDataPath)
+                Storage.writeFile( viewData, viewDataPath)
 
             print('MODEL STRUCTURE FINISHED!')
             print("--- %s seconds ---" % (time.time() - start_time))
             txtOut = txtOut + ("Model structure finished in --- {} seconds ---{}".format(time.time() - start_time, '\n'))
 
-            xlsObject = {}
-            
             if data:
                 techName = self.getTechById(techs)
                 commName = self.getCommById(comms)
@@ -862,232 +1095,18 @@ class ImportTemplate():
                 tsName = self.getTsById(timeslices)
                 stgName = self.getStgById(stgs)
 
-                for key, array in self.PARAMETERS.items():
-                    if key != 'R__':
-                        print(key + ' PARAM')
-                        #procitaj json file koji odgovara xls objektu i updatuj podatke
-                        path = Path(Config.DATA_STORAGE,casename, key +'.json')
-                        jsonData = File.readFile(path)                            
-
-                        for a in array:
-                            txtOut = txtOut + ("Parameter {} done in  --- {} seconds ---{}".format(a['value'], time.time() - start_time, '\n'))
-                            #moramo izbaciti spaces iz naziva parama
-                            sheet_name = a['value'].replace(" ", "")
-
-                            #ovi su problem jer nisu jednoznacni kad se skrate na 31 char, poseban slucaj
-                            if sheet_name == 'TotalTechnologyModelPeriodActivityUpperLimit':
-                                sheet_name = 'TotalTechnologyPeriodActivityUp'
-                            if sheet_name == 'TotalTechnologyModelPeriodActivityLowerLimit':
-                                sheet_name = 'TotalTechnologyPeriodActivityLo'
-
-                            #max duzina sheet name tako da vse moramo skratit na 31 da bi procitali iz xls sheets
-                            if len(sheet_name)>31:
-                                sheet_name = sheet_name[0:31]
-                                
-                            #procitaj podatke iz xls
-                            if sheet_name in df_sheet_all:
-                                print('sheet_name ', sheet_name)
-                                #ako ima podataka u xls napravi bjekat od xls podataka
-                                xls = df_sheet_all[sheet_name]
-                                xlsData = xls.to_json(orient='records', indent=2)
-                                xlsArray = json.loads(xlsData)
-
-                                if key == 'R':
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refR(xlsArray)
-                                    xlsObject[key] = self.refR(xlsArray)
-                                    jsonData[a['id']]['SC_0'][0]['value'] = xlsObject[key]['RE1']
-
-                                if key == 'RT':
-                                    xlsObject[key] = self.refRT(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRT(xlsArray)
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for tech, val in el.items():
-                                                t = techName[tech] 
-                                                if t in xlsObject[key]:
-                                                    el[tech] = xlsObject[key][t]
-
-                                if key == 'RE':
-                                    xlsObject[key] = self.refRE(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRE(xlsArray)
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for emi, val in el.items():
-                                                e = emiName[emi] 
-                                                if e in xlsObject[key]:
-                                                    el[emi] = xlsObject[key][e]
-
-                                if key == 'RS':
-                                    xlsObject[key] = self.refRS(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRS(xlsArray)
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for stg, val in el.items():
-                                                e = stgName[stg] 
-                                                if e in xlsObject[key]:
-                                                    el[stg] = xlsObject[key][e]
-
-                                if key == 'RY':
-                                    xlsObject[key] = self.refRY(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRY(xlsArray)
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for yr, val in el.items():
-                                                if int(yr) in xlsObject[key]:
-                                                    el[yr] = xlsObject[key][int(yr)]
-
-                                if key == 'RYT':
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for arr in xlsArray:
-                                                if arr['TECHNOLOGY'] == techName[el['TechId']]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'TechId':
-                                                            el[yr] = arr[yr]
-                                                    break
-                                    #File.writeFile( jsonData, path)
-
-                                if key == 'RYC':
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for arr in xlsArray:
-                                                if arr['FUEL'] == commName[el['CommId']]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'CommId':
-                                                            el[yr] = arr[yr]
-                                                    break
-                                    #File.writeFile( jsonData, path)
-                
-                                if key == 'RYE':
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for arr in xlsArray:
-                                                if arr['EMISSION'] == emiName[el['EmisId']]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'EmisId':
-                                                            el[yr] = arr[yr]
-                                                    break
-                                    #File.writeFile( jsonData, path)
-
-                                if key == 'RYS':
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for arr in xlsArray:
-                                                if arr['STORAGE'] == stgName[el['StgId']]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'StgId':
-                                                            el[yr] = arr[yr]
-                                                    break
-
-                                if key == 'RYTs':
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            for arr in xlsArray:
-                                                # if arr['TIMESLICE'] == el['YearSplit']:
-                                                if arr['TIMESLICE'] == tsName[el['TsId']]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'TsId':
-                                                            if str(arr['YEAR']) == yr:
-                                                                el[yr] = arr['VALUE']
-                                                                break
-
-                                if key == 'RYTCM':
-                                    xlsObject[key] = self.refRYTCM(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRYTCM(xlsArray)
-
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            t = techName[el['TechId']] 
-                                            c = commName[el['CommId']]
-                                            m = el['MoId']
-                                            if t in xlsObject[key]:
-                                                if c in xlsObject[key][t]:
-                                                    if m in xlsObject[key][t][c]:
-                                                        for yr, val in el.items():
-                                                            if yr != 'TechId' and yr != 'CommId' and yr != 'MoId':
-                                                                el[yr] = xlsObject[key][t][c][m][yr]
-
-                                if key == 'RYTEM':
-                                    xlsObject[key] = self.refRYTEM(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRYTEM(xlsArray)
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            t = techName[el['TechId']] 
-                                            e = emiName[el['EmisId']]
-                                            m = el['MoId']
-                                            if t in xlsObject[key]:
-                                                if e in xlsObject[key][t]:
-                                                    if m in xlsObject[key][t][e]:
-                                                        for yr, val in el.items():
-                                                            if yr != 'TechId' and yr != 'EmisId' and yr != 'MoId':
-                                                                el[yr] = xlsObject[key][t][e][m][yr]
-
-                                if key == 'RTSM':
-                                    xlsObject[key] = self.refRTSM(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRTSM(xlsArray)
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            t = techName[el['TechId']] 
-                                            s = stgName[el['StgId']]
-                                            m = el['MoId']
-                                            if t in xlsObject[key]:
-                                                if s in xlsObject[key][t]:
-                                                    if m in xlsObject[key][t][s]:
-                                                        el['Value'] = xlsObject[key][t][s][m]
-
-                                if key == 'RYTM':
-                                    xlsObject[key] = self.refRYTM(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRYTM(xlsArray)
-         
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            t = techName[el['TechId']] 
-                                            m = el['MoId']
-                                            if t in xlsObject[key]:
-                                                if m in xlsObject[key][t]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'TechId' and yr != 'MoId':
-                                                            el[yr] = xlsObject[key][t][m][yr]
-
-                                if key == 'RYTTs':
-                                    xlsObject[key] = self.refRYTTs(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRYTTs(xlsArray)
-
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            t = techName[el['TechId']] 
-                                            ts = tsName[el['TsId']]
-                                            if t in xlsObject[key]:
-                                                if ts in xlsObject[key][t]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'TechId' and yr != 'TsId':
-                                                            el[yr] = xlsObject[key][t][ts][yr]
-                            
-                                if key == 'RYCTs':
-                                    xlsObject[key] = self.refRYCTs(xlsArray)
-                                    # if key not in xlsObject:
-                                    #     xlsObject[key] = self.refRYCTs(xlsArray)
-                                    for sc, obj in jsonData[a['id']].items():
-                                        for el in obj:
-                                            c = commName[el['CommId']] 
-                                            ts = tsName[el['TsId']]
-                                            if c in xlsObject[key]:
-                                                if ts in xlsObject[key][c]:
-                                                    for yr, val in el.items():
-                                                        if yr != 'CommId' and yr != 'TsId':
-                                                            el[yr] = xlsObject[key][c][ts][yr]
-
-                        File.writeFile( jsonData, path)
+                names = (techName, commName, emiName, tsName, stgName)
+                groups = [(key, array) for key, array in self.PARAMETERS.items() if key != 'R__']
+
+                if parallel and workers > 1:
+                    #grupe su nezavisne kad je genData gotov, svaki worker upisuje svoj group json
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = {executor.submit(self.importGroup, key, array, casename, df_sheet_all, names, start_time): key for key, array in groups}
+                        for future in as_completed(futures):
+                            txtOut = txtOut + future.result()
+                else:
+                    for key, array in groups:
+                        txtOut = txtOut + self.importGroup(key, array, casename, df_sheet_all, names, start_time)
 
             os.remove(self.TEMPLATE_PATH)
             print('IMPOERT FINISHED WITH DATA!')
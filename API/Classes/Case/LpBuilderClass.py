@@ -0,0 +1,1002 @@
+import re, gzip, hashlib, logging
+from pathlib import Path
+import numpy as np
+
+from Classes.Base import Config
+
+logger = logging.getLogger(__name__)
+
+class GmplData():
+    """
+    Parser of the GMPL data section written by DataFile.preprocessData (data_processed.txt).
+
+    Supports the statements the data file uses: plain and indexed sets (elements and (m, t) tuples),
+    params in list form, tabular form (param P default d : cols := rows) and slices ([RE1,T0,*,*]:)
+    followed by a table. Values are kept as strings, params as {key tuple: float}.
+    """
+    TOKEN = re.compile(r"#[^\n]*|/\*.*?\*/|:=|[;:\[\]\(\),*]|[^\s;:\[\]\(\),*#]+", re.S)
+
+    def __init__(self, text, dims):
+        #dims {param: broj indeksa}, potrebno za list format bez slice
+        self.dims = dims
+        self.sets = {}
+        self.indexedSets = {}
+        self.params = {}
+        self.defaults = {}
+        self.tokens = [t for t in GmplData.TOKEN.findall(text) if t[0] != '#' and not t.startswith('/*')]
+        self.pos = 0
+        self.parse()
+
+    @staticmethod
+    def read(path, dims):
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return GmplData(f.read(), dims)
+
+    def next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def expect(self, token):
+        found = self.next()
+        if found != token:
+            raise ValueError("GMPL data: expected '{}', found '{}'".format(token, found))
+
+    @staticmethod
+    def number(token):
+        try:
+            return float(token)
+        except ValueError:
+            raise ValueError("GMPL data: numeric value expected, found '{}'".format(token))
+
+    def parse(self):
+        while self.peek() is not None:
+            token = self.next()
+            if token == 'end':
+                break
+            if token == 'data':
+                self.expect(';')
+            elif token == 'set':
+                self.parseSet()
+            elif token == 'param':
+                self.parseParam()
+            elif token != ';':
+                raise ValueError("GMPL data: unexpected '{}'".format(token))
+
+    def parseSet(self):
+        name = self.next()
+        key = None
+        if self.peek() == '[':
+            self.next()
+            key = []
+            while self.peek() != ']':
+                token = self.next()
+                if token != ',':
+                    key.append(token)
+            self.next()
+            key = tuple(key) if len(key) > 1 else key[0]
+        self.expect(':=')
+        elements = []
+        while self.peek() != ';':
+            token = self.next()
+            if token == ',':
+                continue
+            if token == '(':
+                item = []
+                while self.peek() != ')':
+                    token = self.next()
+                    if token != ',':
+                        item.append(token)
+                self.next()
+                elements.append(tuple(item))
+            else:
+                elements.append(token)
+        self.next()
+        if key is None:
+            self.sets[name] = elements
+        else:
+            self.indexedSets.setdefault(name, {})[key] = elements
+
+    def parseParam(self):
+        name = self.next()
+        values = self.params.setdefault(name, {})
+        if self.peek() == 'default':
+            self.next()
+            self.defaults[name] = GmplData.number(self.next())
+        dim = self.dims.get(name)
+        template = None
+        if self.peek() == ':=':
+            self.next()
+        while self.peek() != ';':
+            token = self.next()
+            if token == '[':
+                template = []
+                while self.peek() != ']':
+                    token = self.next()
+                    if token != ',':
+                        template.append(token)
+                self.next()
+            elif token == ':':
+                columns = []
+                while self.peek() != ':=':
+                    columns.append(self.next())
+                self.next()
+                self.parseTable(values, template, columns)
+            else:
+                #list format, indeksi pa vrijednost
+                free = template.count('*') if template else dim
+                if free is None:
+                    raise ValueError("GMPL data: unknown param {}".format(name))
+                items = [token] + [self.next() for _ in range(free)]
+                key = self.fill(template, items[:-1]) if template else tuple(items[:-1])
+                if items[-1] != '.':
+                    values[key] = GmplData.number(items[-1])
+        self.next()
+
+    @staticmethod
+    def fill(template, items):
+        items = iter(items)
+        return tuple(next(items) if t == '*' else t for t in template)
+
+    def parseTable(self, values, template, columns):
+        #redovi tabele do ';', novog slice '[' ili nove tabele ':'
+        while self.peek() not in (';', '[', ':'):
+            row = self.next()
+            for column in columns:
+                value = self.next()
+                if value == '.':
+                    continue
+                key = self.fill(template, (row, column)) if template else (row, column)
+                values[key] = GmplData.number(value)
+
+class Sparse():
+    """Sparse factor of a coefficient, named axes with index arrays and values (COO)."""
+
+    def __init__(self, axes, index, values):
+        self.axes = axes
+        self.index = index
+        self.values = values
+
+    @staticmethod
+    def dense(array, axes):
+        array = np.asarray(array, dtype=float)
+        nonzero = np.nonzero(array)
+        return Sparse(axes, dict(zip(axes, nonzero)), array[nonzero])
+
+    def __len__(self):
+        return len(self.values)
+
+    def join(self, other, sizes):
+        """Product of two factors, pairs of entries with equal indices on the shared axes."""
+        shared = [a for a in other.axes if a in self.axes]
+        if shared:
+            dims = [sizes[a] for a in shared]
+            left = np.ravel_multi_index([self.index[a] for a in shared], dims)
+            right = np.ravel_multi_index([other.index[a] for a in shared], dims)
+        else:
+            left = np.zeros(len(self), dtype=np.int64)
+            right = np.zeros(len(other), dtype=np.int64)
+        order = np.argsort(right, kind='stable')
+        right = right[order]
+        lo = np.searchsorted(right, left, 'left')
+        count = np.searchsorted(right, left, 'right') - lo
+        total = int(count.sum())
+        li = np.repeat(np.arange(len(self)), count)
+        offsets = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+        ri = order[np.repeat(lo, count) + offsets]
+        index = {a: i[li] for a, i in self.index.items()}
+        axes = self.axes
+        for a in other.axes:
+            if a not in self.axes:
+                index[a] = other.index[a][ri]
+                axes += a
+        return Sparse(axes, index, self.values[li] * other.values[ri])
+
+class LpBuilder():
+    """
+    Native builder of the LP problem of model.v.5.4.txt, replaces glpsol --check --wlp.
+
+    Parameters and sets are read from data_processed.txt, every constraint family of the model is
+    assembled as COO triplets (row, column, coefficient) with NumPy: a coefficient is a product of
+    sparse factors joined on shared index axes, so the work follows the nonzeros and not the dense
+    index space. The LP file follows glpk conventions so CBC results keep the glpsol names
+    (Var(i,j,..), Constraint(i,j,..)): constants are moved to the right hand side, zero terms are
+    dropped, only columns with a nonzero coefficient exist, free columns are listed in Bounds and
+    integer columns in Generals. Data the builder can not reproduce raises ValueError, the caller
+    falls back to glpsol.
+    """
+    MODEL = 'model.v.5.4.txt'
+    #digest modela bez komentara i razmaka, druga verzija modela ide preko glpsol
+    MODEL_DIGEST = '2a89e37f8e36cd36e5bef712cbf845e7'
+
+    AXES = {
+        'r': 'REGION', 'R': 'REGION', 't': 'TECHNOLOGY', 'f': 'COMMODITY', 'e': 'EMISSION',
+        'm': 'MODE_OF_OPERATION', 'y': 'YEAR', 'Y': 'YEAR', 'l': 'TIMESLICE', 's': 'STORAGE',
+        'a': 'SEASON', 'A': 'SEASON', 'd': 'DAYTYPE', 'D': 'DAYTYPE', 'h': 'DAILYTIMEBRACKET',
+        'H': 'DAILYTIMEBRACKET', 'u': 'UDC'
+    }
+
+    #param: indeksi po redoslijedu iz modela
+    PARAMS = {
+        'AccumulatedAnnualDemand': 'rfy', 'AnnualEmissionLimit': 'rey', 'AvailabilityFactor': 'rty',
+        'CapacityFactor': 'rtly', 'CapacityOfOneTechnologyUnit': 'rty', 'CapacityToActivityUnit': 'rt',
+        'CapitalCost': 'rty', 'DiscountRate': 'r', 'DiscountRateIdv': 'rt', 'EmissionActivityRatio': 'rtemy',
+        'EmissionsPenalty': 'rey', 'FixedCost': 'rty', 'InputActivityRatio': 'rtfmy',
+        'InputToNewCapacityRatio': 'rtfy', 'InputToTotalCapacityRatio': 'rtfy', 'ModelPeriodEmissionLimit': 're',
+        'ModelPeriodExogenousEmission': 're', 'OperationalLife': 'rt', 'OutputActivityRatio': 'rtfmy',
+        'ResidualCapacity': 'rty', 'SpecifiedAnnualDemand': 'rfy', 'SpecifiedDemandProfile': 'rfly',
+        'TechnologyActivityByModeLowerLimit': 'rtmy', 'TechnologyActivityByModeUpperLimit': 'rtmy',
+        'TechnologyActivityDecreaseByModeLimit': 'rtmy', 'TechnologyActivityIncreaseByModeLimit': 'rtmy',
+        'TotalAnnualMaxCapacity': 'rty', 'TotalAnnualMaxCapacityInvestment': 'rty', 'TotalAnnualMinCapacity': 'rty',
+        'TotalAnnualMinCapacityInvestment': 'rty', 'TotalTechnologyAnnualActivityLowerLimit': 'rty',
+        'TotalTechnologyAnnualActivityUpperLimit': 'rty', 'TotalTechnologyModelPeriodActivityLowerLimit': 'rt',
+        'TotalTechnologyModelPeriodActivityUpperLimit': 'rt', 'TradeRoute': 'rRfy', 'VariableCost': 'rtmy',
+        'YearSplit': 'ly', 'EmissionToActivityChangeRatio': 'rtemy', 'UDCMultiplierTotalCapacity': 'rtuy',
+        'UDCMultiplierNewCapacity': 'rtuy', 'UDCMultiplierActivity': 'rtuy', 'UDCConstant': 'ruy', 'UDCTag': 'ru',
+        'CapitalRecoveryFactor': 'rt', 'PvAnnuity': 'rt', 'OperationalLifeStorage': 'rs', 'CapitalCostStorage': 'rsy',
+        'ResidualStorageCapacity': 'rsy', 'TechnologyToStorage': 'rtsm', 'TechnologyFromStorage': 'rtsm',
+        'StorageLevelStart': 'rs', 'MinStorageCharge': 'rsy', 'Conversionls': 'la', 'Conversionld': 'ld',
+        'Conversionlh': 'lh', 'DaySplit': 'hy', 'DaysInDayType': 'ady'
+    }
+
+    #varijable po redoslijedu deklaracije, to je i redoslijed kolona
+    VARIABLES = (
+        ('AccumulatedNewCapacity', 'rty', None), ('AnnualFixedOperatingCost', 'rty', None),
+        ('AnnualTechnologyEmission', 'rtey', 'free'), ('AnnualTechnologyEmissionByMode', 'rtemy', 'free'),
+        ('AnnualVariableOperatingCost', 'rty', 'free'), ('CapitalInvestment', 'rty', None),
+        ('Demand', 'rlfy', None), ('DiscountedSalvageValue', 'rty', None),
+        ('InputToNewCapacity', 'rtfy', None), ('InputToTotalCapacity', 'rtfy', None),
+        ('NewCapacity', 'rty', None), ('NumberOfNewTechnologyUnits', 'rty', 'integer'),
+        ('ProductionByTechnology', 'rltfy', None), ('RateOfActivity', 'rltmy', None),
+        ('RateOfTotalActivity', 'rtly', None), ('SalvageValue', 'rty', None),
+        ('TotalAnnualTechnologyActivityByMode', 'rtmy', None), ('TotalCapacityAnnual', 'rty', None),
+        ('TotalTechnologyAnnualActivity', 'rty', None), ('TotalTechnologyModelPeriodActivity', 'rt', 'free'),
+        ('Trade', 'rRlfy', 'free'), ('EmissionByActivityChange', 'rtemy', 'free'),
+        ('TechnologyEmissionsPenalty', 'rty', 'free'), ('NewStorageCapacity', 'rsy', None),
+        ('SalvageValueStorage', 'rsy', None), ('StorageLevelYearStart', 'rsy', None),
+        ('StorageLevelYearFinish', 'rsy', None), ('StorageLevelSeasonStart', 'rsay', None),
+        ('StorageLevelDayTypeStart', 'rsady', None), ('StorageLevelDayTypeFinish', 'rsady', None),
+        ('RateOfNetStorageActivity', 'rsadhy', 'free'), ('NetChargeWithinYear', 'rsadhy', 'free'),
+        ('NetChargeWithinDay', 'rsadhy', 'free'), ('StorageLowerLimit', 'rsy', None),
+        ('StorageUpperLimit', 'rsy', None), ('AccumulatedNewStorageCapacity', 'rsy', None),
+        ('CapitalInvestmentStorage', 'rsy', None), ('DiscountedCapitalInvestmentStorage', 'rsy', None),
+        ('DiscountedSalvageValueStorage', 'rsy', None), ('TotalDiscountedStorageCost', 'rsy', None)
+    )
+
+    NAME = re.compile(r'^[A-Za-z0-9_.]+$')
+    WRAP = 72
+    #dijelovi linija LP fajla koji se skupe prije upisa u fajl
+    WRITE_BATCH = 16384
+
+    def __init__(self, dataFile, problem='model'):
+        self.problem = problem
+        self.data = GmplData.read(dataFile, {p: len(a) for p, a in LpBuilder.PARAMS.items()})
+        self.elements = {}
+        for axis, setName in LpBuilder.AXES.items():
+            if setName not in self.data.sets:
+                raise ValueError('Set {} is not defined in {}'.format(setName, dataFile))
+            self.elements[axis] = self.data.sets[setName]
+        for values in self.elements.values():
+            for value in values:
+                if not LpBuilder.NAME.match(value):
+                    raise ValueError('Set element {} needs quoting in GMPL'.format(value))
+        self.sizes = {a: len(v) for a, v in self.elements.items()}
+        self.positions = {a: {v: i for i, v in enumerate(values)} for a, values in self.elements.items()}
+        self.blocks = []
+        self.objective = None
+
+    @staticmethod
+    def modelDigest(modelFile):
+        text = Path(modelFile).read_text(encoding='utf-8', errors='replace')
+        text = re.sub(r'#[^\n]*|/\*.*?\*/|\s+', '', text, flags=re.S)
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def supports(modelFile):
+        return Path(modelFile).is_file() and LpBuilder.modelDigest(modelFile) == LpBuilder.MODEL_DIGEST
+
+    ########################################################################## data
+    def numeric(self, axis):
+        try:
+            return np.array([float(v) for v in self.elements[axis]])
+        except ValueError:
+            raise ValueError('Set {} has non numeric elements'.format(LpBuilder.AXES[axis]))
+
+    def shape(self, axes):
+        return tuple(self.sizes[a] for a in axes)
+
+    def param(self, name, axes=None):
+        """Dense array of a param, axes relabel the indices of the declaration (YEAR as 'Y'...)."""
+        declared = LpBuilder.PARAMS[name]
+        axes = axes or declared
+        if name not in self.data.params:
+            raise ValueError('Param {} is not defined in the data file'.format(name))
+        values = self.data.params[name]
+        default = self.data.defaults.get(name)
+        array = np.full(self.shape(axes), np.nan if default is None else default)
+        if values:
+            keys = list(values)
+            if any(len(k) != len(axes) for k in keys):
+                raise ValueError('Param {} has wrong number of indices'.format(name))
+            try:
+                index = tuple(np.fromiter((self.positions[a][k[i]] for k in keys), dtype=np.int64, count=len(keys))
+                              for i, a in enumerate(axes))
+            except KeyError as err:
+                raise ValueError('Param {}: {} out of domain'.format(name, err))
+            array[index] = np.fromiter(values.values(), dtype=float, count=len(keys))
+        if np.isnan(array).any():
+            raise ValueError('Param {} has no value for some indices and no default'.format(name))
+        return array
+
+    def setMask(self, name, keyAxis, axes):
+        """Indexed set of (m, t) tuples or elements as a 0/1 array, axes are key axis + element axes."""
+        mask = np.zeros(self.shape(keyAxis + axes))
+        for key, items in self.data.indexedSets.get(name, {}).items():
+            if key not in self.positions[keyAxis]:
+                raise ValueError('Set {}[{}] out of domain'.format(name, key))
+            k = self.positions[keyAxis][key]
+            for item in items:
+                item = item if isinstance(item, tuple) else (item,)
+                try:
+                    mask[(k,) + tuple(self.positions[a][v] for a, v in zip(axes, item))] = 1
+                except KeyError as err:
+                    raise ValueError('Set {}[{}]: {} out of domain'.format(name, key, err))
+        return mask
+
+    def member(self, name, axis):
+        mask = np.zeros(self.sizes[axis])
+        for item in self.data.sets.get(name, []):
+            if item not in self.positions[axis]:
+                raise ValueError('Set {}: {} out of domain'.format(name, item))
+            mask[self.positions[axis][item]] = 1
+        return mask
+
+    def previous(self, axis, alias):
+        """[x, X] 1 when X = x - 1, the first element has no previous (GMPL ls-1, ld-1)."""
+        values = self.numeric(axis)
+        prev = (values[:, None] - 1 == values[None, :]).astype(float)
+        first = values == values.min() if len(values) else values.astype(bool)
+        if len(values) and (prev.sum(axis=1) + first < 1).any():
+            raise ValueError('Set {} is not a sequence'.format(LpBuilder.AXES[axis]))
+        return prev, first.astype(float)
+
+    ########################################################################## assembly
+    def factors(self, items, axes):
+        #(array, axes) -> Sparse, pune ose bez faktora (sumiranje po cijelom setu)
+        factors = [Sparse.dense(a, ax) for a, ax in items]
+        covered = set(''.join(f.axes for f in factors))
+        for a in axes:
+            if a not in covered:
+                factors.append(Sparse.dense(np.ones(self.sizes[a]), a))
+                covered.add(a)
+        return factors
+
+    def product(self, factors):
+        #spajanje od najrjedjeg faktora, prednost imaju faktori sa zajednickim osama
+        factors = sorted(factors, key=len)
+        if not len(factors[0]):
+            return factors[0]
+        result = factors.pop(0)
+        while factors:
+            i = next((i for i, f in enumerate(factors) if set(f.axes) & set(result.axes)), 0)
+            result = result.join(factors.pop(i), self.sizes)
+            if not len(result):
+                break
+        return result
+
+    def rowIndex(self, table, axes):
+        if not axes:
+            return np.zeros(len(table), dtype=np.int64)
+        return np.ravel_multi_index([table.index[a] for a in axes], self.shape(axes))
+
+    def constraint(self, name, axes, sense, terms, const=(), mask=None):
+        """
+        One constraint family, rows over 'axes' where mask (array over axes) is nonzero.
+
+        terms are (variable, variable axes, [(array, axes)...]) with the coefficient as a product of
+        the arrays, summed over the axes not in the row. const are [(array, axes)...] products summed
+        the same way, the constant part of first - second of the GMPL constraint, rhs = -const.
+        """
+        size = int(np.prod(self.shape(axes))) if axes else 1
+        rowMask = np.ones(self.shape(axes)) if mask is None else np.broadcast_to(mask, self.shape(axes))
+        rowMask = np.asarray(rowMask != 0)
+        rows, cols, vals = [], [], []
+        for var, vaxes, items in terms:
+            offset, declared, domain = self.variables[var]
+            items = list(items) + ([(rowMask.astype(float), axes)] if axes else [])
+            if domain is not None:
+                items.append((domain[0], ''.join(dict(zip(declared, vaxes))[a] for a in domain[1])))
+            table = self.product(self.factors(items, axes + vaxes))
+            if not len(table):
+                continue
+            rows.append(self.rowIndex(table, axes))
+            cols.append(offset + np.ravel_multi_index([table.index[a] for a in vaxes], self.shape(vaxes)))
+            vals.append(table.values)
+        constant = np.zeros(size)
+        for items in const:
+            table = self.product(self.factors(list(items) + ([(rowMask.astype(float), axes)] if axes else []), axes))
+            if len(table):
+                constant += np.bincount(self.rowIndex(table, axes), weights=table.values, minlength=size)
+        block = {
+            "name": name,
+            "axes": axes,
+            "rows": np.flatnonzero(rowMask.ravel()) if axes else np.zeros(1 if rowMask else 0, dtype=np.int64),
+            "sense": sense,
+            "rhs": -constant,
+            "entries": (np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64),
+                        np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64),
+                        np.concatenate(vals) if vals else np.zeros(0))
+        }
+        if name == 'cost':
+            self.objective = block
+        else:
+            self.blocks.append(block)
+
+    def declare(self):
+        self.variables = {}
+        offset = 0
+        MT = self.setMask('MODEperTECHNOLOGY', 't', 'm')
+        domains = {'RateOfActivity': (MT, 'tm'), 'InputToNewCapacity': (self.PN, 'tf'), 'InputToTotalCapacity': (self.PT, 'tf')}
+        for var, axes, _ in LpBuilder.VARIABLES:
+            self.variables[var] = (offset, axes, domains.get(var))
+            offset += int(np.prod(self.shape(axes)))
+        self.columnCount = offset
+        return MT
+
+    ########################################################################## model
+    def build(self):
+        p = self.param
+        y = self.numeric('y')
+        if not len(y):
+            raise ValueError('Set YEAR is empty')
+        y0, yN = y.min(), y.max()
+        inputFuel = self.member('INPUTxFUEL', 'f')
+        self.PN = self.setMask('INPUTxNEWxCAPACITYperFUEL', 'f', 't').T * inputFuel[None, :]
+        self.PT = self.setMask('INPUTxTOTALxCAPACITYperFUEL', 'f', 't').T * inputFuel[None, :]
+        MT = self.declare()
+
+        FO = self.setMask('MODExTECHNOLOGYperFUELout', 'f', 'mt')
+        FI = self.setMask('MODExTECHNOLOGYperFUELin', 'f', 'mt')
+        EM = self.setMask('MODExTECHNOLOGYperEMISSION', 'e', 'mt')
+        EMC = self.setMask('MODExTECHNOLOGYperEMISSIONChange', 'e', 'mt')
+        TO = self.setMask('MODExTECHNOLOGYperSTORAGEto', 's', 'mt')
+        FROM = self.setMask('MODExTECHNOLOGYperSTORAGEfrom', 's', 'mt')
+
+        DR = p('DiscountRate')
+        OL = p('OperationalLife')
+        OLS = p('OperationalLifeStorage')
+        YS = p('YearSplit')
+        VC = p('VariableCost')
+        FC = p('FixedCost')
+        CC = p('CapitalCost')
+        CRF = p('CapitalRecoveryFactor')
+        PvA = p('PvAnnuity')
+        RES = p('ResidualCapacity')
+        CF = p('CapacityFactor')
+        CAU = p('CapacityToActivityUnit')
+        AF = p('AvailabilityFactor')
+        EAR = p('EmissionActivityRatio')
+        EP = p('EmissionsPenalty')
+        OAR = p('OutputActivityRatio')
+        IAR = p('InputActivityRatio')
+        TR = p('TradeRoute')
+        SAD = p('SpecifiedAnnualDemand')
+        SDP = p('SpecifiedDemandProfile')
+        AAD = p('AccumulatedAnnualDemand')
+        TTS = p('TechnologyToStorage')
+        TFS = p('TechnologyFromStorage')
+        Cls = p('Conversionls')
+        Cld = p('Conversionld')
+        Clh = p('Conversionlh')
+        DS = p('DaySplit')
+        DIDT = p('DaysInDayType')
+        MSC = p('MinStorageCharge')
+        RSC = p('ResidualStorageCapacity')
+        CCS = p('CapitalCostStorage')
+
+        #diskontni faktori [r,y]
+        disc05 = (1 + DR)[:, None] ** (y - y0 + 0.5)[None, :]
+        disc0 = (1 + DR)[:, None] ** (y - y0)[None, :]
+        #NewCapacity[yy] aktivan u y: y-yy < OperationalLife && y-yy >= 0, [r,t,y,Y]
+        age = y[:, None] - y[None, :]
+        W = ((age[None, None] < OL[:, :, None, None]) & (age[None, None] >= 0)).astype(float)
+        WS = ((age[None, None] < OLS[:, :, None, None]) & (age[None, None] >= 0)).astype(float)
+        shift = (age == 1).astype(float)
+        #TIMESLICEofSDB [l,a,d,h]
+        SDB = ((Cls == 1)[:, :, None, None] & (Cld == 1)[:, None, :, None] & (Clh == 1)[:, None, None, :]).astype(float)
+        C3 = Cls[:, :, None, None] * Cld[:, None, :, None] * Clh[:, None, None, :]
+        #neto punjenje skladista po (m,t) iz MODExTECHNOLOGYperSTORAGE, [r,s,t,m]
+        NF = TO.transpose(0, 2, 1)[None] * TTS.transpose(0, 2, 1, 3) - FROM.transpose(0, 2, 1)[None] * TFS.transpose(0, 2, 1, 3)
+        TTSp = np.where(TTS > 0, TTS, 0)
+        TFSp = np.where(TFS > 0, TFS, 0)
+        prevA, firstA = self.previous('a', 'A')
+        prevD, firstD = self.previous('d', 'D')
+        laterD = 1 - firstD
+        h = self.numeric('h')
+        before = (h[:, None] - h[None, :] > 0).astype(float)     #[h,H] lh-lhlh>0
+        after = (h[:, None] - h[None, :] < 0).astype(float)      #[h,H] lh-lhlh<0
+        ones = lambda axes, sign=1.0: [(sign * np.ones(self.shape(axes)), axes)]
+
+        RoA = 'RateOfActivity'
+        NC = 'NewCapacity'
+        TATABM = 'TotalAnnualTechnologyActivityByMode'
+        EBAC = 'EmissionByActivityChange'
+        emission = [(EM, 'emt'), (EAR, 'rtemy'), (YS, 'ly')]
+
+        ###### objective
+        self.constraint('cost', '', None, [
+            (NC, 'rtY', [(W, 'rtyY'), (FC / disc05[:, None, :], 'rty')]),
+            (RoA, 'rltmy', [(YS, 'ly'), (VC / disc05[:, None, None, :], 'rtmy')]),
+            (NC, 'rty', [(CC * (CRF * PvA)[:, :, None] / disc0[:, None, :], 'rty')]),
+            (RoA, 'rltmy', emission + [(EP / disc05[:, None, :], 'rey')]),
+            (EBAC, 'rtemy', [(EMC, 'emt'), (EP / disc05[:, None, :], 'rey')]),
+            ('DiscountedSalvageValue', 'rty', ones('rty', -1)),
+            ('NewStorageCapacity', 'rsy', [(CCS / disc0[:, None, :], 'rsy')]),
+            ('DiscountedSalvageValueStorage', 'rsy', ones('rsy', -1)),
+        ], const=[[(RES * FC / disc05[:, None, :], 'rty')]])
+
+        ###### common
+        self.constraint('Acc3_AverageAnnualRateOfActivity', 'rtmy', '=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+            (TATABM, 'rtmy', ones('rtmy', -1)),
+        ], mask=MT[None, :, :, None])
+        self.constraint('CAa1_TotalNewCapacity', 'rty', '=', [
+            ('AccumulatedNewCapacity', 'rty', ones('rty')),
+            (NC, 'rtY', [(-W, 'rtyY')]),
+        ])
+        self.constraint('CAa2_TotalAnnualCapacity', 'rty', '=', [
+            (NC, 'rtY', [(W, 'rtyY')]),
+            ('TotalCapacityAnnual', 'rty', ones('rty', -1)),
+        ], const=[[(RES, 'rty')]])
+        COTU = p('CapacityOfOneTechnologyUnit')
+        self.constraint('CAa5_TotalNewCapacity', 'rty', '=', [
+            ('NumberOfNewTechnologyUnits', 'rty', [(COTU, 'rty')]),
+            (NC, 'rty', ones('rty', -1)),
+        ], mask=COTU != 0)
+        self.constraint('CC1_UndiscountedCapitalInvestment', 'rty', '=', [
+            (NC, 'rty', [(CC, 'rty')]),
+            ('CapitalInvestment', 'rty', ones('rty', -1)),
+        ])
+        self.constraint('E2_AnnualEmissionProduction', 'rtey', '=', [
+            (RoA, 'rltmy', emission),
+            (EBAC, 'rtemy', [(EMC, 'emt')]),
+            ('AnnualTechnologyEmission', 'rtey', ones('rtey', -1)),
+        ])
+        self.constraint('EBa10_EnergyBalanceEachTS4', 'rRlfy', '=', [
+            ('Trade', 'rRlfy', ones('rRlfy')),
+            ('Trade', 'Rrlfy', ones('rRlfy')),
+        ])
+        self.constraint('NCC1_TotalAnnualMaxNewCapacityConstraint', 'rty', '<=', [
+            (NC, 'rty', ones('rty')),
+        ], const=[[(-p('TotalAnnualMaxCapacityInvestment'), 'rty')]])
+        TAMinCI = p('TotalAnnualMinCapacityInvestment')
+        self.constraint('NCC2_TotalAnnualMinNewCapacityConstraint', 'rty', '>=', [
+            (NC, 'rty', ones('rty')),
+        ], const=[[(-TAMinCI, 'rty')]], mask=TAMinCI > 0)
+        self.constraint('OC1_OperatingCostsVariable', 'rty', '=', [
+            (RoA, 'rltmy', [(YS, 'ly'), (VC, 'rtmy')]),
+            ('AnnualVariableOperatingCost', 'rty', ones('rty', -1)),
+        ])
+        self.constraint('OC2_OperatingCostsFixedAnnual', 'rty', '=', [
+            (NC, 'rtY', [(W, 'rtyY'), (FC, 'rty')]),
+            ('AnnualFixedOperatingCost', 'rty', ones('rty', -1)),
+        ], const=[[(RES * FC, 'rty')]])
+        endOfLife = y[None, None, :] + OL[:, :, None] - 1
+        self.constraint('SV3_SalvageValueAtEndOfPeriod3', 'rty', '=', [
+            ('SalvageValue', 'rty', ones('rty')),
+        ], mask=endOfLife <= yN)
+        self.constraint('SV4_SalvageValueDiscountedToStartYear', 'rty', '=', [
+            ('DiscountedSalvageValue', 'rty', ones('rty')),
+            ('SalvageValue', 'rty', [(np.broadcast_to((-1 / (1 + DR) ** (1 + yN - y0))[:, None, None], self.shape('rty')), 'rty')]),
+        ])
+        self.constraint('TAC1_TotalModelHorizonTechnologyActivity', 'rt', '=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+            ('TotalTechnologyModelPeriodActivity', 'rt', ones('rt', -1)),
+        ])
+
+        ###### input to capacity ratios
+        production = [(FO, 'fmt'), (OAR, 'rtfmy'), (YS, 'ly')]
+        use = [(-FI, 'fmt'), (IAR, 'rtfmy'), (YS, 'ly')]
+        self.constraint('EBb4_EnergyBalanceEachYear4_ICR', 'rfy', '>=', [
+            (RoA, 'rltmy', production),
+            (RoA, 'rltmy', use),
+            ('Trade', 'rRlfy', [(-TR, 'rRfy')]),
+            ('InputToNewCapacity', 'rtfy', ones('rtfy', -1)),
+            ('InputToTotalCapacity', 'rtfy', ones('rtfy', -1)),
+        ], const=[[(-AAD, 'rfy')]])
+        ITNCR = p('InputToNewCapacityRatio')
+        self.constraint('INC1_InputToNewCapacity', 'rytf', '=', [
+            (NC, 'rty', [(ITNCR, 'rtfy')]),
+            ('InputToNewCapacity', 'rtfy', ones('rtfy', -1)),
+        ], mask=(self.PN[None, None] != 0) & (ITNCR.transpose(0, 3, 1, 2) != 0))
+        ITTCR = p('InputToTotalCapacityRatio')
+        self.constraint('ITC1_InputToTotalCapacity', 'rytf', '=', [
+            ('TotalCapacityAnnual', 'rty', [(ITTCR, 'rtfy')]),
+            ('InputToTotalCapacity', 'rtfy', ones('rtfy', -1)),
+        ], mask=(self.PT[None, None] != 0) & (ITTCR.transpose(0, 3, 1, 2) != 0))
+
+        ###### long code
+        self.constraint('AAC1_TotalAnnualTechnologyActivity', 'rty', '=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+            ('TotalTechnologyAnnualActivity', 'rty', ones('rty', -1)),
+        ])
+        self.constraint('CAa3_TotalActivityOfEachTechnology', 'rtly', '=', [
+            (RoA, 'rltmy', []),
+            ('RateOfTotalActivity', 'rtly', ones('rtly', -1)),
+        ])
+        self.constraint('E1_AnnualEmissionProductionByMode', 'remty', '=', [
+            (RoA, 'rltmy', [(EAR, 'rtemy'), (YS, 'ly')]),
+            ('AnnualTechnologyEmissionByMode', 'rtemy', ones('rtemy', -1)),
+        ], mask=EM[None, :, :, :, None])
+
+        ###### mode specific
+        UL = p('TechnologyActivityByModeUpperLimit')
+        self.constraint('LU1_TechnologyActivityByModeUL', 'rtmy', '<=', [
+            (TATABM, 'rtmy', ones('rtmy')),
+        ], const=[[(-UL, 'rtmy')]], mask=MT[None, :, :, None] * (UL != 0))
+        self.constraint('LU2_TechnologyActivityByModeLL', 'rtmy', '>=', [
+            (TATABM, 'rtmy', ones('rtmy')),
+        ], const=[[(-p('TechnologyActivityByModeLowerLimit'), 'rtmy')]], mask=MT[None, :, :, None])
+        INC = p('TechnologyActivityIncreaseByModeLimit')
+        self.constraint('LU3_TechnologyActivityIncreaseByMode', 'rtmyY', '<=', [
+            (TATABM, 'rtmy', ones('rtmy')),
+            (TATABM, 'rtmY', [(-(1 + INC), 'rtmY')]),
+        ], mask=MT[None, :, :, None, None] * shift[None, None, None] * (INC != 0)[:, :, :, None, :])
+        DEC = p('TechnologyActivityDecreaseByModeLimit')
+        self.constraint('LU4_TechnologyActivityDecreaseByMode', 'rtmyY', '>=', [
+            (TATABM, 'rtmy', ones('rtmy')),
+            (TATABM, 'rtmY', [(-(1 - DEC), 'rtmY')]),
+        ], mask=MT[None, :, :, None, None] * shift[None, None, None] * (DEC != 0)[:, :, :, None, :])
+
+        ###### short code
+        self.constraint('AAC2_TotalAnnualTechnologyActivityUpperLimit', 'rty', '<=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+        ], const=[[(-p('TotalTechnologyAnnualActivityUpperLimit'), 'rty')]])
+        AALL = p('TotalTechnologyAnnualActivityLowerLimit')
+        self.constraint('AAC3_TotalAnnualTechnologyActivityLowerLimit', 'rty', '>=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+        ], const=[[(-AALL, 'rty')]], mask=AALL > 0)
+        self.constraint('CAa4_Constraint_Capacity', 'rlty', '<=', [
+            (RoA, 'rltmy', []),
+            (NC, 'rtY', [(-W, 'rtyY'), (CF, 'rtly'), (CAU, 'rt')]),
+        ], const=[[(-RES, 'rty'), (CF, 'rtly'), (CAU, 'rt')]])
+        self.constraint('CAb1_PlannedMaintenance', 'rty', '<=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+            (NC, 'rtY', [(-W, 'rtyY'), (CF, 'rtly'), (YS, 'ly'), (AF * CAU[:, :, None], 'rty')]),
+        ], const=[[(-RES, 'rty'), (CF, 'rtly'), (YS, 'ly'), (AF * CAU[:, :, None], 'rty')]])
+        self.constraint('E5_EmissionsPenaltyByTechnology', 'rty', '=', [
+            (RoA, 'rltmy', emission + [(EP, 'rey')]),
+            (EBAC, 'rtemy', [(EMC, 'emt'), (EP, 'rey')]),
+            ('TechnologyEmissionsPenalty', 'rty', ones('rty', -1)),
+        ])
+        self.constraint('E8_AnnualEmissionsLimit', 'rey', '<=', [
+            (RoA, 'rltmy', emission),
+            (EBAC, 'rtemy', [(EMC, 'emt')]),
+        ], const=[[(-p('AnnualEmissionLimit'), 'rey')]])
+        self.constraint('E9_ModelPeriodEmissionsLimit', 're', '<=', [
+            (RoA, 'rltmy', emission),
+            (EBAC, 'rtemy', [(EMC, 'emt')]),
+        ], const=[[(-p('ModelPeriodEmissionLimit'), 're')]])
+        self.constraint('EBa11_EnergyBalanceEachTS5', 'rlfy', '>=', [
+            (RoA, 'rltmy', production),
+            (RoA, 'rltmy', use),
+            ('Trade', 'rRlfy', [(-TR, 'rRfy')]),
+        ], const=[[(-SAD, 'rfy'), (SDP, 'rfly')]])
+        self.constraint('EBa9_EnergyBalanceEachTS3', 'rlfy', '=', [
+            ('Demand', 'rlfy', ones('rlfy', -1)),
+        ], const=[[(SAD, 'rfy'), (SDP, 'rfly')]])
+        self.constraint('EBb4_EnergyBalanceEachYear4', 'rfy', '>=', [
+            (RoA, 'rltmy', production),
+            (RoA, 'rltmy', use),
+            ('Trade', 'rRlfy', [(-TR, 'rRfy')]),
+        ], const=[[(-AAD, 'rfy')]])
+        #SV1/SV2 [r,t,y]
+        rate = (1 + DR)[:, None, None]
+        capital = CC * (CRF * PvA)[:, :, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sv1 = np.where(DR[:, None, None] > 0, 1 - ((rate ** (yN - y + 1)[None, None, :] - 1) / (rate ** OL[:, :, None] - 1)), 0)
+            sv2 = 1 - (yN - y + 1)[None, None, :] / OL[:, :, None]
+        self.constraint('SV1_SalvageValueAtEndOfPeriod1', 'rty', '=', [
+            ('SalvageValue', 'rty', ones('rty')),
+            (NC, 'rty', [(-capital * sv1, 'rty')]),
+        ], mask=(endOfLife > yN) & (DR[:, None, None] > 0))
+        self.constraint('SV2_SalvageValueAtEndOfPeriod2', 'rty', '=', [
+            ('SalvageValue', 'rty', ones('rty')),
+            (NC, 'rty', [(-capital * sv2, 'rty')]),
+        ], mask=(endOfLife > yN) & (DR[:, None, None] == 0))
+        self.constraint('TAC2_TotalModelHorizonTechnologyActivityUpperLimit', 'rt', '<=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+        ], const=[[(-p('TotalTechnologyModelPeriodActivityUpperLimit'), 'rt')]])
+        TMPLL = p('TotalTechnologyModelPeriodActivityLowerLimit')
+        self.constraint('TAC3_TotalModelHorizonTechnologyActivityLowerLimit', 'rt', '>=', [
+            (RoA, 'rltmy', [(YS, 'ly')]),
+        ], const=[[(-TMPLL, 'rt')]], mask=TMPLL > 0)
+        self.constraint('TCC1_TotalAnnualMaxCapacityConstraint', 'rty', '<=', [
+            (NC, 'rtY', [(W, 'rtyY')]),
+        ], const=[[(RES - p('TotalAnnualMaxCapacity'), 'rty')]])
+        TAMinC = p('TotalAnnualMinCapacity')
+        self.constraint('TCC2_TotalAnnualMinCapacityConstraint', 'rty', '>=', [
+            (NC, 'rtY', [(W, 'rtyY')]),
+        ], const=[[(RES - TAMinC, 'rty')]], mask=TAMinC > 0)
+        ETACR = p('EmissionToActivityChangeRatio')
+        notFirst = (y > y0).astype(float)
+        self.constraint('E10_InterYearActivityEmissionChange', 'remtyY', '=', [
+            (TATABM, 'rtmy', [(ETACR, 'rtemy')]),
+            (TATABM, 'rtmY', [(-ETACR, 'rtemy')]),
+            (EBAC, 'rtemy', ones('rtemy', -1)),
+        ], mask=EMC[None, :, :, :, None, None] * (shift * notFirst[:, None])[None, None, None, None])
+        self.constraint('E11_InterYearActivityEmissionChange', 'remtyY', '=', [
+            (EBAC, 'rtemy', ones('rtemy', -1)),
+        ], mask=EMC[None, :, :, :, None, None] * (y == y0)[None, None, None, None, :, None])
+
+        ###### storage
+        self.constraint('S14_RateOfNetStorageActivity', 'rsadhy', '=', [
+            (RoA, 'rltmy', [(TTSp, 'rtsm'), (C3, 'ladh')]),
+            (RoA, 'rltmy', [(-TFSp, 'rtsm'), (C3, 'ladh')]),
+            ('RateOfNetStorageActivity', 'rsadhy', ones('rsadhy', -1)),
+        ])
+        inSDB = ((Cls > 0)[:, :, None, None] & (Cld > 0)[:, None, :, None] & (Clh > 0)[:, None, None, :])
+        self.constraint('S3_NetChargeWithinYear', 'rsadhy', '=', [
+            (RoA, 'rltmy', [(TTSp, 'rtsm'), (C3 * C3 * inSDB, 'ladh'), (YS, 'ly')]),
+            (RoA, 'rltmy', [(-TFSp, 'rtsm'), (C3 * C3 * inSDB, 'ladh'), (YS, 'ly')]),
+            ('NetChargeWithinYear', 'rsadhy', ones('rsadhy', -1)),
+        ])
+        self.constraint('S4_NetChargeWithinDay', 'rsadhy', '=', [
+            (RoA, 'rltmy', [(TTSp, 'rtsm'), (C3, 'ladh'), (DS, 'hy')]),
+            (RoA, 'rltmy', [(-TFSp, 'rtsm'), (C3, 'ladh'), (DS, 'hy')]),
+            ('NetChargeWithinDay', 'rsadhy', ones('rsadhy', -1)),
+        ])
+        self.constraint('S9_and_S10_StorageLevelSeasonStart', 'rsay', '=', [
+            ('StorageLevelYearStart', 'rsy', [(firstA, 'a')]),
+            ('StorageLevelSeasonStart', 'rsAy', [(prevA, 'aA')]),
+            (RoA, 'rltmy', [(prevA, 'aA'), (SDB, 'lAdh'), (NF, 'rstm'), (YS, 'ly')]),
+            ('StorageLevelSeasonStart', 'rsay', ones('rsay', -1)),
+        ])
+        self.constraint('S11_and_S12_StorageLevelDayTypeStart', 'rsady', '=', [
+            ('StorageLevelSeasonStart', 'rsay', [(firstD, 'd')]),
+            ('StorageLevelDayTypeStart', 'rsaDy', [(prevD, 'dD')]),
+            (RoA, 'rltmy', [(prevD, 'dD'), (SDB, 'laDh'), (NF, 'rstm'), (DS, 'hy'), (DIDT, 'aDy')]),
+            ('StorageLevelDayTypeStart', 'rsady', ones('rsady', -1)),
+        ])
+        self.constraint('S30_StorageLevelYearStart2', 'rsyl', '=', [
+            ('StorageLevelYearStart', 'rsy', ones('rsy')),
+        ])
+        self.constraint('S39_StorageIntraday', 'rsady', '=', [
+            ('NetChargeWithinDay', 'rsadhy', ones('rsadhy')),
+        ], mask=self.member('STORAGEINTRADAY', 's')[None, :, None, None, None])
+        self.constraint('S39_StorageIntrayear', 'rsy', '=', [
+            ('NetChargeWithinYear', 'rsadhy', ones('rsadhy')),
+        ], mask=self.member('STORAGEINTRAYEAR', 's')[None, :, None])
+
+        ###### storage constraints, (StorageLevel +/- neto punjenje po lhlh) u odnosu na kapacitet skladista
+        flowBefore = [(before, 'hH'), (SDB, 'ladH'), (NF, 'rstm'), (DS, 'Hy')]
+        flowAfter = [(after, 'hH'), (SDB, 'ladH'), (NF, 'rstm'), (DS, 'Hy')]
+        capacity = lambda sign, extra=(): ('NewStorageCapacity', 'rsY', [(sign * WS, 'rsyY')] + list(extra))
+        minCharge = (MSC, 'rsy')
+        later = (laterD, 'd')
+        neg = lambda items: [(-items[0][0], items[0][1])] + items[1:]
+        self.constraint('SC1_LLBDFIFW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeStart', 'rsady', ones('rsady', -1)),
+            (RoA, 'rltmy', neg(flowBefore)),
+            capacity(1, [minCharge]),
+        ], const=[[minCharge, (RSC, 'rsy')]])
+        self.constraint('SC1_ULBDFIFW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeStart', 'rsady', ones('rsady')),
+            (RoA, 'rltmy', flowBefore),
+            capacity(-1),
+        ], const=[[(-RSC, 'rsy')]])
+        self.constraint('SC2_LLEDLIFW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeStart', 'rsady', [(-laterD, 'd')]),
+            (RoA, 'rltmy', flowAfter + [later]),
+            capacity(1, [minCharge, later]),
+        ], const=[[minCharge, (RSC, 'rsy'), later]])
+        self.constraint('SC2_ULEDLIFW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeStart', 'rsady', [(laterD, 'd')]),
+            (RoA, 'rltmy', neg(flowAfter) + [later]),
+            capacity(-1, [later]),
+        ], const=[[(-RSC, 'rsy'), later]])
+        self.constraint('SC3_LLEDLILW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeFinish', 'rsady', ones('rsady', -1)),
+            (RoA, 'rltmy', flowAfter),
+            capacity(1, [minCharge]),
+        ], const=[[minCharge, (RSC, 'rsy')]])
+        self.constraint('SC3_ULEDLILW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeFinish', 'rsady', ones('rsady')),
+            (RoA, 'rltmy', neg(flowAfter)),
+            capacity(-1),
+        ], const=[[(-RSC, 'rsy')]])
+        self.constraint('SC4_LLBDFILW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeFinish', 'rsaDy', [(-prevD, 'dD')]),
+            (RoA, 'rltmy', neg(flowBefore) + [later]),
+            capacity(1, [minCharge, later]),
+        ], const=[[minCharge, (RSC, 'rsy'), later]])
+        self.constraint('SC4_ULBDFILW', 'rsadhy', '<=', [
+            ('StorageLevelDayTypeFinish', 'rsaDy', [(prevD, 'dD')]),
+            (RoA, 'rltmy', flowBefore + [later]),
+            capacity(-1, [later]),
+        ], const=[[(-RSC, 'rsy'), later]])
+
+        ###### storage investments
+        endOfLifeStorage = y[None, None, :] + OLS[:, :, None] - 1
+        self.constraint('SI6_SalvageValueStorageAtEndOfPeriod1', 'rsy', '=', [
+            ('SalvageValueStorage', 'rsy', ones('rsy', -1)),
+        ], mask=endOfLifeStorage <= yN)
+        self.constraint('SI7_SalvageValueStorageAtEndOfPeriod2', 'rsy', '=', [
+            ('NewStorageCapacity', 'rsy', [(CCS * (1 - (yN - y + 1)[None, None, :] / OLS[:, :, None]), 'rsy')]),
+            ('SalvageValueStorage', 'rsy', ones('rsy', -1)),
+        ], mask=endOfLifeStorage > yN)
+        self.constraint('SI2_StorageLowerLimit', 'rsy', '=', [
+            capacity(1, [minCharge]),
+            ('StorageLowerLimit', 'rsy', ones('rsy', -1)),
+        ], const=[[minCharge, (RSC, 'rsy')]])
+        self.constraint('SI3_TotalNewStorage', 'rsy', '=', [
+            capacity(1),
+            ('AccumulatedNewStorageCapacity', 'rsy', ones('rsy', -1)),
+        ])
+        self.constraint('SI4_UndiscountedCapitalInvestmentStorage', 'rsy', '=', [
+            ('NewStorageCapacity', 'rsy', [(CCS, 'rsy')]),
+            ('CapitalInvestmentStorage', 'rsy', ones('rsy', -1)),
+        ])
+        self.constraint('SI9_SalvageValueStorageDiscountedToStartYear', 'rsy', '=', [
+            ('SalvageValueStorage', 'rsy', [(np.broadcast_to((1 / (1 + DR) ** (yN - y0 + 1))[:, None, None], self.shape('rsy')), 'rsy')]),
+            ('DiscountedSalvageValueStorage', 'rsy', ones('rsy', -1)),
+        ])
+
+        ###### user defined constraints
+        tag = p('UDCTag')
+        udc = [
+            ('TotalCapacityAnnual', 'rty', [(p('UDCMultiplierTotalCapacity'), 'rtuy')]),
+            (NC, 'rty', [(p('UDCMultiplierNewCapacity'), 'rtuy')]),
+            ('TotalTechnologyAnnualActivity', 'rty', [(p('UDCMultiplierActivity'), 'rtuy')]),
+        ]
+        UDCC = p('UDCConstant')
+        self.constraint('UDC1_UserDefinedConstraintInequality', 'ruy', '<=', udc,
+                        const=[[(-UDCC, 'ruy')]], mask=(tag == 0)[:, :, None])
+        self.constraint('UDC2_UserDefinedConstraintEquality', 'ruy', '=', udc,
+                        const=[[(-UDCC, 'ruy')]], mask=(tag == 1)[:, :, None])
+        return self.assemble()
+
+    ########################################################################## matrix
+    def assemble(self):
+        """Global COO matrix, duplicate entries summed, zeros dropped, unused columns removed."""
+        rowOffsets, offset = [], 0
+        for block in self.blocks:
+            rowOffsets.append(offset)
+            offset += len(block["rows"])
+        self.rowCount = offset
+        rows, cols, vals = [], [], []
+        for block, start in zip(self.blocks, rowOffsets):
+            r, c, v = block["entries"]
+            #lokalni flat indeks reda -> redni broj medju postojecim redovima bloka
+            rows.append(start + np.searchsorted(block["rows"], r))
+            cols.append(c)
+            vals.append(v)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        vals = np.concatenate(vals) if vals else np.zeros(0)
+        rows, cols, vals = LpBuilder.reduce(rows, cols, vals, self.columnCount)
+
+        _, oc, ov = self.objective["entries"]
+        _, objCols, objVals = LpBuilder.reduce(np.zeros(len(oc), dtype=np.int64), oc, ov, self.columnCount)
+
+        used = np.unique(np.concatenate([cols, objCols]))
+        self.columns = used
+        self.rows, self.cols, self.vals = rows, np.searchsorted(used, cols), vals
+        self.objCols, self.objVals = np.searchsorted(used, objCols), objVals
+        self.objConstant = -float(self.objective["rhs"][0])
+        self.rhs = np.concatenate([b["rhs"][b["rows"]] for b in self.blocks]) if self.blocks else np.zeros(0)
+        self.senses = [b["sense"] for b in self.blocks for _ in range(len(b["rows"]))]
+        return self
+
+    @staticmethod
+    def reduce(rows, cols, vals, width):
+        key = rows * width + cols
+        order = np.argsort(key, kind='stable')
+        key, vals = key[order], vals[order]
+        unique, start = np.unique(key, return_index=True)
+        sums = np.add.reduceat(vals, start) if len(vals) else vals
+        keep = sums != 0
+        unique = unique[keep]
+        return unique // width, unique % width, sums[keep]
+
+    def columnNames(self):
+        names = []
+        kinds = []
+        bounds = np.cumsum([0] + [int(np.prod(self.shape(a))) for _, a, _ in LpBuilder.VARIABLES])
+        var = np.searchsorted(bounds, self.columns, 'right') - 1
+        for v in np.unique(var):
+            name, axes, kind = LpBuilder.VARIABLES[v]
+            local = self.columns[var == v] - bounds[v]
+            labels = [np.array(self.elements[a], dtype=object)[i] for a, i in zip(axes, np.unravel_index(local, self.shape(axes)))]
+            names.extend('{}({})'.format(name, ','.join(t)) for t in zip(*labels))
+            kinds.extend([kind] * len(local))
+        return names, kinds
+
+    def columnKinds(self):
+        #None | 'free' | 'integer' po koloni, bez pravljenja imena
+        bounds = np.cumsum([0] + [int(np.prod(self.shape(a))) for _, a, _ in LpBuilder.VARIABLES])
+        var = np.searchsorted(bounds, self.columns, 'right') - 1
+        return np.array([kind for _, _, kind in LpBuilder.VARIABLES], dtype=object)[var]
+
+    def rowNames(self):
+        names = []
+        for block in self.blocks:
+            axes = block["axes"]
+            index = np.unravel_index(block["rows"], self.shape(axes))
+            labels = [np.array(self.elements[a], dtype=object)[i] for a, i in zip(axes, index)]
+            names.extend('{}({})'.format(block["name"], ','.join(t)) for t in zip(*labels))
+        return names
+
+    ########################################################################## LP file
+    @staticmethod
+    def number(value):
+        return '%.15g' % value
+
+    @staticmethod
+    def terms(names, cols, vals):
+        out = []
+        for c, v in zip(cols.tolist(), vals.tolist()):
+            if v == 1:
+                out.append(' + ' + names[c])
+            elif v == -1:
+                out.append(' - ' + names[c])
+            else:
+                out.append(' {} {} {}'.format('-' if v < 0 else '+', '%.15g' % abs(v), names[c]))
+        return out
+
+    @staticmethod
+    def line(out, head, terms):
+        #prelom kao glpk, novi red kad bi linija presla 72 znaka
+        length = len(head)
+        out.append(head)
+        for term in terms:
+            if length + len(term) > LpBuilder.WRAP:
+                out.append('\n')
+                length = 0
+            out.append(term)
+            length += len(term)
+        out.append('\n')
+
+    def write(self, lpFile):
+        names, kinds = self.columnNames()
+        rowNames = self.rowNames()
+        empty = ' 0 ' + names[0] if names else ' 0 x'
+        #lp.lp.gz za CBC koji cita gzip (Config.SOLVER_GZIP_LP), LF i na windowsu kao glpsol --wlp na linuxu
+        if str(lpFile).endswith('.gz'):
+            f = gzip.open(lpFile, 'wt', compresslevel=Config.ARTIFACT_GZIP_LEVEL, newline='\n')
+        else:
+            f = open(lpFile, 'w', newline='\n')
+        with f:
+            out = ['\\* Problem: {} *\\\n\n'.format(self.problem), 'Minimize\n']
+            objTerms = LpBuilder.terms(names, self.objCols, self.objVals) or [empty]
+            LpBuilder.line(out, ' cost:', objTerms)
+            if self.objConstant != 0:
+                out.append('\\* constant term = {} *\\\n'.format(LpBuilder.number(self.objConstant)))
+            out.append('\nSubject To\n')
+
+            starts = np.searchsorted(self.rows, np.arange(self.rowCount + 1))
+            for i, name in enumerate(rowNames):
+                a, b = starts[i], starts[i + 1]
+                terms = LpBuilder.terms(names, self.cols[a:b], self.vals[a:b]) or [empty]
+                terms.append(' {} {}'.format(self.senses[i], LpBuilder.number(self.rhs[i])))
+                LpBuilder.line(out, ' {}:'.format(name), terms)
+                #redovi se pisu u paketima, cijeli LP tekst nikad nije u memoriji
+                if len(out) >= LpBuilder.WRITE_BATCH:
+                    f.writelines(out)
+                    out.clear()
+
+            free = [n for n, k in zip(names, kinds) if k == 'free']
+            if free:
+                out.append('\nBounds\n')
+                out.extend(' {} free\n'.format(n) for n in free)
+            integer = [n for n, k in zip(names, kinds) if k == 'integer']
+            if integer:
+                out.append('\nGenerals\n')
+                out.extend(' {}\n'.format(n) for n in integer)
+            out.append('\nEnd\n')
+            f.writelines(out)
+        logger.info("LP %s written, %d rows, %d columns, %d nonzeros", lpFile, self.rowCount, len(names), len(self.vals))
+        return {"rows": self.rowCount, "columns": len(names), "nonzeros": int(len(self.vals))}
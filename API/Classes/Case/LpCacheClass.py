@@ -0,0 +1,141 @@
+import os, time, shutil, hashlib, logging
+from pathlib import Path
+from threading import Lock
+
+from Classes.Base import Config
+from Classes.Base.MetricsClass import Metrics
+
+logger = logging.getLogger(__name__)
+
+class LpCache():
+    """
+    Content addressed cache of LP files in Config.LP_CACHE_FOLDER (<key>.lp, <key>.lp.gz).
+
+    The key is a digest of the model file, the caserun data.txt and the options the LP depends on
+    (Config.LP_BUILDER, VERSION). data_processed.txt and lp.lp are functions of these, so a caserun
+    that is run again without changes gets lp.lp from the cache and goes straight to CBC, without
+    preprocessing and LP generation. Entries are hard links where the file system allows it (copies
+    otherwise), lp.lp of a caserun is removed before it is generated again so a link is never
+    written through. A hit refreshes the entry mtime, entries older than Config.LP_CACHE_MAX_AGE
+    and the oldest entries above Config.LP_CACHE_MAX_BYTES are evicted when a new entry is stored.
+    """
+    #povecati kad se promijeni preprocessData ili LpBuilder, stari LP fajlovi vise ne vaze
+    VERSION = 1
+    CHUNK = 1024 * 1024
+    _lock = Lock()
+
+    @staticmethod
+    def enabled():
+        return bool(Config.LP_CACHE)
+
+    @staticmethod
+    def key(modelFile, dataFile):
+        h = hashlib.blake2b(digest_size=20)
+        h.update('v{}|{}|'.format(LpCache.VERSION, Config.LP_BUILDER).encode())
+        for path in (modelFile, dataFile):
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(LpCache.CHUNK), b''):
+                    h.update(chunk)
+            #granica izmedju fajlova, da spajanje sadrzaja ne da isti digest
+            h.update(b'\0')
+        return h.hexdigest()
+
+    @staticmethod
+    def entry(key, lpFile=None):
+        #lp.lp.gz (CBC sa zlib) se cuva kao <key>.lp.gz, pored <key>.lp
+        suffix = '.lp.gz' if str(lpFile or '').endswith('.gz') else '.lp'
+        return Path(Config.LP_CACHE_FOLDER, key + suffix)
+
+    @staticmethod
+    def _place(source, target):
+        #hard link ako je moguc, inace kopija, target se zamjenjuje atomski
+        tmp = Path(target.parent, '.{}.{}.tmp'.format(target.name, os.getpid()))
+        if tmp.exists():
+            os.remove(tmp)
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+
+    @staticmethod
+    def release(lpFile):
+        #lp.lp se brise prije generisanja, glpsol i LpBuilder ne smiju pisati kroz link u cache
+        if os.path.lexists(lpFile):
+            os.remove(lpFile)
+
+    @staticmethod
+    def fetch(key, lpFile):
+        entry = LpCache.entry(key, lpFile)
+        hit = entry.is_file()
+        Metrics.cacheLookup('lp', hit)
+        if not hit:
+            return False
+        try:
+            LpCache.release(lpFile)
+            LpCache._place(entry, Path(lpFile))
+            os.utime(entry)
+        except OSError as err:
+            logger.warning("LP cache entry %s could not be used: %s", key, err)
+            return False
+        logger.info("LP cache hit %s -> %s", key, lpFile)
+        return True
+
+    @staticmethod
+    def store(key, lpFile):
+        try:
+            os.makedirs(Config.LP_CACHE_FOLDER, exist_ok=True)
+            LpCache._place(Path(lpFile), LpCache.entry(key, lpFile))
+        except OSError as err:
+            logger.warning("LP file %s was not cached: %s", lpFile, err)
+            return
+        LpCache.evict()
+
+    @staticmethod
+    def entries():
+        folder = Path(Config.LP_CACHE_FOLDER)
+        if not folder.is_dir():
+            return []
+        out = []
+        for name in os.listdir(folder):
+            if name.endswith(('.lp', '.lp.gz')) and not name.startswith('.'):
+                try:
+                    stat = os.stat(Path(folder, name))
+                except FileNotFoundError:
+                    continue
+                out.append((stat.st_mtime, stat.st_size, Path(folder, name)))
+        return sorted(out)
+
+    @staticmethod
+    def evict():
+        with LpCache._lock:
+            entries = LpCache.entries()
+            total = sum(size for _, size, _ in entries)
+            oldest = time.time() - Config.LP_CACHE_MAX_AGE
+            removed = 0
+            for mtime, size, path in entries:
+                if mtime >= oldest and total <= Config.LP_CACHE_MAX_BYTES:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            if removed:
+                logger.info("LP cache evicted %s entries, %s bytes left", removed, total)
+            return removed
+
+    @staticmethod
+    def clear():
+        with LpCache._lock:
+            for _, _, path in LpCache.entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def stats():
+        entries = LpCache.entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
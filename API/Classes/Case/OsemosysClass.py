@@ -1,11 +1,9 @@
-import os
 from pathlib import Path
-import platform
-import shutil, json
 from copy import deepcopy
 from Classes.Base import Config
-from Classes.Base.FileClass import File
+from Classes.Base.StorageClass import Storage
 from Classes.Case.HelpersClass import Helpers
+from Classes.Case.SolverBackendClass import SolverBackends, ExecutableBackend
 
 class Osemosys():
     def __init__(self, case):
@@ -13,19 +11,19 @@ class Osemosys():
         self.storagePath = Path(Config.DATA_STORAGE)
         self.casePath = self.storagePath / case
 
-        self.PARAMETERS = File.readParamFile(self.storagePath / 'Parameters.json')
-        self.VARIABLES = File.readParamFile(self.storagePath / 'Variables.json')
-        self.DUALS = File.readParamFile(self.storagePath / 'Duals.json')
-        self.INDICATORS = File.readParamFile(self.storagePath / 'Indicators.json')
+        self.PARAMETERS = Storage.readParamFile(self.storagePath / 'Parameters.json')
+        self.VARIABLES = Storage.readParamFile(self.storagePath / 'Variables.json')
+        self.DUALS = Storage.readParamFile(self.storagePath / 'Duals.json')
+        self.INDICATORS = Storage.readParamFile(self.storagePath / 'Indicators.json')
 
 
         self.resultsPath = self.casePath / 'res'
         self.viewFolderPath = self.casePath / 'view'
         self.resDataPath = self.viewFolderPath / 'resData.json'
 
-        self.genData =  File.readFile(self.casePath / 'genData.json')
+        self.genData =  Storage.readFile(self.casePath / 'genData.json')
         self.customIndicators = self.genData['osy-indicators']
-        self.resData = File.readFile(self.resDataPath)
+        self.resData = Storage.readFile(self.resDataPath)
         
         #Case.__init__(self, case)
 
@@ -58,20 +56,8 @@ class Osemosys():
         self.osemosysFile = Path(Config.SOLVERs_FOLDER,'model.v.5.4.txt') 
         self.osemosysFileOriginal = Path(Config.SOLVERs_FOLDER,'osemosys.txt')
 
-        if platform.system() == 'Windows':
-            self.glpkFolder = Path(Config.SOLVERs_FOLDER, 'GLPK')
-            self.cbcFolder  = Path(Config.SOLVERs_FOLDER, 'COIN-OR')
-            glpsol_name = "glpsol.exe"
-            cbc_name    = "cbc.exe"
-        else:
-            # macOS i Linux
-            self.glpkFolder = Path(Config.SOLVERs_FOLDER, 'GLPK')
-            self.cbcFolder  = Path(Config.SOLVERs_FOLDER, 'COIN-OR')
-            glpsol_name = "glpsol"
-            cbc_name    = "cbc"
-        
-        self.glpsol_path, self.glpsol_is_bundled = self._resolve_solver_executable(self.glpkFolder, glpsol_name, platform.system())
-        self.cbc_path,    self.cbc_is_bundled    = self._resolve_solver_executable(self.cbcFolder,  cbc_name, platform.system())
+        self.glpkFolder = Path(Config.SOLVERs_FOLDER, 'GLPK')
+        self.cbcFolder  = Path(Config.SOLVERs_FOLDER, 'COIN-OR')
 
 
         self.PARAM = Helpers.build_param(self.PARAMETERS)
@@ -296,35 +282,26 @@ class Osemosys():
         return result
 
 
+    #solveri se traze tek kad zatrebaju, jednom po procesu (SolverBackends)
+    @property
+    def glpsol_path(self):
+        return SolverBackends.backend('glpk').path
+
+    @property
+    def glpsol_is_bundled(self):
+        return SolverBackends.backend('glpk').bundled
+
+    @property
+    def cbc_path(self):
+        return SolverBackends.backend('cbc').path
+
+    @property
+    def cbc_is_bundled(self):
+        return SolverBackends.backend('cbc').bundled
+
     @staticmethod
     def _resolve_solver_executable( folder: Path, exe_name: str, system: str):
-        # 1) Bundled
-        candidate = folder / exe_name
-        if candidate.exists():
-            if system != "Windows":
-                os.chmod(candidate, os.stat(candidate).st_mode | 0o111)
-            return str(candidate.resolve()), True  # <--- solver je bundlan
-
-        # 2) PATH
-        which = shutil.which(exe_name)
-        if which:
-            return which, False  # <--- koristi sistemski solver
-
-        # 3) macOS standard locations
-        if system == "Darwin":
-            for p in ["/opt/homebrew/bin", "/usr/local/bin", "/usr/bin"]:
-                test = Path(p) / exe_name
-                if test.exists():
-                    return str(test), False
-
-        # 4) Linux standard locations
-        if system == "Linux":
-            for p in ["/usr/bin", "/usr/local/bin", "/bin", "/snap/bin"]:
-                test = Path(p) / exe_name
-                if test.exists():
-                    return str(test), False
-
-        raise FileNotFoundError(f"Solver not found: {exe_name}")
+        return ExecutableBackend.resolveExecutable(folder, exe_name, system)
 
     def getParamDefaultValues(self):
         d = {}
@@ -947,7 +924,7 @@ class Osemosys():
             data[tech['TechId']] = []
             for group, array in self.PARAMETERS.items():
                 if group in Config.TECH_GROUPS:
-                    jsonData[group] =  File.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
+                    jsonData[group] =  Storage.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
                     for obj in array:
                         byTech = {}
                         byTech['groupId'] = group
@@ -981,7 +958,7 @@ class Osemosys():
             data[tech['CommId']] = []
             for group, array in self.PARAMETERS.items():
                 if group in Config.COMM_GROUPS:
-                    jsonData[group] =  File.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
+                    jsonData[group] =  Storage.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
                     for obj in array:
                         byComm = {}
                         byComm['groupId'] = group
@@ -1015,7 +992,7 @@ class Osemosys():
             data[tech['EmisId']] = []
             for group, array in self.PARAMETERS.items():
                 if group in Config.EMIS_GROUPS:
-                    jsonData[group] =  File.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
+                    jsonData[group] =  Storage.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
                     for obj in array:
                         byEmi = {}
                         byEmi['groupId'] = group
@@ -1049,7 +1026,7 @@ class Osemosys():
             data[tech['TechId']] = []
             for group, array in self.PARAMETERS.items():
                 if group in Config.SINGLE_TECH_GROUPS:
-                    jsonData[group] =  File.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
+                    jsonData[group] =  Storage.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
                     for obj in array:
                         byTech = {}
                         byTech['groupId'] = group
@@ -1071,7 +1048,7 @@ class Osemosys():
             data[tech['EmisId']] = []
             for group, array in self.PARAMETERS.items():
                 if group in Config.SINGLE_EMIS_GROUPS:
-                    jsonData[group] =  File.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
+                    jsonData[group] =  Storage.readFile(Path(Config.DATA_STORAGE,self.case, group+'.json'))
                     for obj in array:
                         byEmi = {}
                         byEmi['groupId'] = group
@@ -1089,7 +1066,7 @@ class Osemosys():
     def updateViewData(self, casename, year, ScId, GroupId, ParamId, TechId, CommId, EmisId, Timeslice, value):
         try:
             jsonPath = Path(Config.DATA_STORAGE,casename, GroupId+'.json')
-            jsonData = File.readFile(jsonPath)
+            jsonData = Storage.readFile(jsonPath)
 
             for obj in jsonData[ParamId][ScId]:
                 if ((obj['TechId'] == TechId if TechId is not None else True) and 
@@ -1097,20 +1074,20 @@ class Osemosys():
                     (obj['EmisId'] == EmisId if EmisId is not None else True) and
                     (obj['TsId'] == Timeslice if Timeslice is not None else True)):
                     obj[year] = value
-            File.writeFile( jsonData, jsonPath)
+            Storage.writeFile( jsonData, jsonPath)
         except(IOError):
             raise IOError
 
     def updateTEViewData(self, casename, ScId, GroupId, ParamId, TechId, EmisId, value):
         try:
             jsonPath = Path(Config.DATA_STORAGE,casename, GroupId+'.json')
-            jsonData = File.readFile(jsonPath)
+            jsonData = Storage.readFile(jsonPath)
 
             for obj in jsonData[ParamId][ScId]:
                 for k,v in obj.items():
                     if ((k == TechId if TechId is not None else True) and 
                         (k == EmisId if EmisId is not None else True)):
                         obj[k] = value
-            File.writeFile( jsonData, jsonPath)
+            Storage.writeFile( jsonData, jsonPath)
         except(IOError):
             raise IOError           
\ No newline at end of file
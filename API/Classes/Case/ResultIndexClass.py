@@ -0,0 +1,151 @@
+import os, logging
+from pathlib import Path
+from threading import Lock
+
+from Classes.Base import Config
+from Classes.Base.StorageClass import Storage
+
+logger = logging.getLogger(__name__)
+
+class ResultIndex():
+    """
+    Per variable index of the result views (view/<group>.json).
+
+    A view group holds every variable and every caserun of the group, {varId: {caserun: [rows]}}.
+    The index splits it into view/index/<group>/<varId>.json ({caserun: [rows]}) and a manifest
+    view/index/<group>.json with row counts, set columns and years per variable, together with the
+    version of the group file it was built from. A query reads the manifest and one variable file,
+    the index is rebuilt when the group file changes (new run, deleted caserun).
+    """
+    #set kolone u redovima view fajlova, ostale kolone su godine (ili tehnologije u RT, ObjectiveValue u R)
+    SETS = ('Tech', 'Comm', 'Emi', 'Stg', 'Con', 'MoId', 'Ts')
+    _locks = {}
+    _lock = Lock()
+
+    def __init__(self, case):
+        self.case = case
+        self.viewFolder = Path(Config.DATA_STORAGE, case, 'view')
+        self.indexFolder = Path(self.viewFolder, 'index')
+
+    def _groupLock(self, group):
+        with ResultIndex._lock:
+            return ResultIndex._locks.setdefault((self.case, group), Lock())
+
+    def groups(self):
+        #view grupe su svi JSON fajlovi u view osim resData i viewDefinitions
+        names = {Storage.baseName(f) for f in os.listdir(self.viewFolder)} if self.viewFolder.is_dir() else set()
+        return sorted(n[:-5] for n in names if n.endswith('.json') and n not in ('resData.json', 'viewDefinitions.json'))
+
+    def version(self, group):
+        _, stat = Storage.source(Path(self.viewFolder, group + '.json'))
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def isYear(key):
+        return key.isdigit()
+
+    def checkGroup(self, group):
+        #grupa ulazi u putanje fajlova indeksa, dozvoljene su samo postojece view grupe
+        if group not in self.groups():
+            raise ValueError('Unknown result group {}!'.format(group))
+
+    def build(self, group):
+        self.checkGroup(group)
+        with self._groupLock(group):
+            version = self.version(group)
+            viewData = Storage.readFile(Path(self.viewFolder, group + '.json'))
+            folder = Path(self.indexFolder, group)
+            os.makedirs(folder, exist_ok=True)
+            variables = {}
+            for varId, caseruns in viewData.items():
+                entry = {}
+                for caserun, rows in caseruns.items():
+                    keys = set()
+                    for row in rows:
+                        keys.update(row)
+                    entry[caserun] = {
+                        "rows": len(rows),
+                        "sets": [s for s in ResultIndex.SETS if s in keys],
+                        "years": sorted(k for k in keys if ResultIndex.isYear(k))
+                    }
+                Storage.writeFile(caseruns, Path(folder, varId + '.json'))
+                variables[varId] = entry
+            #fajlovi varijabli kojih vise nema u grupi
+            for name in os.listdir(folder):
+                if Storage.baseName(name)[:-5] not in variables:
+                    os.remove(Path(folder, name))
+            manifest = {"group": group, "source": version, "vars": variables}
+            Storage.writeFile(manifest, Path(self.indexFolder, group + '.json'))
+            return manifest
+
+    def manifest(self, group):
+        path = Path(self.indexFolder, group + '.json')
+        if Storage.exists(path):
+            manifest = Storage.readFile(path)
+            if manifest.get("source") == self.version(group):
+                return manifest
+        logger.info("Result index of %s/%s is missing or outdated, rebuilding", self.case, group)
+        return self.build(group)
+
+    def findGroup(self, varId):
+        for group in self.groups():
+            if varId in self.manifest(group)["vars"]:
+                return group
+        return None
+
+    def query(self, varId, group=None, caseruns=None, filters=None, years=None, offset=0, limit=None):
+        """
+        Rows of one variable, {"rows": [{"Case": caserun, <set columns>, <years>}], "total": n, ...}.
+
+        caseruns limits the caseruns (all when empty), filters is {set column: [values]} for the columns
+        in SETS, years is [from, to] (inclusive, either may be None), offset/limit page the matching rows.
+        """
+        if group:
+            self.checkGroup(group)
+        group = group or self.findGroup(varId)
+        if group is None:
+            raise FileNotFoundError('No results for {}!'.format(varId))
+        manifest = self.manifest(group)
+        if varId not in manifest["vars"]:
+            raise FileNotFoundError('No results for {}!'.format(varId))
+
+        limit = Config.RESULT_QUERY_LIMIT if limit is None else limit
+        limit = max(0, min(int(limit), Config.RESULT_QUERY_MAX_LIMIT))
+        offset = max(0, int(offset or 0))
+        filters = {k: set(map(str, v)) for k, v in (filters or {}).items() if k in ResultIndex.SETS and v}
+        yearFrom, yearTo = (list(years) + [None, None])[:2] if years else (None, None)
+
+        def yearIn(key):
+            year = int(key)
+            return (yearFrom is None or year >= int(yearFrom)) and (yearTo is None or year <= int(yearTo))
+
+        available = manifest["vars"][varId]
+        selected = [c for c in (caseruns or available) if c in available]
+        data = Storage.readFile(Path(self.indexFolder, group, varId + '.json'))
+
+        rows = []
+        total = 0
+        for caserun in selected:
+            for row in data.get(caserun, []):
+                if any(k in row and str(row[k]) not in v for k, v in filters.items()):
+                    continue
+                total += 1
+                if total <= offset or len(rows) >= limit:
+                    continue
+                out = {"Case": caserun}
+                for key, value in row.items():
+                    if not ResultIndex.isYear(key) or yearIn(key):
+                        out[key] = value
+                rows.append(out)
+
+        yearsAll = sorted({y for c in selected for y in available[c]["years"] if yearIn(y)})
+        return {
+            "varId": varId,
+            "group": group,
+            "caseruns": selected,
+            "years": yearsAll,
+            "offset": offset,
+            "limit": limit,
+            "total": total,
+            "rows": rows
+        }
@@ -0,0 +1,330 @@
+import os, time, shutil, logging, platform, subprocess
+from pathlib import Path
+from threading import Lock
+import numpy as np
+
+from Classes.Base import Config
+from Classes.Base.MetricsClass import Metrics
+from Classes.Base.SolverProcessClass import SolverProcess
+from Classes.Case.SolverOptionsClass import SolverOptions
+from Classes.Case.ArtifactsClass import Artifacts
+from Classes.Case.SolverResultClass import SolverResult
+
+try:
+    import highspy
+    _HAS_HIGHS = True
+except ImportError:
+    #highspy nije obavezan, bez njega highs backend nije dostupan
+    _HAS_HIGHS = False
+
+logger = logging.getLogger(__name__)
+
+class SolverBackend():
+    """
+    Solver of DataFile.run, registered by name in SolverBackends.
+
+    capabilities tell the run pipeline what the backend needs and supports:
+        input       'model' (GMPL model and data.txt) | 'lp' (LP file) | 'arrays' (LpBuilder matrix in
+                    memory, an LP file when LpBuilder does not support the model)
+        solution    'cbc' when results.txt is in CBC -solu format, CSV files and views are generated
+                    from it | 'glpk' for the glpsol report
+        threads     the threads of the solver options are used (and reserved in CoreBudget)
+        duals       the solution has row duals
+        warmStart   basis (LP) or solution (MIP) of a reference caserun
+    solve(task) gets a dict with the files, options and progress channel of the run and returns
+    subprocess.CompletedProcess with 'stopped', result(out, task) parses it with the solution file
+    into a SolverResult.
+    """
+    name = None
+    capabilities = {}
+
+    def available(self):
+        return True
+
+    def readsGzip(self):
+        return False
+
+    def describe(self):
+        return dict(self.capabilities, available=self.available())
+
+    def solve(self, task):
+        raise NotImplementedError
+
+    def result(self, out, task):
+        #results.txt u CBC -solu formatu
+        return SolverResult.cbc(out, task["resFile"], self.name, task.get("started"))
+
+class ExecutableBackend(SolverBackend):
+    """Solver executable bundled in Config.SOLVERs_FOLDER/<folder> or found on the system, resolved once per process."""
+    folder = None
+    exe = None
+
+    def __init__(self):
+        self._resolved = None
+        self._lock = Lock()
+
+    @staticmethod
+    def resolveExecutable(folder: Path, exe_name: str, system: str):
+        # 1) Bundled
+        candidate = folder / exe_name
+        if candidate.exists():
+            if system != "Windows":
+                os.chmod(candidate, os.stat(candidate).st_mode | 0o111)
+            return str(candidate.resolve()), True  # <--- solver je bundlan
+
+        # 2) PATH
+        which = shutil.which(exe_name)
+        if which:
+            return which, False  # <--- koristi sistemski solver
+
+        # 3) macOS standard locations
+        if system == "Darwin":
+            for p in ["/opt/homebrew/bin", "/usr/local/bin", "/usr/bin"]:
+                test = Path(p) / exe_name
+                if test.exists():
+                    return str(test), False
+
+        # 4) Linux standard locations
+        if system == "Linux":
+            for p in ["/usr/bin", "/usr/local/bin", "/bin", "/snap/bin"]:
+                test = Path(p) / exe_name
+                if test.exists():
+                    return str(test), False
+
+        raise FileNotFoundError(f"Solver not found: {exe_name}")
+
+    def resolve(self):
+        #neuspjeh se ne pamti, solver instaliran dok server radi se nadje u sljedecem pozivu
+        with self._lock:
+            if self._resolved is None:
+                system = platform.system()
+                name = self.exe + ('.exe' if system == 'Windows' else '')
+                self._resolved = self.resolveExecutable(Path(Config.SOLVERs_FOLDER, self.folder), name, system)
+            return self._resolved
+
+    @property
+    def path(self):
+        return self.resolve()[0]
+
+    @property
+    def bundled(self):
+        return self.resolve()[1]
+
+    @property
+    def cwd(self):
+        #bundlani solver trazi svoje biblioteke u svom folderu
+        return Path(Config.SOLVERs_FOLDER, self.folder) if self.bundled else None
+
+    def available(self):
+        try:
+            self.resolve()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def execute(self, args, task):
+        return Metrics.runSolver(self.exe, SolverProcess.run,
+            [self.path, *args],
+            cwd=self.cwd,
+            name=self.exe,
+            logFile=task["logFile"],
+            progress=task["progress"],
+            job=task["job"]
+        )
+
+class GlpkBackend(ExecutableBackend):
+    name = 'glpk'
+    folder = 'GLPK'
+    exe = 'glpsol'
+    capabilities = {"input": 'model', "solution": 'glpk', "threads": False, "duals": True, "warmStart": False}
+
+    def solve(self, task):
+        return self.execute(["-m", task["modelFile"], "-d", task["dataFile"], "-o", task["resFile"]], task)
+
+    def result(self, out, task):
+        return SolverResult.glpk(out, task["resFile"], self.name, task.get("started"))
+
+    def writeLp(self, task, modelFile, dataFile, lpFile):
+        #LP fajl za solver kad LpBuilder ne podrzava model
+        return self.execute(["--check", "-m", modelFile, "-d", dataFile, "--wlp", lpFile], task)
+
+class CbcBackend(ExecutableBackend):
+    name = 'cbc'
+    folder = 'COIN-OR'
+    exe = 'cbc'
+    capabilities = {"input": 'lp', "solution": 'cbc', "threads": True, "duals": True, "warmStart": True}
+
+    def readsGzip(self):
+        return Artifacts.gzipLp(self.path)
+
+    def solve(self, task):
+        warm = task.get("warm") or {}
+        args = SolverOptions.cbcArgs(task["profile"], task["lpFile"], mip=task["mip"],
+            basisIn=warm.get("file") if warm.get("mode") == 'basis' else None,
+            mipStart=warm.get("file") if warm.get("mode") == 'mipStart' else None,
+            basisOut=task.get("basisOut"))
+        return self.execute([task["lpFile"], *args, "-printing", "all", "-solu", task["resFile"]], task)
+
+class HighsBackend(SolverBackend):
+    """
+    HiGHS in the server process (highspy). The matrix built by LpBuilder is passed to HiGHS as it is,
+    no LP file is written or read, for a model LpBuilder does not support HiGHS reads the LP file.
+    The solution is written to results.txt in CBC -solu format with the glpk names, so CSV files
+    and views are generated as for CBC. The objective constant is left out as in the LP file CBC
+    reads. The log goes to logfile.txt and the progress channel through the HiGHS log callback.
+    """
+    name = 'highs'
+    capabilities = {"input": 'arrays', "solution": 'cbc', "threads": True, "duals": True, "warmStart": False}
+    STATUS = {
+        'kOptimal': 'Optimal', 'kInfeasible': 'Infeasible', 'kUnbounded': 'Unbounded',
+        'kUnboundedOrInfeasible': 'Infeasible', 'kTimeLimit': 'Stopped on time',
+        'kIterationLimit': 'Stopped on iterations', 'kInterrupt': 'Stopped on ctrl-c',
+        'kHighsInterrupt': 'Stopped on ctrl-c', 'kSolutionLimit': 'Stopped on solutions'
+    }
+    METHODS = {'dual': {'solver': 'simplex', 'simplex_strategy': 1}, 'primal': {'solver': 'simplex', 'simplex_strategy': 4},
+               'barrier': {'solver': 'ipm'}}
+
+    def available(self):
+        return _HAS_HIGHS
+
+    @staticmethod
+    def lp(model):
+        kinds = model.columnKinds()
+        n, m = len(kinds), model.rowCount
+        lp = highspy.HighsLp()
+        lp.num_col_ = n
+        lp.num_row_ = m
+        cost = np.zeros(n)
+        cost[model.objCols] = model.objVals
+        lp.col_cost_ = cost
+        lp.col_lower_ = np.where(kinds == 'free', -highspy.kHighsInf, 0.0)
+        lp.col_upper_ = np.full(n, highspy.kHighsInf)
+        senses = np.array(model.senses, dtype=object)
+        lp.row_lower_ = np.where(senses == '<=', -highspy.kHighsInf, model.rhs)
+        lp.row_upper_ = np.where(senses == '>=', highspy.kHighsInf, model.rhs)
+        #COO iz LpBuilder je sortiran po redovima, to je CSR
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        lp.a_matrix_.start_ = np.searchsorted(model.rows, np.arange(m + 1)).astype(np.int32)
+        lp.a_matrix_.index_ = model.cols.astype(np.int32)
+        lp.a_matrix_.value_ = model.vals
+        if (kinds == 'integer').any():
+            lp.integrality_ = [highspy.HighsVarType.kInteger if k == 'integer' else highspy.HighsVarType.kContinuous for k in kinds]
+        return lp
+
+    @staticmethod
+    def options(h, profile):
+        if profile["threads"] > 1:
+            h.setOptionValue('threads', int(profile["threads"]))
+        if profile["seconds"] is not None:
+            h.setOptionValue('time_limit', float(profile["seconds"]))
+        if profile["ratioGap"] is not None:
+            h.setOptionValue('mip_rel_gap', float(profile["ratioGap"]))
+        if profile["presolve"] == 'off':
+            h.setOptionValue('presolve', 'off')
+        for option, value in HighsBackend.METHODS.get(profile["method"], {}).items():
+            h.setOptionValue(option, value)
+
+    @staticmethod
+    def writeSolution(resFile, header, rowNames, colNames, solution):
+        def lines(names, values, duals):
+            for i, (name, value, dual) in enumerate(zip(names, values.tolist(), duals.tolist())):
+                yield '{:>7} {:<55} {:>15.8g} {:>15.8g}\n'.format(i, name, value, dual)
+        with open(resFile, 'w') as f:
+            f.write(header + '\n')
+            if solution.value_valid:
+                f.writelines(lines(rowNames, np.asarray(solution.row_value) + 0.0, np.asarray(solution.row_dual) + 0.0))
+                f.writelines(lines(colNames, np.asarray(solution.col_value) + 0.0, np.asarray(solution.col_dual) + 0.0))
+
+    def solve(self, task):
+        log = open(task["logFile"], 'a', encoding='utf-8', buffering=1) if task.get("logFile") else None
+        progress = task.get("progress")
+        lines = []
+        lock = Lock()
+
+        def sink(event):
+            with lock:
+                lines.append(event.message)
+                if log:
+                    log.write(event.message)
+                if progress is not None:
+                    for line in event.message.splitlines():
+                        progress.line(self.name, 'stdout', line)
+
+        h = highspy.Highs()
+        h.setOptionValue('log_to_console', False)
+        h.cbLogging.subscribe(sink)
+        #cancelSolve() se provjerava u interrupt callbackovima simplexa, IPM i MIP
+        h.HandleUserInterrupt = True
+        Metrics.SOLVERS.inc(self.name)
+        try:
+            model = task.get("model")
+            if model is not None:
+                h.passModel(HighsBackend.lp(model))
+            else:
+                h.readModel(task["lpFile"])
+            HighsBackend.options(h, task["profile"])
+            cpu, wall = time.process_time(), time.perf_counter()
+            with SolverProcess.inProcess(task.get("job"), self.name, h.cancelSolve) as entry:
+                status = h.run()
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+            modelStatus = h.getModelStatus()
+            result = HighsBackend.STATUS.get(modelStatus.name, h.modelStatusToString(modelStatus))
+            info = h.getInfo()
+            header = '{} - objective value {:.8f}'.format(result, info.objective_function_value)
+            if model is not None:
+                rowNames, colNames = model.rowNames(), model.columnNames()[0]
+            else:
+                lp = h.getLp()
+                rowNames, colNames = lp.row_names_, lp.col_names_
+            HighsBackend.writeSolution(task["resFile"], header, rowNames, colNames, h.getSolution())
+        finally:
+            Metrics.SOLVERS.dec(self.name)
+            h.cbLogging.clear()
+            if log:
+                log.close()
+
+        returncode = 0 if status != highspy.HighsStatus.kError else 1
+        Metrics.SOLVER_EXIT.inc(self.name, str(returncode))
+        #sazetak na pocetku izlaza, DataFile.run iz njega pravi poruku runa
+        summary = 'HiGHS {} - model status {}\n{}\nTotal time (CPU seconds):       {:.2f}   (Wallclock seconds):       {:.2f}\n\n'.format(
+            h.version(), h.modelStatusToString(modelStatus).lower(), header, cpu, wall)
+        out = subprocess.CompletedProcess(['highs', task.get("lpFile") or 'model'], returncode, summary + ''.join(lines), '')
+        out.stopped = entry["stopped"]
+        #HiGHS ne pise CBC linije sa iteracijama, brojevi se uzimaju iz info
+        iterations = [info.simplex_iteration_count, info.ipm_iteration_count]
+        out.iterations = next((int(i) for i in iterations if i and i > 0), 0)
+        out.nodes = int(info.mip_node_count) if info.mip_node_count and info.mip_node_count > 0 else None
+        return out
+
+class SolverBackends():
+    """Registry of solver backends by name (the 'solver' of /run and /batchRun, case insensitive)."""
+    _backends = {}
+
+    @staticmethod
+    def register(backend):
+        SolverBackends._backends[backend.name] = backend
+        return backend
+
+    @staticmethod
+    def backend(name):
+        backend = SolverBackends._backends.get(str(name).lower())
+        if backend is None:
+            raise ValueError('Unknown solver {}!'.format(name))
+        return backend
+
+    @staticmethod
+    def get(name):
+        """Backend that can run, ValueError for an unknown or unavailable solver."""
+        backend = SolverBackends.backend(name)
+        if not backend.available():
+            raise ValueError('Solver {} is not available!'.format(name))
+        return backend
+
+    @staticmethod
+    def describe():
+        return {name: backend.describe() for name, backend in SolverBackends._backends.items()}
+
+SolverBackends.register(GlpkBackend())
+SolverBackends.register(CbcBackend())
+SolverBackends.register(HighsBackend())
@@ -0,0 +1,150 @@
+import os, re, gzip, mmap, logging
+from contextlib import contextmanager
+from threading import Condition
+
+from Classes.Base import Config
+
+logger = logging.getLogger(__name__)
+
+class SolverOptions():
+    """
+    CBC option profile of a caserun, stored with the caserun in resData ("SolverOptions").
+
+    threads       CBC threads (parallel branch and bound), capped at Config.SOLVER_CORES
+    seconds       time limit, None for no limit
+    ratioGap      relative MIP gap at which CBC stops, None for CBC default (0)
+    presolve      'on' | 'off' | 'more'
+    method        'auto' (CBC solve) | 'dual' | 'primal' | 'barrier'
+    warmStart     reference caserun of the same case whose basis (LP) or solution (MIP) seeds CBC
+
+    Missing keys are taken from Config.CBC_OPTIONS. Only values that differ from the CBC defaults
+    are passed on the command line, so the default profile runs CBC exactly as before. method
+    applies to LP problems, a problem with integer columns is always solved with branch and bound
+    (solve), barrier in CBC does not branch.
+    """
+    KEYS = ('threads', 'seconds', 'ratioGap', 'presolve', 'method', 'warmStart')
+    PRESOLVE = ('on', 'off', 'more')
+    METHODS = {'auto': 'solve', 'dual': 'dualSimplex', 'primal': 'primalSimplex', 'barrier': 'barrier'}
+
+    @staticmethod
+    def _number(options, key, cast, low, high=None):
+        value = options.get(key)
+        if value is None or value == '':
+            return None
+        try:
+            value = cast(value)
+        except (TypeError, ValueError):
+            raise ValueError('Solver option {} must be a number!'.format(key))
+        if value < low or (high is not None and value > high):
+            raise ValueError('Solver option {} is out of range!'.format(key))
+        return value
+
+    @staticmethod
+    def normalize(options=None):
+        """Validated profile with every key, ValueError for unknown keys and bad values."""
+        options = dict(options or {})
+        unknown = set(options) - set(SolverOptions.KEYS)
+        if unknown:
+            raise ValueError('Unknown solver options {}!'.format(', '.join(sorted(unknown))))
+        merged = {**Config.CBC_OPTIONS, **{k: v for k, v in options.items() if v is not None}}
+        profile = {
+            #profil moze doci sa masine sa vise jezgara (backup), threads se ogranicava a ne odbija
+            "threads": min(SolverOptions._number(merged, 'threads', int, 1) or 1, Config.SOLVER_CORES),
+            "seconds": SolverOptions._number(merged, 'seconds', float, 1),
+            "ratioGap": SolverOptions._number(merged, 'ratioGap', float, 0, 1),
+            "presolve": str(merged.get('presolve') or 'on').lower(),
+            "method": str(merged.get('method') or 'auto').lower(),
+            "warmStart": str(merged['warmStart']) if merged.get('warmStart') else None
+        }
+        if profile["presolve"] not in SolverOptions.PRESOLVE:
+            raise ValueError('Solver option presolve must be one of {}!'.format(', '.join(SolverOptions.PRESOLVE)))
+        if profile["method"] not in SolverOptions.METHODS:
+            raise ValueError('Solver option method must be one of {}!'.format(', '.join(SolverOptions.METHODS)))
+        return profile
+
+    #naslov sekcije, LP fajl pisan na windowsu ima CRLF
+    GENERALS = re.compile(rb'\nGenerals\r?\n')
+
+    @staticmethod
+    def isMip(lpFile):
+        #glpk pise cjelobrojne kolone u Generals sekciji na kraju LP fajla
+        if str(lpFile).endswith('.gz'):
+            tail = b''
+            with gzip.open(lpFile, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    data = tail + chunk
+                    if SolverOptions.GENERALS.search(data):
+                        return True
+                    tail = data[-11:]
+            return False
+        with open(lpFile, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = len(mm)
+                while True:
+                    end = mm.rfind(b'\nGenerals', 0, end)
+                    if end == -1:
+                        return False
+                    if SolverOptions.GENERALS.match(mm, end):
+                        return True
+
+    @staticmethod
+    def cbcArgs(profile, lpFile, mip=None, basisIn=None, mipStart=None, basisOut=None):
+        """
+        CBC arguments between the LP file and -printing: options, warm start, the solve command and
+        -basisOut (after the command, CBC executes actions in order).
+        """
+        args = []
+        if profile["threads"] > 1:
+            args += ['-threads', str(profile["threads"])]
+        if profile["seconds"] is not None:
+            args += ['-seconds', '{:g}'.format(profile["seconds"])]
+        if profile["ratioGap"] is not None:
+            args += ['-ratioGap', '{:g}'.format(profile["ratioGap"])]
+        if profile["presolve"] != 'on':
+            args += ['-presolve', profile["presolve"]]
+        mip = SolverOptions.isMip(lpFile) if mip is None else mip
+        if basisIn and not mip:
+            args += ['-basisIn', str(basisIn)]
+        if mipStart and mip:
+            args += ['-mipStart', str(mipStart)]
+        command = SolverOptions.METHODS[profile["method"]]
+        if command != 'solve' and mip:
+            logger.info("%s has integer columns, method %s is replaced with solve", lpFile, profile["method"])
+            command = 'solve'
+        args.append(command)
+        #baza LP rjesenja za warm start drugih caseruna, za MIP je dovoljan results.txt
+        if basisOut and not mip:
+            args += ['-basisOut', str(basisOut)]
+        return args
+
+class CoreBudget():
+    """
+    Process wide budget of Config.SOLVER_CORES cores for CBC processes.
+
+    A run reserves its CBC threads for the solve stage and waits while the running solvers already
+    use the budget, so parallel batch runs with several threads each do not oversubscribe the machine.
+    A run asking for more than the budget gets the whole budget.
+    """
+    _cond = Condition()
+    _used = 0
+
+    @staticmethod
+    @contextmanager
+    def reserve(threads):
+        threads = max(1, min(int(threads), Config.SOLVER_CORES))
+        with CoreBudget._cond:
+            CoreBudget._cond.wait_for(lambda: CoreBudget._used + threads <= Config.SOLVER_CORES)
+            CoreBudget._used += threads
+        try:
+            yield threads
+        finally:
+            with CoreBudget._cond:
+                CoreBudget._used -= threads
+                CoreBudget._cond.notify_all()
+
+    @staticmethod
+    def used():
+        with CoreBudget._cond:
+            return CoreBudget._used
@@ -0,0 +1,208 @@
+import os, re, logging
+
+from Classes.Case.ArtifactsClass import Artifacts
+
+logger = logging.getLogger(__name__)
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class SolverResult():
+    """
+    Outcome of a solve: status, objective, iterations, nodes and times of the solver.
+
+    Parsed in one pass over the solver output and the header of the solution file, cbc() for CBC
+    (and HiGHS, which writes the same summary and -solu file), glpk() for the glpsol output and its
+    -o report. The solution file is written by the solver at the end, its status wins over the
+    output lines (the last status line of the output otherwise), an ERROR line or a failed process
+    makes the result an error, a solver stopped by timeout or cancel is 'stopped'.
+
+    status      'optimal' | 'infeasible' | 'unbounded' | 'stopped' | 'error' | 'unknown'
+    statusFlag  status_code of /run: 'success' (optimal), 'error', 'warning' for the rest
+    message     status line and the time line of the solver, the 'timer' message of /run
+    postProcess CSV files and views are generated only from an optimal solution
+    """
+    STATUSES = ('optimal', 'infeasible', 'unbounded', 'stopped', 'error', 'unknown')
+    #"Optimal - objective value 4.00000000", "Integer infeasible - objective value 0.5", "Stopped on time - ..."
+    HEADER = re.compile(r'^(.+?) - objective value\s+(\S+)')
+    #linija izlaza -> (polje, vrijednost), prvi pattern koji odgovara
+    CBC = (
+        (re.compile(r'^\w+ objective\s+(\S+)\s+-\s+(\d+) iterations'), lambda m: {"objective": _number(m.group(1)), "lpIterations": int(m.group(2))}),
+        (re.compile(r'^Total iterations:\s+(\d+)'), lambda m: {"iterations": int(m.group(1))}),
+        (re.compile(r'^Enumerated nodes:\s+(\d+)'), lambda m: {"nodes": int(m.group(1))}),
+        (re.compile(r'^Objective value:\s+(\S+)'), lambda m: {"objective": _number(m.group(1))}),
+        (re.compile(r'^Result - (.+?)\s*$'), lambda m: {"statusLine": m.group(0).strip()}),
+        (re.compile(r'^((?:Optimal|Primal infeasible|Dual infeasible|Stopped on \w+) - objective value .*?)\s*$'),
+            lambda m: {"statusLine": m.group(1)}),
+        (re.compile(r'^(?:Problem is|Pre-processing says) (infeasible|unbounded)'), lambda m: {"statusLine": m.group(0).strip()}),
+        (re.compile(r'^Total time \(CPU seconds\):\s+(\S+)\s+\(Wallclock seconds\):\s+(\S+)'),
+            lambda m: {"cpuSeconds": _number(m.group(1)), "wallSeconds": _number(m.group(2)), "timeLine": m.group(0).strip()}),
+    )
+    GLPK = (
+        (re.compile(r'^[* ]\s*(\d+): obj =\s+(\S+)'), lambda m: {"iterations": int(m.group(1)), "objective": _number(m.group(2))}),
+        (re.compile(r'^\+\s*(\d+): mip =\s+(\S+)'), lambda m: {"iterations": int(m.group(1)), "objective": _number(m.group(2))}),
+        (re.compile(r'^([A-Z][A-Z ;]*(?:SOLUTION|TERMINATED|EXCEEDED)[A-Z ;]*)$'), lambda m: {"statusLine": m.group(1).strip()}),
+        (re.compile(r'^Time used:\s+(\S+) secs'), lambda m: {"cpuSeconds": _number(m.group(1)), "timeLine": m.group(0).strip()}),
+    )
+    #glpsol -o izvjestaj: "Status:     INTEGER OPTIMAL", "Objective:  cost = 4 (MINimum)"
+    GLPK_REPORT = (
+        (re.compile(r'^Status:\s+(.+?)\s*$'), lambda m: {"reportStatus": m.group(1)}),
+        (re.compile(r'^Objective:\s+\S+ = (\S+)'), lambda m: {"objective": _number(m.group(1))}),
+    )
+
+    def __init__(self, solver, status='unknown', objective=None, iterations=None, nodes=None, cpuSeconds=None,
+                 wallSeconds=None, statusLine=None, timeLine=None, returncode=None, stopped=None, error=None):
+        self.solver = solver
+        self.status = status
+        self.objective = objective
+        self.iterations = iterations
+        self.nodes = nodes
+        self.cpuSeconds = cpuSeconds
+        self.wallSeconds = wallSeconds
+        self.statusLine = statusLine
+        self.timeLine = timeLine
+        self.returncode = returncode
+        self.stopped = stopped
+        self.error = error
+
+    @staticmethod
+    def classify(text):
+        """Status of a CBC/HiGHS/glpsol status line."""
+        text = (text or '').lower()
+        if 'infeasible' in text or 'no primal feasible' in text or 'no integer feasible' in text or 'empty' in text:
+            return 'infeasible'
+        if 'unbounded' in text:
+            return 'unbounded'
+        if text.startswith('stopped') or 'terminated' in text or 'exceeded' in text or 'limit' in text or 'ctrl-c' in text:
+            return 'stopped'
+        if 'optimal' in text:
+            return 'optimal'
+        return 'unknown'
+
+    @staticmethod
+    def _scan(text, patterns, fields):
+        for line in (text or '').splitlines():
+            for pattern, parse in patterns:
+                m = pattern.search(line)
+                if m:
+                    #posljednja vrijednost, glpsol za MIP prvo javi status LP relaksacije
+                    fields.update({k: v for k, v in parse(m).items() if v is not None})
+                    break
+            if 'ERROR' in line and 'error' not in fields:
+                fields["error"] = line.strip()
+        return fields
+
+    @staticmethod
+    def _written(path, since):
+        #fajl stariji od since je od prethodnog runa, solver nije napisao novi
+        source = Artifacts.existing(path) if path is not None else None
+        if source is None or (since is not None and os.path.getmtime(source) < since):
+            return None
+        return source
+
+    @staticmethod
+    def header(solutionFile, since=None):
+        """(status line, objective) of a CBC -solu file (or .gz), None when the solver did not write it."""
+        source = SolverResult._written(solutionFile, since)
+        if source is None:
+            return None
+        with Artifacts.open(source, errors='replace') as f:
+            line = f.readline().strip()
+        m = SolverResult.HEADER.match(line)
+        return (line, _number(m.group(2)) if m else None)
+
+    @staticmethod
+    def _finish(result, fields, status):
+        result.objective = fields.get("objective")
+        result.cpuSeconds = fields.get("cpuSeconds")
+        result.wallSeconds = fields.get("wallSeconds")
+        result.statusLine = fields.get("statusLine")
+        result.timeLine = fields.get("timeLine")
+        result.error = fields.get("error")
+        if result.returncode not in (None, 0) or result.stopped:
+            result.status = 'stopped' if result.stopped else 'error'
+        elif result.error:
+            result.status = 'error'
+        else:
+            result.status = status
+        if result.status in ('infeasible', 'unbounded', 'error'):
+            #vrijednost funkcije cilja nema rjesenje iza sebe
+            result.objective = None
+        return result
+
+    @staticmethod
+    def cbc(out, solutionFile=None, solver='cbc', since=None):
+        """Result of CBC (or HiGHS) from its CompletedProcess and results.txt."""
+        fields = SolverResult._scan(out.stdout, SolverResult.CBC, {})
+        result = SolverResult(solver, returncode=out.returncode, stopped=getattr(out, 'stopped', None))
+        #LP: "Optimal objective 4 - 2 iterations", MIP: "Total iterations: 120" poslije branch and bound
+        result.iterations = getattr(out, 'iterations', None)
+        if result.iterations is None:
+            result.iterations = fields.get("lpIterations", fields.get("iterations"))
+        result.nodes = getattr(out, 'nodes', None) or fields.get("nodes")
+        header = SolverResult.header(solutionFile, since)
+        if header is not None:
+            fields["statusLine"] = header[0]
+            if header[1] is not None:
+                fields["objective"] = header[1]
+        return SolverResult._finish(result, fields, SolverResult.classify(fields.get("statusLine")))
+
+    @staticmethod
+    def glpk(out, reportFile=None, solver='glpk', since=None):
+        """Result of glpsol from its CompletedProcess and the -o report."""
+        fields = SolverResult._scan(out.stdout, SolverResult.GLPK, {})
+        result = SolverResult(solver, returncode=out.returncode, stopped=getattr(out, 'stopped', None))
+        result.iterations = fields.get("iterations")
+        status = SolverResult.classify(fields.get("statusLine"))
+        source = SolverResult._written(reportFile, since)
+        if source is not None:
+            report = {}
+            with Artifacts.open(source, errors='replace') as f:
+                #zaglavlje izvjestaja je prije tabele redova
+                for line in f:
+                    if line.startswith('   No.'):
+                        break
+                    for pattern, parse in SolverResult.GLPK_REPORT:
+                        m = pattern.search(line)
+                        if m:
+                            report.update(parse(m))
+            if "reportStatus" in report:
+                #"UNDEFINED" i "INFEASIBLE (FINAL)" iz izvjestaja, "OPTIMAL" i "INTEGER OPTIMAL"
+                status = SolverResult.classify(report["reportStatus"])
+                fields.setdefault("statusLine", report["reportStatus"])
+            if report.get("objective") is not None:
+                fields["objective"] = report["objective"]
+        return SolverResult._finish(result, fields, status)
+
+    @property
+    def statusFlag(self):
+        if self.status == 'optimal':
+            return 'success'
+        if self.status == 'error':
+            return 'error'
+        return 'warning'
+
+    @property
+    def postProcess(self):
+        return self.status == 'optimal'
+
+    @property
+    def message(self):
+        parts = [p for p in (self.error if self.status == 'error' else None, self.statusLine, self.timeLine) if p]
+        return ' - '.join(parts) or 'Solver finished without a status — check logs.'
+
+    def toDict(self):
+        return {
+            "solver": self.solver,
+            "status": self.status,
+            "objective": self.objective,
+            "iterations": self.iterations,
+            "nodes": self.nodes,
+            "cpuSeconds": self.cpuSeconds,
+            "wallSeconds": self.wallSeconds,
+            "message": self.message,
+            "stopped": self.stopped
+        }
@@ -1,6 +1,5 @@
-import os
 from Classes.Base import Config
-from Classes.Base.FileClass import File
+from Classes.Base.StorageClass import Storage
 from Classes.Case.OsemosysClass import Osemosys
 from Classes.Case.CaseClass import Case
 
@@ -12,7 +11,7 @@ class UpdateCase(Osemosys):
 
     def update_R(self):
         try:
-            rJson = File.readFile(self.rPath) 
+            rJson = Storage.readFile(self.rPath) 
             Rsource = self.R(rJson)
             scenarios = self.genDataUpdate['osy-scenarios']
             Rdata = {}
@@ -30,13 +29,13 @@ class UpdateCase(Osemosys):
                     Rdata[r['id']][sc['ScenarioId']].append(chunk)
 
 
-            File.writeFile( Rdata, self.rPath)
+            Storage.writeFile( Rdata, self.rPath)
         except(IOError):
             raise IOError
 
     def update_RY(self):
         try:
-            ryJson = File.readFile(self.ryPath) 
+            ryJson = Storage.readFile(self.ryPath) 
             RYsource = self.RY(ryJson)
             years = self.genDataUpdate['osy-years']
             scenarios = self.genDataUpdate['osy-scenarios']
@@ -57,13 +56,13 @@ class UpdateCase(Osemosys):
                             chunk[year] = None
                     RYdata[ry['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYdata, self.ryPath)
+            Storage.writeFile( RYdata, self.ryPath)
         except(IOError):
             raise IOError
 
     def update_RT(self):
         try:
-            rtJson = File.readFile(self.rtPath) 
+            rtJson = Storage.readFile(self.rtPath) 
             RTsource = self.RT(rtJson)
             techs = self.genDataUpdate['osy-tech']
             scenarios = self.genDataUpdate['osy-scenarios']
@@ -81,13 +80,13 @@ class UpdateCase(Osemosys):
                         else:
                             chunk[tech['TechId']] = None
                     RTdata[rt['id']][sc['ScenarioId']].append(chunk)
-            File.writeFile( RTdata, self.rtPath)
+            Storage.writeFile( RTdata, self.rtPath)
         except(IOError):
             raise IOError
 
     def update_RE(self):
         try:
-            reJson = File.readFile(self.rePath) 
+            reJson = Storage.readFile(self.rePath) 
             REsource = self.RE(reJson)
             emis = self.genDataUpdate['osy-emis']
             scenarios = self.genDataUpdate['osy-scenarios']
@@ -108,14 +107,14 @@ class UpdateCase(Osemosys):
                     RTdata[rt['id']][sc['ScenarioId']].append(chunk)
 
 
-            File.writeFile( RTdata, self.rePath)
+            Storage.writeFile( RTdata, self.rePath)
         except(IOError):
             raise IOError
 
     def update_RS(self):
         try:
-            if os.path.isfile(self.rsPath):
-                rsJson = File.readFile(self.rsPath) 
+            if Storage.exists(self.rsPath):
+                rsJson = Storage.readFile(self.rsPath) 
                 RSsource = self.RS(rsJson)
                 stgs = self.genDataUpdate['osy-stg']
                 scenarios = self.genDataUpdate['osy-scenarios']
@@ -134,7 +133,7 @@ class UpdateCase(Osemosys):
                             else:
                                 chunk[stg['StgId']] = None
                         RSdata[rs['id']][sc['ScenarioId']].append(chunk)
-                File.writeFile( RSdata, self.rsPath)
+                Storage.writeFile( RSdata, self.rsPath)
             else:
                 case = Case(self.case, self.genDataUpdate)
                 case.default_RS()
@@ -143,8 +142,8 @@ class UpdateCase(Osemosys):
         
     def update_RTSM(self):
         try:
-            if os.path.isfile(self.rtsmPath):
-                rtsmJson = File.readFile(self.rtsmPath) 
+            if Storage.exists(self.rtsmPath):
+                rtsmJson = Storage.readFile(self.rtsmPath) 
                 RTSMsource = self.RTSM(rtsmJson)
 
                 stgs = self.genDataUpdate['osy-stg']
@@ -175,7 +174,7 @@ class UpdateCase(Osemosys):
                                         chunk['Value'] = None
                                     RTSMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-                File.writeFile( RTSMdata, self.rtsmPath)
+                Storage.writeFile( RTSMdata, self.rtsmPath)
             else:
                 case = Case(self.case, self.genDataUpdate)
                 case.default_RTSM()
@@ -184,7 +183,7 @@ class UpdateCase(Osemosys):
         
     def update_RYCn(self):
         try:
-            rycnJson = File.readFile(self.rycnPath) 
+            rycnJson = Storage.readFile(self.rycnPath) 
             RYCnsource = self.RYCn(rycnJson)
             years = self.genDataUpdate['osy-years']
             scenarios = self.genDataUpdate['osy-scenarios']
@@ -206,13 +205,13 @@ class UpdateCase(Osemosys):
                                 chunk[year] = None
                         RYCndata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYCndata, self.rycnPath)
+            Storage.writeFile( RYCndata, self.rycnPath)
         except(IOError):
             raise IOError
 
     def update_RYT(self):
         try:
-            rytJson = File.readFile(self.rytPath) 
+            rytJson = Storage.readFile(self.rytPath) 
             RYTsource = self.RYT(rytJson)
             years = self.genDataUpdate['osy-years']
             techs = self.genDataUpdate['osy-tech']
@@ -236,14 +235,14 @@ class UpdateCase(Osemosys):
                                 chunk[year] = None
                         RYTdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTdata, self.rytPath)
+            Storage.writeFile( RYTdata, self.rytPath)
         except(IOError):
             raise IOError
 
     def update_RYS(self):
         try:
-            if os.path.isfile(self.rysPath):
-                rysJson = File.readFile(self.rysPath) 
+            if Storage.exists(self.rysPath):
+                rysJson = Storage.readFile(self.rysPath) 
                 RYSsource = self.RYS(rysJson)
                 years = self.genDataUpdate['osy-years']
                 stgs = self.genDataUpdate['osy-stg']
@@ -267,7 +266,7 @@ class UpdateCase(Osemosys):
                                     chunk[year] = None
                             RYSdata[rys['id']][sc['ScenarioId']].append(chunk)
 
-                File.writeFile( RYSdata, self.rysPath)
+                Storage.writeFile( RYSdata, self.rysPath)
             else:
                 case = Case(self.case, self.genDataUpdate)
                 case.default_RYS()
@@ -276,7 +275,7 @@ class UpdateCase(Osemosys):
         
     def update_RYTCn(self):
         try:
-            rytcnJson = File.readFile(self.rytcnPath) 
+            rytcnJson = Storage.readFile(self.rytcnPath) 
             RYTCnsource = self.RYTCn(rytcnJson)
             years = self.genDataUpdate['osy-years']
             scenarios = self.genDataUpdate['osy-scenarios']
@@ -305,13 +304,13 @@ class UpdateCase(Osemosys):
                                         chunk[year] = None
                                 RYTCndata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTCndata, self.rytcnPath)
+            Storage.writeFile( RYTCndata, self.rytcnPath)
         except(IOError):
             raise IOError
 
     def update_RYTM(self):
         try:
-            rytmJson = File.readFile(self.rytmPath) 
+            rytmJson = Storage.readFile(self.rytmPath) 
             RYTMsource = self.RYTM(rytmJson)
 
             mo = int(self.genDataUpdate['osy-mo'])+1
@@ -338,14 +337,14 @@ class UpdateCase(Osemosys):
                                     chunk[year] = None
                             RYTMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTMdata, self.rytmPath)
+            Storage.writeFile( RYTMdata, self.rytmPath)
 
         except(IOError):
             raise IOError
 
     def update_RYC(self):
         try:
-            rycJson = File.readFile(self.rycPath) 
+            rycJson = Storage.readFile(self.rycPath) 
             RYCsource = self.RYC(rycJson)
             years = self.genDataUpdate['osy-years']
             comms = self.genDataUpdate['osy-comm']
@@ -368,13 +367,13 @@ class UpdateCase(Osemosys):
                                 chunk[year] = None
                         RYCdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYCdata, self.rycPath)
+            Storage.writeFile( RYCdata, self.rycPath)
         except(IOError):
             raise IOError
 
     def update_RYE(self):
         try:
-            ryeJson = File.readFile(self.ryePath) 
+            ryeJson = Storage.readFile(self.ryePath) 
             RYEsource = self.RYE(ryeJson)
             years = self.genDataUpdate['osy-years']
             emis = self.genDataUpdate['osy-emis']
@@ -397,13 +396,13 @@ class UpdateCase(Osemosys):
                                 chunk[year] = None
                         RYEdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYEdata, self.ryePath)
+            Storage.writeFile( RYEdata, self.ryePath)
         except(IOError):
             raise IOError
 
     def update_RYTs(self):
         try:
-            rytsJson = File.readFile(self.rytsPath) 
+            rytsJson = Storage.readFile(self.rytsPath) 
             RYTssource = self.RYTs(rytsJson)
             years = self.genDataUpdate['osy-years']
             scenarios = self.genDataUpdate['osy-scenarios']
@@ -425,14 +424,14 @@ class UpdateCase(Osemosys):
                                 chunk[year] = None
                         RYTsdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTsdata, self.rytsPath)
+            Storage.writeFile( RYTsdata, self.rytsPath)
         except(IOError):
             raise IOError
 
     def update_RYDtb(self):
         try:
-            if os.path.isfile(self.rydtbPath):
-                rydtbJson = File.readFile(self.rydtbPath) 
+            if Storage.exists(self.rydtbPath):
+                rydtbJson = Storage.readFile(self.rydtbPath) 
                 RYDtbsource = self.RYDtb(rydtbJson)
                 years = self.genDataUpdate['osy-years']
                 scenarios = self.genDataUpdate['osy-scenarios']
@@ -453,7 +452,7 @@ class UpdateCase(Osemosys):
                                 else:
                                     chunk[year] = None
                             RYDtbdata[ryt['id']][sc['ScenarioId']].append(chunk)
-                File.writeFile( RYDtbdata, self.rydtbPath)
+                Storage.writeFile( RYDtbdata, self.rydtbPath)
             else:
                 case = Case(self.case, self.genDataUpdate)
                 case.default_RYDtb()
@@ -463,8 +462,8 @@ class UpdateCase(Osemosys):
 
     def update_RYSeDt(self):
         try:
-            if os.path.isfile(self.rysedtPath):
-                rysedtJson = File.readFile(self.rysedtPath) 
+            if Storage.exists(self.rysedtPath):
+                rysedtJson = Storage.readFile(self.rysedtPath) 
                 RYSeDtsource = self.RYSeDt(rysedtJson)
 
                 years = self.genDataUpdate['osy-years']
@@ -491,7 +490,7 @@ class UpdateCase(Osemosys):
                                         chunk[year] = None
                                 RYSeDtdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-                File.writeFile( RYSeDtdata, self.rysedtPath)
+                Storage.writeFile( RYSeDtdata, self.rysedtPath)
             else:
                 case = Case(self.case, self.genDataUpdate)
                 case.default_RYSeDt()
@@ -500,7 +499,7 @@ class UpdateCase(Osemosys):
               
     def update_RYTC(self):
         try:
-            rytcJson = File.readFile(self.rytcPath) 
+            rytcJson = Storage.readFile(self.rytcPath) 
             RYTCsource = self.RYTC(rytcJson)
 
             years = self.genDataUpdate['osy-years']
@@ -527,14 +526,14 @@ class UpdateCase(Osemosys):
                                         chunk[year] = None
                                 RYTCdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTCdata, self.rytcPath)
+            Storage.writeFile( RYTCdata, self.rytcPath)
 
         except(IOError):
             raise IOError
 
     def update_RYTCM(self):
         try:
-            rytcmJson = File.readFile(self.rytcmPath) 
+            rytcmJson = Storage.readFile(self.rytcmPath) 
             RYTCMsource = self.RYTCM(rytcmJson)
 
             years = self.genDataUpdate['osy-years']
@@ -565,15 +564,15 @@ class UpdateCase(Osemosys):
                                             chunk[year] = None
                                     RYTEMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTEMdata, self.rytcmPath)
+            Storage.writeFile( RYTEMdata, self.rytcmPath)
 
         except(IOError):
             raise IOError
 
     def update_RYTSM(self):
         try:
-            if os.path.isfile(self.rytsmPath):
-                rytsmJson = File.readFile(self.rytsmPath) 
+            if Storage.exists(self.rytsmPath):
+                rytsmJson = Storage.readFile(self.rytsmPath) 
                 RYTSMsource = self.RYTSM(rytsmJson)
 
                 years = self.genDataUpdate['osy-years']
@@ -606,7 +605,7 @@ class UpdateCase(Osemosys):
                                     RYTSMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
 
-                File.writeFile( RYTSMdata, self.rytsmPath)
+                Storage.writeFile( RYTSMdata, self.rytsmPath)
             else:
                 case = Case(self.case, self.genDataUpdate)
                 case.default_RYTSM()
@@ -615,7 +614,7 @@ class UpdateCase(Osemosys):
         
     def update_RYTE(self):
         try:
-            ryteJson = File.readFile(self.rytePath) 
+            ryteJson = Storage.readFile(self.rytePath) 
             RYTEsource = self.RYTE(ryteJson)
 
             years = self.genDataUpdate['osy-years']
@@ -643,14 +642,14 @@ class UpdateCase(Osemosys):
                                         chunk[year] = None
                                 RYTEdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTEdata, self.rytePath)
+            Storage.writeFile( RYTEdata, self.rytePath)
 
         except(IOError):
             raise IOError
 
     def update_RYTEM(self):
         try:
-            rytemJson = File.readFile(self.rytemPath) 
+            rytemJson = Storage.readFile(self.rytemPath) 
             RYTEMsource = self.RYTEM(rytemJson)
 
             years = self.genDataUpdate['osy-years']
@@ -684,14 +683,14 @@ class UpdateCase(Osemosys):
                                             chunk[year] = None
                                     RYTEMdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTEMdata, self.rytemPath)
+            Storage.writeFile( RYTEMdata, self.rytemPath)
 
         except(IOError):
             raise IOError
 
     def update_RYTTs(self):
         try:
-            ryttsJson = File.readFile(self.ryttsPath) 
+            ryttsJson = Storage.readFile(self.ryttsPath) 
             RYTTssource = self.RYTTs(ryttsJson)
 
             years = self.genDataUpdate['osy-years']
@@ -718,13 +717,13 @@ class UpdateCase(Osemosys):
                                     chunk[year] = None
                             RYTTsdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYTTsdata, self.ryttsPath)
+            Storage.writeFile( RYTTsdata, self.ryttsPath)
         except(IOError):
             raise IOError
 
     def update_RYCTs(self):
         try:
-            ryctsJson = File.readFile(self.ryctsPath) 
+            ryctsJson = Storage.readFile(self.ryctsPath) 
             RYCTssource = self.RYCTs(ryctsJson)
 
             years = self.genDataUpdate['osy-years']
@@ -752,7 +751,7 @@ class UpdateCase(Osemosys):
                                     chunk[year] = None
                             RYCTsdata[ryt['id']][sc['ScenarioId']].append(chunk)
 
-            File.writeFile( RYCTsdata, self.ryctsPath)
+            Storage.writeFile( RYCTsdata, self.ryctsPath)
         except(IOError):
             raise IOError
     
@@ -0,0 +1,11 @@
+from flask import Blueprint, Response, jsonify
+from Classes.Base import Config
+from Classes.Base.MetricsClass import Metrics
+
+metrics_api = Blueprint('MetricsRoute', __name__)
+
+@metrics_api.route("/metrics", methods=['GET'])
+def metrics():
+    if not Config.METRICS_ENABLED:
+        return jsonify('Metrics are disabled!'), 404
+    return Response(Metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
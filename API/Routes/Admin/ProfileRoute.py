@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify, request, send_file
+from Classes.Base.ProfilerClass import Profiler
+
+profile_api = Blueprint('ProfileRoute', __name__)
+
+@profile_api.route("/admin/profiles", methods=['GET'])
+def profiles():
+    try:
+        limit = request.args.get('limit', default=50, type=int)
+        return jsonify(Profiler.list(limit)), 200
+    except(IOError):
+        return jsonify('No existing profiles!'), 404
+
+@profile_api.route("/admin/profiles/<profileId>", methods=['GET'])
+def profile(profileId):
+    path = Profiler.path(profileId)
+    if path is None:
+        return jsonify('No existing profile!'), 404
+    return send_file(path.resolve(), mimetype='text/plain', as_attachment=True, max_age=0)
@@ -5,10 +5,12 @@ import shutil
 import pandas as pd
 from Classes.Case.HelpersClass import Helpers
 from Classes.Base import Config
-from Classes.Base.FileClass import File
+from Classes.Base.StorageClass import Storage
+from Classes.Base.JsonResponseClass import JsonResponse
 from Classes.Case.CaseClass import Case
 from Classes.Case.UpdateCaseClass import UpdateCase
 from Classes.Case.ImportTemplate import ImportTemplate
+from Classes.Case.ResultIndexClass import ResultIndex
 from Classes.Base.SyncS3 import SyncS3
 
 case_api = Blueprint('CaseRoute', __name__)
@@ -19,8 +21,8 @@ def initSyncS3():
         #sync bucket with local storage
         syncS3 = SyncS3()
         cases = syncS3.getCasesSyncInit()
-        for case in cases:
-            syncS3.downloadSync(case, Config.DATA_STORAGE, Config.S3_BUCKET)
+        #svi case-ovi kroz jedan pool, prenose se samo promijenjeni file
+        syncS3.downloadSync(cases, Config.DATA_STORAGE, Config.S3_BUCKET, folders=True)
         #downoload param file from S3 bucket
         syncS3.downloadSync('Parameters.json', Config.DATA_STORAGE, Config.S3_BUCKET)
         response = {
@@ -58,7 +60,7 @@ def getDesc():
     try:
         casename = request.json['casename']
         genDataPath = Path(Config.DATA_STORAGE,casename,"genData.json")
-        genData = File.readFile(genDataPath)
+        genData = Storage.readFile(genDataPath)
         response = {
             "message": "Get model description success",
             "desc": genData['osy-desc']
@@ -85,9 +87,9 @@ def copy():
         else:
             shutil.copytree(str(src), str(dest) )
             #rename casename in genData
-            genData = File.readFile(casePath)
+            genData = Storage.readFile(casePath)
             genData['osy-casename'] = case_copy
-            File.writeFile(genData, casePath)
+            Storage.writeFile(genData, casePath)
             response = {
                 "message": 'Model <b>'+ case + '</b> copied!',
                 "status_code": "success"
@@ -130,23 +132,40 @@ def getResultData():
         dataJson = request.json['dataJson']
         if casename != None:
             dataPath = Path(Config.DATA_STORAGE,casename,'view',dataJson)
-            data = File.readFile(dataPath)
-            response = data   
-
+            #vraca se fajl kako je zapisan, bez parsiranja i ponovnog jsonify
+            return JsonResponse.file(dataPath)
         else:  
             response = None     
         return jsonify(response), 200
     except(IOError):
         return jsonify('No existing cases!'), 404
 
+@case_api.route("/queryResultData", methods=['POST'])
+def queryResultData():
+    try:
+        casename = request.json['casename']
+        varId = request.json['varId']
+        result = ResultIndex(casename).query(
+            varId,
+            group=request.json.get('group'),
+            caseruns=request.json.get('caseruns'),
+            filters=request.json.get('filters'),
+            years=request.json.get('years'),
+            offset=request.json.get('offset', 0),
+            limit=request.json.get('limit')
+        )
+        return jsonify(result), 200
+    except(IOError):
+        return jsonify('No existing results!'), 404
+    except(ValueError, TypeError):
+        return jsonify('Invalid query!'), 400
+
 @case_api.route("/getParamFile", methods=['POST'])
 def getParamFile():
     try:
         dataJson = request.json['dataJson']
         configPath = Path(Config.DATA_STORAGE, dataJson)
-        ConfigFile = File.readParamFile(configPath)
-        response = ConfigFile       
-        return jsonify(response), 200
+        return JsonResponse.file(configPath)
     except(IOError):
         return jsonify('No existing cases!'), 404
 
@@ -157,9 +176,9 @@ def resultsExists():
         if casename != None:
             resPath = Path(Config.DATA_STORAGE, casename, 'view', 'RYT.json')
             dataPath = Path(Config.DATA_STORAGE,casename,'view','resData.json')
-            data = File.readFile(dataPath)
-            if os.path.isfile(resPath) and data['osy-cases']:
-                RYTTs = File.readFile(resPath)
+            data = Storage.readFile(dataPath)
+            if Storage.exists(resPath) and data['osy-cases']:
+                RYTTs = Storage.readFile(resPath)
                 if data['osy-cases'] and RYTTs["ANC"]:
                     response = True      
                 else:
@@ -185,10 +204,10 @@ def saveParamFile():
         varPath = Path(Config.DATA_STORAGE, 'Variables.json')
         dualPath = Path(Config.DATA_STORAGE, 'Duals.json')
         indicatorPath = Path(Config.DATA_STORAGE, 'Indicators.json')
-        File.writeFile( ParamData, paramPath)
-        File.writeFile( VarData, varPath)
-        File.writeFile( DualData, dualPath)
-        File.writeFile( IndicatorData, indicatorPath)
+        Storage.writeFile( ParamData, paramPath)
+        Storage.writeFile( VarData, varPath)
+        Storage.writeFile( DualData, dualPath)
+        Storage.writeFile( IndicatorData, indicatorPath)
         response = {
             "message": "You have updated parameters & variables data!",
             "status_code": "success"
@@ -204,9 +223,9 @@ def saveScOrder():
         data = request.json['data']
         case = request.json['casename']
         genDataPath = Path(Config.DATA_STORAGE, case, 'genData.json')
-        genData = File.readFile(genDataPath)
+        genData = Storage.readFile(genDataPath)
         genData['osy-scenarios'] = data
-        File.writeFile( genData, genDataPath)
+        Storage.writeFile( genData, genDataPath)
         response = {
             "message": "You have updated scenarios order data!",
             "status_code": "success"
@@ -225,10 +244,10 @@ def updateData():
         dataJson = request.json['dataJson']
         dataPath = Path(Config.DATA_STORAGE, case, dataJson)
         if case != None:
-            sourceData = File.readFile(dataPath)
+            sourceData = Storage.readFile(dataPath)
             sourceData[param] = data
-            File.writeFile(sourceData, dataPath)
-            #File.writeFileUJson(sourceData, dataPath)
+            Storage.writeFile(sourceData, dataPath)
+            #Storage.writeFileUJson(sourceData, dataPath)
             response = {
                 "message": "Your data has been saved!",
                 "status_code": "success"
@@ -247,12 +266,12 @@ def saveCase():
         #osy = Osemosys(casename)
 
         # configPath = Path(Config.DATA_STORAGE, 'Variables.json')
-        # vars = File.readParamFile(configPath)
+        # vars = Storage.readParamFile(configPath)
         customIndicators = genData['osy-indicators']
         techsMap = {tech['TechId']: tech['Tech'] for tech in genData["osy-tech"] }
         storagePath = Path(Config.DATA_STORAGE)
-        VARIABLES = File.readParamFile(storagePath / 'Variables.json')
-        INDICATORS = File.readParamFile(storagePath / 'Indicators.json')
+        VARIABLES = Storage.readParamFile(storagePath / 'Variables.json')
+        INDICATORS = Storage.readParamFile(storagePath / 'Indicators.json')
 
         IND_GROUPED = Helpers.merge_all_indicators_grouped(INDICATORS, customIndicators, techsMap)
 
@@ -269,7 +288,7 @@ def saveCase():
             viewDataPath = Path(Config.DATA_STORAGE,case,'view','viewDefinitions.json')
 
             # viewDataPathExisting = Path(Config.DATA_STORAGE,casename,'view','viewDefinitions.json')
-            viewDefExisting = File.readParamFile(viewDataPath)
+            viewDefExisting = Storage.readParamFile(viewDataPath)
             viewDef = {}
             for group, lists in vars.items():
                 for list in lists:
@@ -299,7 +318,7 @@ def saveCase():
             viewData = {
                     "osy-views": viewDef
                 }
-            File.writeFile( viewData, viewDataPath)
+            Storage.writeFile( viewData, viewDataPath)
             
             if not os.path.exists(resPath):
                 os.makedirs(resPath, mode=0o777, exist_ok=False)
@@ -309,7 +328,7 @@ def saveCase():
                 resData = {
                     "osy-cases":[]
                 }
-                File.writeFile( resData, resDataPath)
+                Storage.writeFile( resData, resDataPath)
 
 
 
@@ -321,7 +340,7 @@ def saveCase():
                 caseUpdate.updateCase() 
 
                 #update genData
-                File.writeFile( genData, genDataPath)
+                Storage.writeFile( genData, genDataPath)
 
                 ###########################potrebno updateovati i resData ukoliko smo brisali ili dodavali scenarios
 
@@ -338,7 +357,7 @@ def saveCase():
                     caseUpdate.updateCase() 
 
                     #update gen data sa novim imenom
-                    File.writeFile( genData, genDataPath)
+                    Storage.writeFile( genData, genDataPath)
 
                     #nedostaje update resData u smislu novih ili izbirsanih scenarija
                     #rename case sa novim imenom
@@ -366,7 +385,7 @@ def saveCase():
                 session['osycase'] = casename
                 os.makedirs(Path(Config.DATA_STORAGE,casename))
                 genDataPath = Path(Config.DATA_STORAGE, casename, "genData.json")
-                File.writeFile( genData, genDataPath)
+                Storage.writeFile( genData, genDataPath)
                 case = Case(casename, genData)
                 case.createCase()  
 
@@ -381,12 +400,12 @@ def saveCase():
                     resData = {
                         "osy-cases":[]
                     }
-                    File.writeFile( resData, resDataPath)
+                    Storage.writeFile( resData, resDataPath)
 
                     viewData = {
                         "osy-views": viewDef
                     }
-                    File.writeFile( viewData, viewDataPath)
+                    Storage.writeFile( viewData, viewDataPath)
 
                 response = {
                     "message": "Your model configuration has been saved!",
@@ -467,7 +486,7 @@ def run():
 #         dataJson = request.json['dataJson']
 #         if casename != None:
 #             dataPath = Path(Config.DATA_STORAGE,casename,dataJson)
-#             data = File.readFile(dataPath)
+#             data = Storage.readFile(dataPath)
 #             diff = time.time() - start
 #             print('get data time ', diff)
 #             response = data   
@@ -0,0 +1,21 @@
+from flask import Blueprint, jsonify, send_from_directory
+from pathlib import Path
+from werkzeug.security import safe_join
+from Classes.Base import Config
+from Classes.Base.JsonResponseClass import JsonResponse
+
+datastorage_api = Blueprint('DataStorageRoute', __name__)
+
+#front end cita JSON modela direktno (../../DataStorage/<case>/<file>.json), fajlovi mogu biti kompresovani ili columnar
+@datastorage_api.route("/DataStorage/<path:filename>", methods=['GET'])
+def dataStorage(filename):
+    try:
+        root = str(Path(Config.DATA_STORAGE).resolve())
+        path = safe_join(root, filename)
+        if path is None:
+            return jsonify('No existing cases!'), 404
+        if not filename.endswith('.json'):
+            return send_from_directory(root, filename, max_age=0)
+        return JsonResponse.file(Path(Config.DATA_STORAGE, filename))
+    except(IOError):
+        return jsonify('No existing cases!'), 404
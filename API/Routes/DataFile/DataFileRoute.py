@@ -1,13 +1,27 @@
 from flask import Blueprint, Response, jsonify, request, send_file, session
 from pathlib import Path
-import shutil, datetime, time, os,logging
+import shutil, datetime, time, os, json, uuid, logging
 from Classes.Case.DataFileClass import DataFile
 from Classes.Base import Config
+from Classes.Base.RunProgressClass import RunProgress
+from Classes.Base.SolverProcessClass import SolverProcess
+from Classes.Base.RunSchedulerClass import RunScheduler, RunRejected
+from Classes.Case.ArtifactsClass import Artifacts
+from Classes.Case.SolverBackendClass import SolverBackends
 
 logger = logging.getLogger(__name__)
 
 datafile_api = Blueprint('DataFileRoute', __name__)
 
+def runOwner():
+    #vlasnik runova u RunScheduler-u, jedna browser sesija
+    if 'runOwner' not in session:
+        session['runOwner'] = uuid.uuid4().hex
+    return session['runOwner']
+
+def runBusy(ex):
+    return jsonify(str(ex)), 503, {'Retry-After': str(Config.RUN_BUSY_RETRY)}
+
 @datafile_api.route("/generateDataFile", methods=['POST'])
 def generateDataFile():
     try:
@@ -189,7 +203,10 @@ def downloadDataFile():
         #path = "/Examples.pdf"
         case = session.get('osycase', None)
         caserunname = request.args.get('caserunname')
-        dataFile = Path(Config.DATA_STORAGE,case, 'res',caserunname, 'data.txt')
+        #data.txt ili data.txt.gz nakon retention
+        dataFile = Artifacts.existing(Path(Config.DATA_STORAGE,case, 'res',caserunname, 'data.txt'))
+        if dataFile is None:
+            raise IOError
         return send_file(dataFile.resolve(), as_attachment=True, max_age=0)
     
     except(IOError):
@@ -223,7 +240,9 @@ def downloadResultsFile():
     try:
         case = session.get('osycase', None)
         caserunname = request.args.get('caserunname')
-        dataFile = Path(Config.DATA_STORAGE,case, 'res', caserunname,'results.txt')
+        dataFile = Artifacts.existing(Path(Config.DATA_STORAGE,case, 'res', caserunname,'results.txt'))
+        if dataFile is None:
+            raise IOError
         return send_file(dataFile.resolve(), as_attachment=True, max_age=0)
     
     except(IOError):
@@ -236,9 +255,12 @@ def run():
         casename = request.json['casename']
         caserunname = request.json['caserunname']
         solver = request.json['solver']
+        #CBC opcije (threads, seconds, ratioGap, presolve, method), pamte se uz caserun
+        solverOptions = request.json.get('solverOptions')
         logger.info("Starting optimization process for model -- %s -- caserun -- %s --!", casename, caserunname)
         txtFile = DataFile(casename)
-        response = txtFile.run(solver, caserunname)   
+        with RunScheduler.request():
+            response = txtFile.run(solver, caserunname, options=solverOptions, owner=runOwner())
         logger.info("Optimization finished for model -- %s -- caserun -- %s --!", casename, caserunname) 
         #logger.info(f"\033[92mStarting optimization process for model -- {casename} -- caserun -- {caserunname} --!\033[0m")
         return jsonify(response), 200
@@ -246,26 +268,149 @@ def run():
     #     print(ex)
     #     return ex, 404
     
+    except RunRejected as ex:
+        return runBusy(ex)
+    except ValueError as ex:
+        return jsonify(str(ex)), 400
     except(IOError):
         return jsonify('No existing cases!'), 404
     
+def sseEvent(seq, event, data):
+    return 'id: {}\nevent: {}\ndata: {}\n\n'.format(seq, event, json.dumps(data))
+
+@datafile_api.route("/runProgress", methods=['GET'])
+def runProgress():
+    #Server-Sent Events: state, pa stage/log/progress/done dogadjaji runa dok ne zavrsi
+    casename = request.args.get('casename')
+    caserunname = request.args.get('caserunname')
+    channel = RunProgress.get(casename, caserunname)
+    if channel is None:
+        return jsonify('No run for this case run!'), 404
+    try:
+        lastId = int(request.headers.get('Last-Event-ID') or request.args.get('lastEventId') or 0)
+    except ValueError:
+        lastId = 0
+    #id iz prethodnog runa istog caseruna
+    if lastId > channel.seq:
+        lastId = 0
+
+    def stream():
+        seq = lastId
+        yield 'retry: {}\n\n'.format(Config.RUN_PROGRESS_RETRY)
+        yield sseEvent(channel.seq, 'state', channel.snapshot())
+        while True:
+            events = channel.since(seq, Config.RUN_PROGRESS_HEARTBEAT)
+            if not events:
+                if channel.finishedAt is not None:
+                    return
+                #komentar drzi konekciju otvorenom kroz proxy
+                yield ': keepalive\n\n'
+                continue
+            for eventSeq, event, data in events:
+                yield sseEvent(eventSeq, event, data)
+                seq = eventSeq
+                if event == 'done':
+                    return
+
+    try:
+        close = RunScheduler.openStream()
+    except RunRejected as ex:
+        return runBusy(ex)
+    response = Response(stream(), mimetype='text/event-stream')
+    #thread se oslobadja i kad klijent prekine prije prvog dogadjaja
+    response.call_on_close(close)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@datafile_api.route("/cancelRun", methods=['POST'])
+def cancelRun():
+    try:
+        casename = request.json['casename']
+        caserunname = request.json['caserunname']
+        channel = RunProgress.get(casename, caserunname)
+        if channel is None or channel.finishedAt is not None:
+            return jsonify('No running case run!'), 404
+        stopped = SolverProcess.cancel(channel.job)
+        logger.info("Cancel requested for model -- %s -- caserun -- %s --, %s solver processes stopped", casename, caserunname, stopped)
+        response = {
+            "message": "Case run is cancelled!",
+            "status_code": "success",
+            "processes": stopped
+        }
+        return jsonify(response), 200
+    except(KeyError):
+        return jsonify('No selected case run!'), 404
+
+@datafile_api.route("/runQueue", methods=['GET'])
+def runQueue():
+    #runovi koji se izvrsavaju i red cekanja RunScheduler-a, uz caserun i njegova pozicija
+    response = RunScheduler.snapshot()
+    casename = request.args.get('casename')
+    caserunname = request.args.get('caserunname')
+    if casename and caserunname:
+        response["position"] = RunScheduler.position(RunProgress.jobId(casename, caserunname))
+    return jsonify(response), 200
+
+@datafile_api.route("/solvers", methods=['GET'])
+def solvers():
+    #registrovani solveri, capabilities i da li su dostupni na ovoj instalaciji
+    return jsonify(SolverBackends.describe()), 200
+
+@datafile_api.route("/diskUsage", methods=['GET'])
+def diskUsage():
+    try:
+        casename = request.args.get('casename') or session.get('osycase', None)
+        if not casename or not Path(Config.DATA_STORAGE, casename).is_dir():
+            raise IOError
+        response = DataFile(casename).diskUsage()
+        return jsonify(response), 200
+    except(IOError):
+        return jsonify('No existing cases!'), 404
+
+@datafile_api.route("/applyRetention", methods=['POST'])
+def applyRetention():
+    try:
+        casename = request.json['casename']
+        #bez policy vazi Config.ARTIFACT_RETENTION
+        policy = request.json.get('policy')
+        txtFile = DataFile(casename)
+        caseruns = txtFile.applyRetention(policy)
+        response = {
+            "message": "Retention is applied to case runs!",
+            "status_code": "success",
+            "caseruns": caseruns,
+            "usage": txtFile.diskUsage()
+        }
+        return jsonify(response), 200
+    except ValueError as ex:
+        return jsonify(str(ex)), 400
+    except(KeyError, IOError):
+        return jsonify('No existing cases!'), 404
+
 @datafile_api.route("/batchRun", methods=['POST'])
 def batchRun():
     try:
         start = time.time()
         modelname = request.json['modelname']
         cases = request.json['cases']
+        solverOptions = request.json.get('solverOptions')
 
         if modelname != None:
             txtFile = DataFile(modelname)
-            for caserun in cases:
-                logger.info("Data file generation process started for model %s caserun %s!", modelname, caserun)
-                txtFile.generateDatafile(caserun)
-                logger.info("Data file generation process finished for model%s caserun %s!", modelname, caserun)
-            response = txtFile.batchRun( 'CBC', cases) 
+            with RunScheduler.request():
+                for caserun in cases:
+                    logger.info("Data file generation process started for model %s caserun %s!", modelname, caserun)
+                    txtFile.generateDatafile(caserun)
+                    logger.info("Data file generation process finished for model%s caserun %s!", modelname, caserun)
+                response = txtFile.batchRun( request.json.get('solver', 'CBC'), cases, solverOptions, owner=runOwner())
         end = time.time()  
         response['time'] = end-start 
         return jsonify(response), 200
+    except RunRejected as ex:
+        return runBusy(ex)
+    except ValueError as ex:
+        return jsonify(str(ex)), 400
     except(IOError):
         return jsonify('Error!'), 404
     
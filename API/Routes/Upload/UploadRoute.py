@@ -1,16 +1,17 @@
 import shutil
 from unittest import case
-from flask import Blueprint, request, jsonify, send_file, after_this_request
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from zipfile import ZipFile
 from pathlib import Path
 from werkzeug.utils import secure_filename
-import os, time, json, glob
-
-from threading import Thread
+import os, json, glob
 
 from Classes.Case.HelpersClass import Helpers
 from Classes.Base import Config
-from Classes.Base.FileClass import File
+from Classes.Base.StorageClass import Storage
+from Classes.Base.ChunkUploadClass import ChunkUpload
+from Classes.Base.ZipRestoreClass import ZipRestore
+from Classes.Base.ZipStreamClass import ZipStream
 
 upload_api = Blueprint('UploadRoute', __name__)
 
@@ -97,7 +98,7 @@ def upload_dir(s3, localDir, awsInitDir, bucketName, tag, prefix='\\'):
 
 def updateTimeslices(casename):
     genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-    genData = File.readParamFile(genDataPath)
+    genData = Storage.readParamFile(genDataPath)
     ns = int(genData["osy-ns"])
     nd = int(genData["osy-dt"])
     genData["osy-se"] = []
@@ -122,51 +123,51 @@ def updateTimeslices(casename):
             chunk["DTB"] = "DTB_0"
             chunk['Desc'] = "Default year split"
             genData["osy-ts"].append(chunk)
-    File.writeFile( genData, genDataPath)
+    Storage.writeFile( genData, genDataPath)
     #rename json files with timeslices
     RYTsPath = Path(Config.DATA_STORAGE, casename, 'RYTs.json')
-    RYTsPath.write_text(RYTsPath.read_text().replace('YearSplit', 'TsId'))
+    Storage.replaceText(RYTsPath, 'YearSplit', 'TsId')
     RYTTsPath = Path(Config.DATA_STORAGE, casename, 'RYTTs.json')
-    RYTTsPath.write_text(RYTTsPath.read_text().replace('Timeslice', 'TsId'))
+    Storage.replaceText(RYTTsPath, 'Timeslice', 'TsId')
     RYCTsPath = Path(Config.DATA_STORAGE, casename, 'RYCTs.json')
-    RYCTsPath.write_text(RYCTsPath.read_text().replace('Timeslice', 'TsId'))
+    Storage.replaceText(RYCTsPath, 'Timeslice', 'TsId')
 
 def updateStorageSet(casename):
     genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-    genData = File.readParamFile(genDataPath)
+    genData = Storage.readParamFile(genDataPath)
 
     genData["osy-stg"] = []
 
-    File.writeFile( genData, genDataPath)
+    Storage.writeFile( genData, genDataPath)
 
 def updateGenData(casename, genData):
     genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
 
     genData["osy-indicators"] = []
 
-    File.writeFile( genData, genDataPath)
+    Storage.writeFile( genData, genDataPath)
 
 def updateViewDefintions(casename, genData):
 
     viewDataPath = Path(Config.DATA_STORAGE,casename,'view','viewDefinitions.json')
 
     
-    if not viewDataPath.exists():
+    if not Storage.exists(viewDataPath):
         viewDefExisting = {"osy-views": {} }
-        File.writeFile(viewDefExisting, viewDataPath)
+        Storage.writeFile(viewDefExisting, viewDataPath)
     else:
-        viewDefExisting = File.readParamFile(viewDataPath)
+        viewDefExisting = Storage.readParamFile(viewDataPath)
 
 
     # configPath = Path(Config.DATA_STORAGE, 'Variables.json')
-    # vars = File.readParamFile(configPath)
+    # vars = Storage.readParamFile(configPath)
 
     ##########
     customIndicators = genData['osy-indicators']
     techsMap = {tech['TechId']: tech['Tech'] for tech in genData["osy-tech"] }
     storagePath = Path(Config.DATA_STORAGE)
-    VARIABLES = File.readParamFile(storagePath / 'Variables.json')
-    INDICATORS = File.readParamFile(storagePath / 'Indicators.json')
+    VARIABLES = Storage.readParamFile(storagePath / 'Variables.json')
+    INDICATORS = Storage.readParamFile(storagePath / 'Indicators.json')
 
     IND_GROUPED = Helpers.merge_all_indicators_grouped(INDICATORS, customIndicators, techsMap)
 
@@ -206,11 +207,11 @@ def updateViewDefintions(casename, genData):
     viewData = {
         "osy-views": viewDef
     }
-    File.writeFile( viewData, viewDataPath)
+    Storage.writeFile( viewData, viewDataPath)
 
 def updateTimeslices_OnlyTs(casename):
     genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-    genData = File.readParamFile(genDataPath)
+    genData = Storage.readParamFile(genDataPath)
     ns = int(genData["osy-ns"])
     nd = int(genData["osy-dt"])
     genData["osy-ts"] = []
@@ -223,72 +224,39 @@ def updateTimeslices_OnlyTs(casename):
             chunk['Ts'] = "S"+s+d
             chunk['Desc'] = "Default year split"
             genData["osy-ts"].append(chunk)
-    File.writeFile( genData, genDataPath)
+    Storage.writeFile( genData, genDataPath)
     #rename json files with timeslices
     RYTsPath = Path(Config.DATA_STORAGE, casename, 'RYTs.json')
-    RYTsPath.write_text(RYTsPath.read_text().replace('YearSplit', 'TsId'))
+    Storage.replaceText(RYTsPath, 'YearSplit', 'TsId')
     RYTTsPath = Path(Config.DATA_STORAGE, casename, 'RYTTs.json')
-    RYTTsPath.write_text(RYTTsPath.read_text().replace('Timeslice', 'TsId'))
+    Storage.replaceText(RYTTsPath, 'Timeslice', 'TsId')
     RYCTsPath = Path(Config.DATA_STORAGE, casename, 'RYCTs.json')
-    RYCTsPath.write_text(RYCTsPath.read_text().replace('Timeslice', 'TsId'))
-##############################################################Multithreading example#########################3
-class Download(Thread):
-    def __init__(self, request, zippedFile):
-        Thread.__init__(self)
-        self.request = request
-        self.zippedFile = zippedFile
-
-    def run(self):
-        print("wait few seconds for download to finish")
-        time.sleep(20)
-        #print(self.request)
-        #remove zipped file
-        os.remove(self.zippedFile)
-        print("Deletion of zip archive done!")
-
-
-@upload_api.route('/myfunc', methods=["GET", "POST"])
-def myfunc():
-        thread_a = Download(request.__copy__())
-        thread_a.start()
-        return "Processing in background", 200
-
+    Storage.replaceText(RYCTsPath, 'Timeslice', 'TsId')
 @upload_api.route("/backupCase", methods=['GET'])
 def backupCase():
     try:    
         #case = request.form['case']
         #case = request.json['casename']
         case = request.args.get('case')
-
-        casePath = Path('WebAPP', 'DataStorage',case)
-        zippedFile = Path('WebAPP', 'DataStorage', case+'.zip')
-
-        '''File system data storage'''
-        with ZipFile(zippedFile, 'w') as zipObj:
-            # Iterate over all the files in directory
-            for folderName, subfolders, filenames in os.walk(str(casePath)):
-
-                for filename in filenames:
-                    if filename != 'lp.lp':
-                        #create complete filepath of file in directory
-                        filePath = os.path.join(folderName, filename)
-                        # Add file to zip
-                        zipObj.write(filePath)      
-
-            #osemosys 2.1 backup only input files
-            # for filename in os.listdir(str(casePath)):
-            #     folderName = os.path.join(str(casePath))
-            #     if os.path.isfile(os.path.join(folderName, filename)):
-            #         if filename != 'data.txt':
-            #             #create complete filepath of file in directory
-            #             filePath = os.path.join(folderName, filename)
-            #             # Add file to zip
-            #             zipObj.write(filePath)   
-
-        thread_a = Download(request.__copy__(), zippedFile)
-        thread_a.start()
-
-        return send_file(zippedFile.resolve(), as_attachment=True)
+        try:
+            level = min(9, max(0, int(request.args.get('level', Config.BACKUP_COMPRESSION_LEVEL))))
+        except (TypeError, ValueError):
+            return jsonify('Compression level must be a number from 0 to 9!'), 400
+        results = request.args.get('results', str(Config.BACKUP_INCLUDE_RESULTS)) not in ('0', 'false')
+        artifacts = request.args.get('artifacts', '0') not in ('0', 'false')
+
+        #ime modela moze imati razmake, case mora biti direktan folder u DATA_STORAGE (bez ../)
+        storage = Path(Config.DATA_STORAGE).resolve()
+        casePath = Path(storage, case or '').resolve()
+        if not case or casePath.parent != storage or not casePath.is_dir():
+            raise IOError
+        case = casePath.name
+
+        #File system data storage, zip se generise dok se salje klijentu
+        zipStream = ZipStream(case, level, results, artifacts)
+        response = Response(stream_with_context(zipStream.generate()), mimetype='application/zip')
+        response.headers['Content-Disposition'] = 'attachment; filename="{}.zip"'.format(case)
+        return response
 
     except(IOError):
         return jsonify('No existing cases!'), 404
@@ -334,7 +302,7 @@ def uploadCaseUnchunked_old():
 
                                     #add res view folders with json default files
                                     configPath = Path(Config.DATA_STORAGE, 'Variables.json')
-                                    vars = File.readParamFile(configPath)
+                                    vars = Storage.readParamFile(configPath)
                                     viewDef = {}
                                     for group, lists in vars.items():
                                         for list in lists:
@@ -358,12 +326,12 @@ def uploadCaseUnchunked_old():
                                     resData = {
                                         "osy-cases":[]
                                     }
-                                    File.writeFile( resData, resDataPath)
+                                    Storage.writeFile( resData, resDataPath)
 
                                     viewData = {
                                         "osy-views": viewDef
                                     }
-                                    File.writeFile( viewData, viewDataPath)
+                                    Storage.writeFile( viewData, viewDataPath)
 
                                     #update for dynamic timeslicec
                                     updateTimeslices(casename)
@@ -379,11 +347,11 @@ def uploadCaseUnchunked_old():
                                     #case = data.get('osy-casename', None)
                                     zf.extractall(os.path.join(Config.EXTRACT_FOLDER))
                                     genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-                                    genData = File.readParamFile(genDataPath)
+                                    genData = Storage.readParamFile(genDataPath)
                                     genData["osy-techGroups"] = []
                                     for dic in genData["osy-tech"]:
                                         dic["TG"] =[]
-                                    File.writeFile( genData, genDataPath)
+                                    Storage.writeFile( genData, genDataPath)
                  
                                     #update for dynamic timeslicec
                                     updateTimeslices(casename)
@@ -475,18 +443,26 @@ def handle_full_zip(file, filepath=None):
     if submitted_file and allowed_filename(submitted_file):
         filename = secure_filename(submitted_file)
 
+        restore = ZipRestore(filepath, os.path.join(Config.EXTRACT_FOLDER))
+        resultsMode = request.form.get("restoreResults", Config.RESTORE_RESULTS)
+        if resultsMode not in ZipRestore.MODES:
+            resultsMode = Config.RESTORE_RESULTS
+        extracted = False
+
         with ZipFile(filepath) as zf:
             errorcode = 1
 
 
-            # --- Find first genData.json entry (single pass) ---
-            target_info = next(
-                (zi for zi in zf.infolist() if Path(zi.filename).name == "genData.json"),
-                None
-            )
+            # --- Validate paths, find genData.json, split inputs/results (single pass) ---
+            try:
+                target_info = restore.scan(zf)
+            except ValueError:
+                target_info = None
 
             if not target_info:
-                # No genData.json at all
+                # No genData.json at all or unsafe paths
+                zf.close()
+                restore.finish('skip')
                 msg.append({
                     "message": f"ZIP archive {case} is not valid archive!",
                     "status_code": "error"
@@ -509,11 +485,14 @@ def handle_full_zip(file, filepath=None):
                     #     TVOJA ORIGINALNA LOGIKA
                     # ---------------------------
                     if name == '1.0' or name == '2.0':
-                        zf.extractall(os.path.join(Config.EXTRACT_FOLDER))
+                        #res i view se ionako brisu, rezultati se ne raspakuju
+                        restore.extractInputs(zf)
+                        extracted = True
+                        resultsMode = 'skip'
 
                         ##dio za update ViewDefintions
                         #configPath = Path(Config.DATA_STORAGE, 'Variables.json')
-                        # vars = File.readParamFile(configPath)
+                        # vars = Storage.readParamFile(configPath)
                         # viewDef = {}
 
                         # for group, lists in vars.items():
@@ -521,10 +500,10 @@ def handle_full_zip(file, filepath=None):
                         #         viewDef[list['id']] = []
                         #viewDataPath = Path(Config.DATA_STORAGE,case,'view','viewDefinitions.json')
                         #viewData = {"osy-views": viewDef}
-                        #File.writeFile(viewData, viewDataPath)
+                        #Storage.writeFile(viewData, viewDataPath)
 
                         genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-                        genData = File.readParamFile(genDataPath)
+                        genData = Storage.readParamFile(genDataPath)
 
                         resPath = Path(Config.DATA_STORAGE,casename,'res')
                         viewPath = Path(Config.DATA_STORAGE,casename,'view')
@@ -537,7 +516,7 @@ def handle_full_zip(file, filepath=None):
                         os.makedirs(resPath, mode=0o777, exist_ok=False)
                         os.makedirs(viewPath, mode=0o777, exist_ok=False)
                         resData = {"osy-cases":[]}
-                        File.writeFile(resData, resDataPath)
+                        Storage.writeFile(resData, resDataPath)
 
 
 
@@ -553,13 +532,14 @@ def handle_full_zip(file, filepath=None):
                             "casename": casename
                         })
                     elif name == '3.0':
-                        zf.extractall(os.path.join(Config.EXTRACT_FOLDER))
+                        restore.extractInputs(zf)
+                        extracted = True
                         genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-                        genData = File.readParamFile(genDataPath)
+                        genData = Storage.readParamFile(genDataPath)
                         genData["osy-techGroups"] = []
                         for dic in genData["osy-tech"]:
                             dic["TG"] = []
-                        File.writeFile(genData, genDataPath)
+                        Storage.writeFile(genData, genDataPath)
                         updateTimeslices(casename)
                         updateStorageSet(casename)
                         updateGenData(casename, genData)
@@ -571,9 +551,10 @@ def handle_full_zip(file, filepath=None):
                             "casename": casename
                         })
                     elif name in ['4.0', '4.5', '4.9']:
-                        zf.extractall(os.path.join(Config.EXTRACT_FOLDER))
+                        restore.extractInputs(zf)
+                        extracted = True
                         genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-                        genData = File.readParamFile(genDataPath)
+                        genData = Storage.readParamFile(genDataPath)
                         updateTimeslices(casename)
                         updateStorageSet(casename)
                         updateGenData(casename, genData)
@@ -585,9 +566,10 @@ def handle_full_zip(file, filepath=None):
                             "casename": casename
                         })
                     elif name == '5.0':
-                        zf.extractall(os.path.join(Config.EXTRACT_FOLDER))
+                        restore.extractInputs(zf)
+                        extracted = True
                         genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-                        genData = File.readParamFile(genDataPath)
+                        genData = Storage.readParamFile(genDataPath)
                         updateGenData(casename, genData)
                         updateViewDefintions(casename, genData)
 
@@ -597,9 +579,10 @@ def handle_full_zip(file, filepath=None):
                             "casename": casename
                         })
                     elif name == '5.6':
-                        zf.extractall(os.path.join(Config.EXTRACT_FOLDER))
+                        restore.extractInputs(zf)
+                        extracted = True
                         genDataPath = Path(Config.DATA_STORAGE, casename, 'genData.json')
-                        genData = File.readParamFile(genDataPath)
+                        genData = Storage.readParamFile(genDataPath)
                         updateViewDefintions(casename, genData)
                         msg.append({
                             "message": "Model " + casename +" have been uploaded!",
@@ -624,7 +607,9 @@ def handle_full_zip(file, filepath=None):
                     "status_code": "error"
                 })
 
-        os.remove(filepath)
+        if extracted and restore.results:
+            msg[-1]["results"] = resultsMode
+        restore.finish(resultsMode if extracted else 'skip')
 
     return jsonify({"response": msg}), 200
 
@@ -647,45 +632,23 @@ def uploadCase():
             # ==========================
             return handle_full_zip(file)
 
-        # Pretvaranje u int
-        dz_chunk_index = int(dz_chunk_index)
-        dz_total_chunks = int(dz_total_chunks)
-
         # -------------------------------
-        # 2) Snimi chunk
+        # 2) Snimi chunk (stream na disk, direktno na offset ako je poznat)
         # -------------------------------
-        chunk_dir = os.path.join(Config.DATA_STORAGE, "_chunks", dz_uuid)
-        os.makedirs(chunk_dir, exist_ok=True)
-
-        chunk_path = os.path.join(chunk_dir, f"chunk_{dz_chunk_index}")
-        file.save(chunk_path)
+        upload = ChunkUpload(dz_uuid, dz_total_chunks, request.form.get("dztotalfilesize"))
+        chunks_received = upload.saveChunk(dz_chunk_index, file.stream, request.form.get("dzchunkbyteoffset"))
 
         # -------------------------------
-        # 3) Provjeri jesu li stigli svi
+        # 3) Provjeri jesu li stigli svi (manifest)
         # -------------------------------
-        chunks_received = len(os.listdir(chunk_dir))
-
-        if chunks_received < dz_total_chunks:
-            return jsonify({"status": f"received {chunks_received}/{dz_total_chunks}"}), 200
+        if chunks_received < upload.totalChunks:
+            return jsonify({"status": f"received {chunks_received}/{upload.totalChunks}"}), 200
 
         # -------------------------------
         # 4) Spajanje ZIP fajla
         # -------------------------------
-        final_zip = os.path.join(Config.DATA_STORAGE, f"{dz_uuid}.zip")
-
-        with open(final_zip, "wb") as merged:
-            for i in range(dz_total_chunks):
-                part_path = os.path.join(chunk_dir, f"chunk_{i}")
-                with open(part_path, "rb") as part:
-                    merged.write(part.read())
-
-        # Očisti chunk folder
-        shutil.rmtree(chunk_dir)
-
-        # Now remove parent folder if it is empty
-        parent = os.path.dirname(chunk_dir)
-        if os.path.exists(parent) and not os.listdir(parent):
-            os.rmdir(parent)
+        final_zip = os.path.join(Config.DATA_STORAGE, f"{upload.uuid}.zip")
+        upload.assemble(final_zip)
 
         # -------------------------------
         # 5) Pokreni TVOJ originalni ZIP handler
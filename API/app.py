@@ -2,7 +2,7 @@
 import os
 import sys
 
-from flask import Flask, Response, jsonify, request, session, render_template
+from flask import Flask, Response, jsonify, request, session, render_template, g
 from flask_cors import CORS
 from datetime import timedelta
 # from pathlib import Path
@@ -14,7 +14,14 @@ from Routes.Upload.UploadRoute import upload_api
 from Routes.Case.CaseRoute import case_api
 from Routes.Case.SyncS3Route import syncs3_api
 from Routes.Case.ViewDataRoute import viewdata_api
+from Routes.Case.DataStorageRoute import datastorage_api
 from Routes.DataFile.DataFileRoute import datafile_api
+from Routes.Admin.MetricsRoute import metrics_api
+from Routes.Admin.ProfileRoute import profile_api
+from Classes.Base.MetricsClass import Metrics
+from Classes.Base.ProfilerClass import Profiler
+from Classes.Base.CompressionClass import Compression
+from Classes.Base.SolverProcessClass import SolverProcess
 
 import logging
 import warnings
@@ -22,6 +29,7 @@ from logging.handlers import TimedRotatingFileHandler, QueueHandler
 from queue import Queue, Empty
 
 from threading import Event
+import time
 
 #RADI
 template_dir = os.path.abspath('WebAPP')
@@ -97,9 +105,61 @@ app.register_blueprint(case_api)
 app.register_blueprint(viewdata_api)
 app.register_blueprint(datafile_api)
 app.register_blueprint(syncs3_api)
+app.register_blueprint(datastorage_api)
+app.register_blueprint(metrics_api)
+app.register_blueprint(profile_api)
 
 CORS(app)
 
+#solveri koje je ostavio prethodni server (pad, kill) rade bez vlasnika
+try:
+    SolverProcess.sweep()
+except Exception:
+    logger.exception("Orphaned solver sweep failed")
+
+# ============= Request metrics and profiler ============
+#route je template (/getResultData), ne URL, da broj serija ostane mali
+def metrics_route():
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@app.before_request
+def metrics_start():
+    g.metrics_start = time.perf_counter()
+    if Profiler.requested(request):
+        g.profiler = Profiler.start()
+
+def profile_save(status):
+    sampler = g.pop('profiler', None)
+    if sampler is None:
+        return None
+    try:
+        return Profiler.save(sampler.stop(), metrics_route(), request.method, request.full_path, status)
+    except OSError:
+        logger.exception("Profile of %s not saved", request.path)
+        return None
+
+@app.after_request
+def metrics_observe(response):
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        Metrics.observeRequest(metrics_route(), request.method, response.status_code, time.perf_counter() - start)
+    profileId = profile_save(response.status_code)
+    if profileId:
+        response.headers[Profiler.HEADER + '-Id'] = profileId
+    return response
+
+@app.teardown_request
+def metrics_error(exc):
+    #after_request se ne poziva kad route baci exception
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        Metrics.observeRequest(metrics_route(), request.method, 500, time.perf_counter() - start)
+    profile_save(500)
+
+@app.after_request
+def compress_response(response):
+    return Compression.response(response)
+
 #potrebno kad je front end na drugom serveru 127.0.0.1
 @app.after_request
 def add_headers(response):
@@ -165,7 +225,7 @@ if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5002))
     if Config.HEROKU_DEPLOY == 0: 
         from waitress import serve
-        serve(app, host='127.0.0.1', port=port,  threads=8)
+        serve(app, host='127.0.0.1', port=port,  threads=Config.HTTP_THREADS)
     else:
         #HEROKU
         app.run(host='0.0.0.0', port=port, debug=True)